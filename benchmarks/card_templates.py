@@ -0,0 +1,43 @@
+"""
+Compare ticket cards drawn with and without Form XObject templates.
+
+Usage: python benchmarks/card_templates.py [cards]
+"""
+
+import sys
+import time
+
+from workloads import tickets
+
+from fpdf_reporting.model.style import NotionStyle
+from fpdf_reporting.model.ticket import Ticket
+from fpdf_reporting.rendering.pdf_generator import PDF
+
+
+def render(cards: list[Ticket], templates: bool) -> tuple[float, int]:
+    start = time.perf_counter()
+    pdf = PDF(NotionStyle(), templates=templates)
+    pdf.add_page()
+    pdf.detailed_tickets_table(cards)
+    size = len(pdf.output())
+    return time.perf_counter() - start, size
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    cards = tickets(count)
+    render(cards[:10], templates=True)  # warm up fonts and imports
+    results = {templates: render(cards, templates) for templates in (False, True)}
+
+    print(f"{count} ticket cards")
+    for templates, (duration, size) in results.items():
+        label = "templates" if templates else "inline"
+        print(f"{label:>10}: {duration:6.2f} s {size / 1024:10.0f} KiB")
+    (plain_time, plain_size), (time_, size) = results[False], results[True]
+    print(
+        f"{'saved':>10}: {1 - time_ / plain_time:6.0%}   {1 - size / plain_size:10.0%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
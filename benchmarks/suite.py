@@ -0,0 +1,202 @@
+"""
+Rendering benchmarks: wall time, peak memory and output size of standard
+workloads, compared against a stored baseline.
+
+    python benchmarks/suite.py                   # run and compare
+    python benchmarks/suite.py --only cards      # workloads named or containing "cards"
+    python benchmarks/suite.py --update-baseline # store the results as the baseline
+
+Each workload runs in a fresh process, so that peak RSS is its own.
+Short workloads are timed repeatedly, and their time has a wider tolerance.
+The exit status is 1 when any metric regressed beyond its tolerance.
+Timings depend on the machine: refresh the baseline when it changes.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Optional
+
+from workloads import WORKLOADS
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# Allowed growth over the baseline, as a fraction of the baseline
+TOLERANCES: dict[str, float] = {
+    "seconds": 0.30,
+    "peak_rss": 0.20,
+    "traced_peak": 0.20,
+    "output_bytes": 0.02,
+}
+# Even the fastest of many runs of a short workload varies by about 50%
+# from one process to the next, so their time gets a wider tolerance.
+SHORT_WORKLOAD_SECONDS = 2.0
+SHORT_TIME_TOLERANCE = 0.75
+
+# Short workloads are timed repeatedly, until they ran this long in total
+# or ran MAX_REPEAT times, and the fastest run is kept: a single run of a
+# sub-second workload mostly measures the noise of the machine.
+MIN_TIMED_SECONDS = 3.0
+MAX_REPEAT = 30
+
+Results = dict[str, dict[str, float]]
+
+
+def measure(name: str, trace: bool = True) -> dict[str, float]:
+    """Run one workload in this process and return its metrics."""
+    workload = WORKLOADS[name]
+    data = workload.setup()
+    if workload.warm_up:
+        workload.render(data[:1] if isinstance(data, list) else data)
+
+    seconds = float("inf")
+    output_bytes = 0
+    runs = 0
+    timed = 0.0
+    while runs < workload.repeat or (timed < MIN_TIMED_SECONDS and runs < MAX_REPEAT):
+        start = time.perf_counter()
+        output_bytes = len(workload.render(data).output())
+        elapsed = time.perf_counter() - start
+        seconds = min(seconds, elapsed)
+        timed += elapsed
+        runs += 1
+    metrics = {
+        "seconds": seconds,
+        "runs": runs,
+        "peak_rss": _peak_rss(),
+        "output_bytes": output_bytes,
+    }
+
+    if trace and workload.trace:
+        # A separate run, as tracing slows allocations down
+        tracemalloc.start()
+        workload.render(data).output()
+        metrics["traced_peak"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return metrics
+
+
+def run(names: list[str], trace: bool = True) -> Results:
+    """Measure every workload in its own process."""
+    results: Results = {}
+    for name in names:
+        command = [sys.executable, __file__, "--measure", name]
+        if not trace:
+            command.append("--no-tracemalloc")
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"Workload {name} failed:\n{completed.stderr}")
+        results[name] = json.loads(completed.stdout)
+        print(f"{name:>15}: {_format(results[name])}", file=sys.stderr)
+    return results
+
+
+def compare(
+    results: Results,
+    baseline: Results,
+    tolerances: Optional[dict[str, float]] = None,
+) -> list[str]:
+    """Return a description of every metric that regressed beyond its tolerance."""
+    tolerances = tolerances or TOLERANCES
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get(name, {}).get(metric)
+            if expected is None or metric not in tolerances:
+                continue
+            tolerance = tolerances[metric]
+            if metric == "seconds" and expected < SHORT_WORKLOAD_SECONDS:
+                tolerance = max(tolerance, SHORT_TIME_TOLERANCE)
+            if value > expected * (1 + tolerance):
+                regressions.append(
+                    f"{name} {metric}: {value:,.3f} > {expected:,.3f} "
+                    f"(+{value / expected - 1:.0%}, tolerance {tolerance:.0%})"
+                )
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Results:
+    if not path.exists():
+        return {}
+    baseline: Results = json.loads(path.read_text())["workloads"]
+    return baseline
+
+
+def save_baseline(results: Results, path: Path = BASELINE_PATH) -> None:
+    workloads = {**load_baseline(path), **results}
+    document: dict[str, Any] = {
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.machine(),
+        },
+        "workloads": dict(sorted(workloads.items())),
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def _peak_rss() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _format(metrics: dict[str, float]) -> str:
+    parts = [
+        f"{metrics['seconds']:8.3f} s (best of {metrics.get('runs', 1):2.0f})",
+        f"RSS {metrics['peak_rss'] / 2**20:7.1f} MiB",
+        f"output {metrics['output_bytes'] / 2**10:9.0f} KiB",
+    ]
+    if "traced_peak" in metrics:
+        parts.append(f"traced {metrics['traced_peak'] / 2**20:7.1f} MiB")
+    return "  ".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", help="run this workload, or those containing this")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--no-tracemalloc", action="store_true")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    trace = not args.no_tracemalloc
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, trace)))
+        return
+
+    if args.only in WORKLOADS:
+        names = [args.only]
+    else:
+        names = [name for name in WORKLOADS if not args.only or args.only in name]
+    if not names:
+        parser.error(f"No workload matches {args.only!r}")
+    results = run(names, trace)
+
+    if args.update_baseline:
+        save_baseline(results)
+        print(f"Baseline saved to {BASELINE_PATH}", file=sys.stderr)
+        return
+
+    baseline = load_baseline()
+    missing = [name for name in names if name not in baseline]
+    if missing:
+        print(f"No baseline for {', '.join(missing)}", file=sys.stderr)
+    regressions = compare(results, baseline)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Synthetic, offline rendering workloads shared by the benchmarks."""
+
+import atexit
+import csv
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from fpdf_reporting.model.loader import load_export
+from fpdf_reporting.model.report_data import ReportData
+from fpdf_reporting.model.style import NotionStyle
+from fpdf_reporting.model.ticket import Category, Status, Ticket
+from fpdf_reporting.rendering.pdf_generator import PDF
+
+STATUSES = list(Status)
+CATEGORIES = [*Category, None]
+PRIORITIES = ["High", "Medium", "Low", None]
+ISSUE_TYPES = ["Bug", "Story", "Task", "Improvement"]
+COMPONENTS = ["API", "UI", "Database", "Infrastructure", None]
+PEOPLE = ["Alice", "Bob", "Carol", "Dave", "Eve", None]
+SPRINT_START = datetime(2024, 3, 4, 9, 0)
+# A fixed creation date keeps the output size reproducible
+CREATION_DATE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(slots=True)
+class Workload:
+    name: str
+    # Builds the input data, which is not measured
+    setup: Callable[[], Any]
+    # Renders the data into a document
+    render: Callable[[Any], PDF]
+    # The minimum number of timed runs, the fastest one is kept
+    repeat: int = 1
+    # Also measure the peak of traced allocations, in a separate run
+    trace: bool = True
+    # Render the first item of list data once before timing
+    warm_up: bool = True
+
+
+def tickets(count: int) -> list[Ticket]:
+    """Return `count` varied tickets, the same on every call."""
+    return [
+        Ticket(
+            key=f"PD-{i}",
+            summary=f"Generated ticket number {i}",
+            status=STATUSES[i % len(STATUSES)],
+            issue_type=ISSUE_TYPES[i % len(ISSUE_TYPES)],
+            priority=PRIORITIES[i % len(PRIORITIES)],
+            category=CATEGORIES[i % len(CATEGORIES)],
+            story_points=(1, 2, 3, 5, 8, 13)[i % 6],
+            component=COMPONENTS[i % len(COMPONENTS)],
+            assignee=PEOPLE[i % len(PEOPLE)],
+            flagged=i % 17 == 0,
+            start_date=SPRINT_START + timedelta(hours=i % 240),
+            end_date=(
+                SPRINT_START + timedelta(hours=i % 240 + 30) if i % 3 == 0 else None
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+def new_document() -> PDF:
+    pdf = PDF(NotionStyle())
+    pdf.set_creation_date(CREATION_DATE)
+    pdf.add_page()
+    return pdf
+
+
+def ticket_cards(cards: list[Ticket]) -> PDF:
+    pdf = new_document()
+    pdf.detailed_tickets_table(cards)
+    return pdf
+
+
+def table_rows(count: int) -> list[tuple[str, str, str, str]]:
+    return [(t.key, t.summary, t.status, t.assignee or "") for t in tickets(count)]
+
+
+def styled_table(rows: list[tuple[str, str, str, str]]) -> PDF:
+    pdf = new_document()
+    pdf.styled_table(["Key", "Summary", "Status", "Assignee"], rows)
+    return pdf
+
+
+def chart_data(count: int) -> list[dict[str, float]]:
+    return [
+        {label: (i * 7 + j * 13) % 40 + 1 for j, label in enumerate("abcdef")}
+        for i in range(count)
+    ]
+
+
+def charts(datasets: list[dict[str, float]]) -> PDF:
+    """Alternate pie and bar charts, two per row."""
+    pdf = new_document()
+    for index, data in enumerate(datasets):
+        if index % 2 == 0:
+            if pdf.will_page_break(45):
+                pdf.add_page()
+            x, y = pdf.l_margin, pdf.get_y()
+            pdf.set_xy(x, y)
+            pdf.pie_chart(data, width=30, caption="Pie chart")
+        else:
+            pdf.set_xy(pdf.l_margin + pdf.epw / 2, y)
+            pdf.bar_chart(data, caption="Bar chart")
+            pdf.set_xy(pdf.l_margin, y + 45)
+    return pdf
+
+
+def sprint_report(sprint: list[Ticket]) -> PDF:
+    """A complete report: summary, charts, a ticket table and every card."""
+    data = ReportData([t for t in sprint if t.end_date is None], sprint)
+    pdf = new_document()
+    pdf.document_header("Sprint 42 report")
+    pdf.section_title("Overview")
+    pdf.summary_card(
+        [
+            f"Tickets: {data.totals.count}",
+            f"Story points: {data.totals.story_points}",
+            f"Not delivered: {len(data.not_delivered)}",
+            f"Flagged: {data.totals.flagged}",
+        ],
+        width=70,
+    )
+    (_, y) = pdf.summary_card(
+        [f"{status}: {totals.count}" for status, totals in data.by_status.items()],
+        width=70,
+    )
+    pdf.set_xy(pdf.l_margin, y + 10)
+    pdf.section_title("Story points")
+    pdf.pie_chart(
+        {str(k): v for k, v in data.story_points_by_category.items()},
+        width=35,
+        caption="By category",
+    )
+    pdf.set_xy(pdf.l_margin + pdf.epw / 2, pdf.get_y())
+    pdf.bar_chart(
+        {str(k): v for k, v in data.story_points_by_component.items()},
+        caption="By component",
+    )
+    pdf.set_xy(pdf.l_margin, pdf.get_y() + 50)
+    pdf.section_title("Not delivered")
+    pdf.styled_table(
+        ["Key", "Summary", "Status", "Assignee"],
+        [(t.key, t.summary, t.status, t.assignee or "") for t in data.not_delivered],
+    )
+    pdf.add_page()
+    pdf.section_title("Tickets")
+    pdf.detailed_tickets_table(sprint)
+    return pdf
+
+
+EXPORT_COLUMNS = [
+    "Summary",
+    "Issue key",
+    "Issue Type",
+    "Status",
+    "Priority",
+    "Assignee",
+    "Created",
+    "Resolved",
+    "Component/s",
+    "Custom field (Story Points)",
+    "Custom field (Flagged)",
+    "Custom field (Category)",
+    "Description",
+]
+DESCRIPTION = "As a user I want the generated ticket to look like a real one. " * 2
+
+
+def csv_export(count: int) -> Path:
+    """Write a JIRA CSV export of `count` tickets to a temporary file."""
+    fd, name = tempfile.mkstemp(suffix=".csv", prefix="fpdf-reporting-")
+    atexit.register(os.remove, name)
+    with open(fd, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for start in range(0, count, 10_000):
+            writer.writerows(
+                (
+                    t.summary,
+                    f"PD-{start + i}",
+                    t.issue_type,
+                    t.status,
+                    t.priority or "",
+                    t.assignee or "",
+                    _export_date(t.start_date),
+                    _export_date(t.end_date),
+                    t.component or "",
+                    t.story_points,
+                    "Impediment" if t.flagged else "",
+                    t.category or "",
+                    DESCRIPTION,
+                )
+                for i, t in enumerate(tickets(min(10_000, count - start)))
+            )
+    return Path(name)
+
+
+def _export_date(value: Optional[datetime]) -> str:
+    return "" if value is None else value.strftime("%d/%b/%y %I:%M %p")
+
+
+def export_report(path: Path) -> PDF:
+    """Stream an export into the totals of a one page summary."""
+    data = ReportData([], load_export(path))
+    pdf = new_document()
+    pdf.document_header("Export summary")
+    pdf.summary_card(
+        [
+            f"Tickets: {data.totals.count:,}",
+            f"Story points: {data.totals.story_points:,}",
+            f"Flagged: {data.totals.flagged:,}",
+        ],
+        width=70,
+    )
+    pdf.set_xy(pdf.l_margin, pdf.get_y() + 10)
+    pdf.pie_chart(
+        {str(k): v for k, v in data.story_points_by_status.items()},
+        width=50,
+        caption="Story points by status",
+    )
+    return pdf
+
+
+WORKLOADS: dict[str, Workload] = {
+    workload.name: workload
+    for workload in (
+        Workload("cards-100", lambda: tickets(100), ticket_cards, repeat=5),
+        Workload("cards-10k", lambda: tickets(10_000), ticket_cards),
+        # Tracing 100k cards takes minutes, peak RSS is measured all the same
+        Workload("cards-100k", lambda: tickets(100_000), ticket_cards, trace=False),
+        Workload("table-10k", lambda: table_rows(10_000), styled_table),
+        Workload("charts-400", lambda: chart_data(400), charts),
+        Workload("sprint-report", lambda: tickets(300), sprint_report, repeat=3),
+        # A ~250 MB export, mostly load time: streamed, so memory stays flat
+        Workload(
+            "export-1m",
+            lambda: csv_export(1_000_000),
+            export_report,
+            trace=False,
+            warm_up=False,
+        ),
+    )
+}
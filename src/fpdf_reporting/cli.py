@@ -1,4 +1,5 @@
 import subprocess
+import sys
 
 
 def lint() -> None:
@@ -15,3 +16,14 @@ def typecheck() -> None:
 
 def coverage() -> None:
     subprocess.run(["pytest", "--cov-report=html"])
+
+
+def benchmark() -> None:
+    command = [sys.executable, "benchmarks/suite.py", *sys.argv[1:]]
+    sys.exit(subprocess.run(command).returncode)
+
+
+def worker() -> None:
+    from fpdf_reporting.rendering.worker import main
+
+    main(sys.argv[1:])
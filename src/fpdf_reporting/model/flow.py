@@ -0,0 +1,208 @@
+"""
+Daily series computed from the dates of tickets: burndown, cumulative flow
+and cycle times. Dates are binned into days with NumPy, without a loop over
+tickets per day; a `TicketTable` is read without creating tickets at all.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+from fpdf_reporting.model.ticket import Ticket
+from fpdf_reporting.model.ticket_table import (
+    EPOCH,
+    MISSING,
+    TicketTable,
+    encode_date,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
+Tickets = Union[TicketTable, Iterable[Ticket]]
+
+_DAY_US: int = 86_400_000_000
+_EPOCH_DATE: date = EPOCH.date()
+
+# Series names, in drawing and legend order
+REMAINING: str = "Remaining"
+IDEAL: str = "Ideal"
+DONE: str = "Done"
+IN_PROGRESS: str = "In progress"
+TO_DO: str = "To do"
+
+
+@dataclass(slots=True)
+class DailySeries:
+    """Values of one or more series for every day from `start`, inclusive."""
+
+    start: date
+    series: dict[str, list[float]]
+
+    @property
+    def days(self) -> int:
+        return len(next(iter(self.series.values()), []))
+
+    @property
+    def end(self) -> date:
+        """The last day, or the day before `start` when there are no days."""
+        return self.start + timedelta(days=self.days - 1)
+
+
+def burndown(
+    tickets: Tickets,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    story_points: bool = False,
+) -> DailySeries:
+    """
+    Return the work remaining at the end of every day, and the ideal line
+    from the total work down to zero. A ticket is done on its end date.
+    :param tickets: The tickets in scope
+    :param start: The first day, defaults to the earliest ticket date
+    :param end: The last day, defaults to the latest ticket date
+    :param story_points: Count story points instead of tickets
+    """
+    import numpy as np
+
+    columns = _Columns(tickets)
+    first, days = columns.day_range(start, end)
+    weights = columns.story_points() if story_points else None
+    total = float(weights.sum()) if weights is not None else float(len(columns))
+    done = _cumulative_days(columns.end_days, first, days, weights)
+    ideal = np.linspace(total, 0, days) if days > 1 else np.zeros(days)
+    return DailySeries(
+        _date(first),
+        {REMAINING: (total - done).tolist(), IDEAL: ideal.tolist()},
+    )
+
+
+def cumulative_flow(
+    tickets: Tickets, start: Optional[date] = None, end: Optional[date] = None
+) -> DailySeries:
+    """
+    Return the number of tickets done, in progress and to do at the end of
+    every day. A ticket is in progress from its start date, or its end date
+    when it has none, and done from its end date.
+    :param tickets: The tickets in scope
+    :param start: The first day, defaults to the earliest ticket date
+    :param end: The last day, defaults to the latest ticket date
+    """
+    import numpy as np
+
+    columns = _Columns(tickets)
+    first, days = columns.day_range(start, end)
+    starts, ends = columns.start_days, columns.end_days
+    # A ticket never started, or done before it started, started when done
+    done_first = (ends != MISSING) & ((starts == MISSING) | (ends < starts))
+    started = _cumulative_days(np.where(done_first, ends, starts), first, days)
+    done = _cumulative_days(ends, first, days)
+    return DailySeries(
+        _date(first),
+        {
+            DONE: done.tolist(),
+            IN_PROGRESS: (started - done).tolist(),
+            TO_DO: (len(columns) - started).tolist(),
+        },
+    )
+
+
+def cycle_times(tickets: Tickets) -> list[float]:
+    """Return the days from start to end of the tickets having both dates."""
+    columns = _Columns(tickets)
+    starts, ends = columns.start_us, columns.end_us
+    finished = (starts != MISSING) & (ends != MISSING) & (ends >= starts)
+    days: list[float] = ((ends[finished] - starts[finished]) / _DAY_US).tolist()
+    return days
+
+
+class _Columns:
+    """The date columns of tickets, in microseconds and days since 1970."""
+
+    def __init__(self, tickets: Tickets) -> None:
+        import numpy as np
+
+        self.table: Optional[TicketTable] = None
+        self.tickets: list[Ticket] = []
+        if isinstance(tickets, TicketTable):
+            self.table = tickets
+            self.start_us = np.frombuffer(tickets.dates["start_date"], dtype=np.int64)
+            self.end_us = np.frombuffer(tickets.dates["end_date"], dtype=np.int64)
+        else:
+            self.tickets = tickets = list(tickets)
+            self.start_us = np.fromiter(
+                (encode_date(t.start_date) for t in tickets), np.int64, len(tickets)
+            )
+            self.end_us = np.fromiter(
+                (encode_date(t.end_date) for t in tickets), np.int64, len(tickets)
+            )
+        self.start_days = _days(self.start_us)
+        self.end_days = _days(self.end_us)
+
+    def __len__(self) -> int:
+        return len(self.start_us)
+
+    def story_points(self) -> "NDArray[np.float64]":
+        import numpy as np
+
+        if self.table is not None:
+            values = np.frombuffer(self.table.story_points, dtype=np.int64)
+            return np.where(values == MISSING, 0, values).astype(float)
+        return np.fromiter(
+            (t.story_points or 0 for t in self.tickets), float, len(self.tickets)
+        )
+
+    def day_range(self, start: Optional[date], end: Optional[date]) -> tuple[int, int]:
+        """Return the first day and the number of days, from the dates if not given."""
+        import numpy as np
+
+        known = np.concatenate((self.start_days, self.end_days))
+        known = known[known != MISSING]
+        if start is not None:
+            first = (start - _EPOCH_DATE).days
+        elif len(known):
+            first = int(known.min())
+        else:
+            first = (date.today() - _EPOCH_DATE).days
+        if end is not None:
+            last = (end - _EPOCH_DATE).days
+        elif len(known):
+            last = int(known.max())
+        else:
+            last = first - 1
+        return first, max(0, last - first + 1)
+
+
+def _days(microseconds: "NDArray[np.int64]") -> "NDArray[np.int64]":
+    import numpy as np
+
+    return np.where(microseconds == MISSING, MISSING, microseconds // _DAY_US)
+
+
+def _cumulative_days(
+    days: "NDArray[np.int64]",
+    first: int,
+    count: int,
+    weights: "Optional[NDArray[np.float64]]" = None,
+) -> "NDArray[np.float64]":
+    """
+    Return, for each of `count` days from `first`, the number (or weight) of
+    the given days on or before it. Days before `first` count from the start.
+    """
+    import numpy as np
+
+    if count == 0:
+        return np.zeros(0)
+    present = (days != MISSING) & (days < first + count)
+    index = np.maximum(days[present] - first, 0)
+    per_day = np.bincount(
+        index,
+        weights=None if weights is None else weights[present],
+        minlength=count,
+    )
+    return np.cumsum(per_day, dtype=float)
+
+
+def _date(day: int) -> date:
+    return _EPOCH_DATE + timedelta(days=day)
@@ -0,0 +1,360 @@
+import csv
+import json
+import math
+import re
+import warnings
+from contextlib import nullcontext
+from datetime import datetime
+from functools import cache
+from pathlib import Path
+from typing import IO, Any, Callable, ContextManager, Iterator, Optional, Union
+
+from fpdf_reporting.model.ticket import Category, Status, Ticket
+
+Source = Union[str, Path, IO[str]]
+
+# Column names tried, in order, for each Ticket field of a JIRA CSV export
+CSV_COLUMNS: dict[str, tuple[str, ...]] = {
+    "key": ("Issue key", "Key"),
+    "summary": ("Summary",),
+    "status": ("Status",),
+    "issue_type": ("Issue Type",),
+    "priority": ("Priority",),
+    "start_date": ("Custom field (Start date)", "Start date", "Created"),
+    "end_date": ("Resolved",),
+    "due_date": ("Due date",),
+    "flagged": ("Custom field (Flagged)", "Flagged"),
+    "story_points": (
+        "Custom field (Story Points)",
+        "Story Points",
+        "Custom field (Story point estimate)",
+    ),
+    "tester_story_points": (
+        "Custom field (Tester Story Points)",
+        "Tester Story Points",
+    ),
+    "component": ("Component/s", "Components"),
+    "developer": ("Custom field (Developer)", "Developer"),
+    "assignee": ("Assignee",),
+    "category": ("Custom field (Category)", "Category"),
+}
+
+# Keys of the "fields" object of a JIRA REST issue for each Ticket field.
+# Custom fields have instance-specific ids and must be mapped by the caller.
+JSON_FIELDS: dict[str, str] = {
+    "summary": "summary",
+    "status": "status",
+    "issue_type": "issuetype",
+    "priority": "priority",
+    "start_date": "created",
+    "end_date": "resolutiondate",
+    "due_date": "duedate",
+    "component": "components",
+    "assignee": "assignee",
+}
+
+DATE_FORMATS: tuple[str, ...] = (
+    "%d/%b/%y %I:%M %p",
+    "%d/%b/%Y %I:%M %p",
+    "%d/%m/%Y %H:%M",
+    "%m/%d/%Y %H:%M",
+    "%d/%b/%y",
+)
+
+DATE_FIELDS = ("start_date", "end_date", "due_date")
+
+_DIRECTIVES = {
+    "%d": r"(?P<day>\d{1,2})",
+    "%m": r"(?P<month>\d{1,2})",
+    "%b": r"(?P<month_name>[A-Za-z]{3})",
+    "%y": r"(?P<short_year>\d{2})",
+    "%Y": r"(?P<year>\d{4})",
+    "%H": r"(?P<hour>\d{1,2})",
+    "%I": r"(?P<hour12>\d{1,2})",
+    "%M": r"(?P<minute>\d{2})",
+    "%S": r"(?P<second>\d{2})",
+    "%p": r"(?P<am_pm>[AaPp][Mm])",
+}
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        "jan feb mar apr may jun jul aug sep oct nov dec".split(), start=1
+    )
+}
+_SEPARATORS = re.compile(r"[\s,]*")
+_STATUSES = {status.value.lower(): status for status in Status}
+_CATEGORIES = {category.value.lower(): category for category in Category}
+
+
+class DateParser:
+    """
+    Parses the dates of one column.
+    The first format that matches is kept for the whole column, as every
+    value of an export column has the same format: a later value that does
+    not match it is an error, rather than a date read in another format,
+    e.g. "03/04/2024" read as April 3 in one row and as March 4 in another.
+    Dates are naive, in the time zone of the export: the offset of JIRA REST
+    dates is dropped, as CSV exports have none.
+    """
+
+    def __init__(self, formats: tuple[str, ...] = DATE_FORMATS) -> None:
+        self.formats = formats
+        self._format: Optional[str] = None
+
+    def __call__(self, value: str) -> Optional[datetime]:
+        if not value:
+            return None
+        if self._format is not None:
+            try:
+                return _naive(_parser(self._format)(value))
+            except ValueError:
+                raise ValueError(
+                    f"Date {value!r} does not match {self._format!r},"
+                    " the format of the previous dates of the column"
+                ) from None
+        for date_format in ("iso", *self.formats):
+            try:
+                parsed = _parser(date_format)(value)
+            except ValueError:
+                continue
+            self._format = date_format
+            return _naive(parsed)
+        raise ValueError(f"Unrecognized date: {value!r}")
+
+
+def _naive(value: datetime) -> datetime:
+    return value if value.tzinfo is None else value.replace(tzinfo=None)
+
+
+@cache
+def _parser(date_format: str) -> Callable[[str], datetime]:
+    """
+    Return a function parsing dates in the given format.
+    strptime is slow, so formats made only of the directives found in JIRA
+    exports are compiled into a regular expression instead.
+    """
+    if date_format == "iso":
+        return datetime.fromisoformat
+    pattern = ""
+    for part in re.split("(%.)", date_format):
+        if part.startswith("%"):
+            if part not in _DIRECTIVES:
+                return lambda value: datetime.strptime(value, date_format)
+            pattern += _DIRECTIVES[part]
+        else:
+            pattern += re.escape(part)
+    match = re.compile(pattern).fullmatch
+
+    def parse(value: str) -> datetime:
+        found = match(value)
+        if found is None:
+            raise ValueError(f"{value!r} does not match {date_format!r}")
+        groups = found.groupdict()
+        if groups.get("year") is None:
+            short_year = int(groups["short_year"])
+            year = short_year + (2000 if short_year < 69 else 1900)
+        else:
+            year = int(groups["year"])
+        if groups.get("month") is None:
+            month = _MONTHS.get(groups["month_name"].lower())
+            if month is None:
+                raise ValueError(f"Unknown month in {value!r}")
+        else:
+            month = int(groups["month"])
+        if groups.get("hour12") is None:
+            hour = int(groups.get("hour") or 0)
+        else:
+            hour = int(groups["hour12"]) % 12
+            if groups["am_pm"].lower() == "pm":
+                hour += 12
+        return datetime(
+            year,
+            month,
+            int(groups["day"]),
+            hour,
+            int(groups.get("minute") or 0),
+            int(groups.get("second") or 0),
+        )
+
+    return parse
+
+
+def parse_status(value: Optional[str]) -> Status:
+    return _STATUSES.get((value or "").strip().lower(), Status.OTHER)
+
+
+def parse_category(value: Optional[str]) -> Optional[Category]:
+    return _CATEGORIES.get((value or "").strip().lower())
+
+
+def load_export(source: Union[str, Path], **kwargs: Any) -> Iterator[Ticket]:
+    """Stream the tickets of a CSV, JSON or JSON lines export, by file extension."""
+    suffix = Path(source).suffix.lower()
+    if suffix == ".csv":
+        return load_csv(source, **kwargs)
+    if suffix in (".json", ".jsonl"):
+        return load_json(source, **kwargs)
+    raise ValueError(f"Unsupported export format: {suffix}")
+
+
+def load_csv(
+    source: Source, columns: Optional[dict[str, tuple[str, ...]]] = None
+) -> Iterator[Ticket]:
+    """
+    Stream the tickets of a JIRA CSV export, one row at a time.
+    :param source: A path or an open text file
+    :param columns: Overrides of `CSV_COLUMNS`, by Ticket field
+    :return: a generator of tickets
+    """
+    candidates = {**CSV_COLUMNS, **(columns or {})}
+    with _open(source) as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader, [])]
+        indexes: dict[str, int] = {}
+        for field, names in candidates.items():
+            for name in names:
+                if name.lower() in header:
+                    indexes[field] = header.index(name.lower())
+                    break
+        for field in ("key", "summary", "status", "issue_type"):
+            if field not in indexes:
+                raise ValueError(f"Missing column for {field} in CSV export")
+
+        build = _TicketBuilder()
+        width = len(header)
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row += [""] * (width - len(row))
+            yield build({field: row[index] for field, index in indexes.items()})
+
+
+def load_json(
+    source: Source, fields: Optional[dict[str, str]] = None
+) -> Iterator[Ticket]:
+    """
+    Stream the tickets of a JIRA JSON export: a JIRA search response, a list
+    of issues or JSON lines with one issue per line. Issues are decoded one
+    at a time, without loading the whole document.
+    :param source: A path or an open text file
+    :param fields: Overrides of `JSON_FIELDS`, e.g. {"story_points": "customfield_10016"}
+    :return: a generator of tickets
+    """
+    mapping = {**JSON_FIELDS, **(fields or {})}
+    build = _TicketBuilder()
+    with _open(source) as f:
+        for issue in _iter_issues(f):
+            issue_fields = issue.get("fields", {})
+            values = {"key": issue.get("key", "")}
+            for field, name in mapping.items():
+                values[field] = _json_text(issue_fields.get(name))
+            yield build(values)
+
+
+class _TicketBuilder:
+    def __init__(self) -> None:
+        self.dates = {field: DateParser() for field in DATE_FIELDS}
+        # One string object per distinct value, instead of one per row
+        self.strings: dict[str, str] = {}
+
+    def __call__(self, values: dict[str, str]) -> Ticket:
+        strings = self.strings
+        return Ticket(
+            key=values["key"],
+            summary=values["summary"],
+            status=parse_status(values["status"]),
+            issue_type=strings.setdefault(values["issue_type"], values["issue_type"]),
+            start_date=self._date(values, "start_date"),
+            end_date=self._date(values, "end_date"),
+            due_date=self._date(values, "due_date"),
+            flagged=bool(values.get("flagged")),
+            priority=self._string(values, "priority"),
+            story_points=_whole_number(values["key"], values.get("story_points")),
+            tester_story_points=_number(values.get("tester_story_points")),
+            component=self._string(values, "component"),
+            developer=self._string(values, "developer"),
+            assignee=self._string(values, "assignee"),
+            category=parse_category(values.get("category")),
+        )
+
+    def _date(self, values: dict[str, str], field: str) -> Optional[datetime]:
+        return self.dates[field](values.get(field, ""))
+
+    def _string(self, values: dict[str, str], field: str) -> Optional[str]:
+        value = values.get(field)
+        if not value:
+            return None
+        return self.strings.setdefault(value, value)
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    return float(value) if value else None
+
+
+def _whole_number(key: str, value: Optional[str]) -> Optional[int]:
+    """Story points are stored as integers, so round fractional ones half up."""
+    number = _number(value)
+    if number is None:
+        return None
+    if not number.is_integer():
+        rounded = math.floor(number + 0.5)
+        message = f"Story points of {key} rounded from {value} to {rounded}"
+        warnings.warn(message, stacklevel=2)
+        return rounded
+    return int(number)
+
+
+def _json_text(value: Any) -> str:
+    """Flatten a JIRA field value (object, list or scalar) into text."""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return _json_text(value[0]) if value else ""
+    if isinstance(value, dict):
+        for key in ("name", "displayName", "value"):
+            if key in value:
+                return str(value[key])
+        return ""
+    return str(value)
+
+
+def _iter_issues(f: IO[str], chunk_size: int = 1 << 16) -> Iterator[dict[str, Any]]:
+    decoder = json.JSONDecoder()
+    buffer = f.read(chunk_size).lstrip()
+    pos = 0
+    if buffer.startswith("["):
+        pos = 1
+    else:
+        # A search response has its "issues" key before the first issue's
+        # "fields"; anything else starting with "{" is read as JSON lines.
+        issues_at = buffer.find('"issues"')
+        fields_at = buffer.find('"fields"')
+        if issues_at != -1 and (fields_at == -1 or issues_at < fields_at):
+            pos = buffer.index("[", issues_at) + 1
+
+    while True:
+        match = _SEPARATORS.match(buffer, pos)
+        pos = match.end() if match else pos
+        if len(buffer) - pos < chunk_size:
+            chunk = f.read(chunk_size)
+            if chunk:
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+        if pos >= len(buffer) or buffer[pos] == "]":
+            return
+        try:
+            issue, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield issue
+
+
+def _open(source: Source) -> ContextManager[IO[str]]:
+    if isinstance(source, (str, Path)):
+        return open(source, newline="", encoding="utf-8-sig")
+    return nullcontext(source)
@@ -1,13 +1,112 @@
-from fpdf_reporting.model.ticket import Category, Ticket
+from dataclasses import dataclass
+from typing import Iterable, Optional, TypeVar
+
+from fpdf_reporting.model.ticket import Category, Status, Ticket
+from fpdf_reporting.model.ticket_table import DimensionKey, TicketTable
+
+K = TypeVar("K")
+
+
+@dataclass(slots=True)
+class GroupTotals:
+    count: int = 0
+    story_points: int = 0
+    tester_story_points: float = 0
+    flagged: int = 0
+
+    def merge(self, other: "GroupTotals") -> None:
+        self.count += other.count
+        self.story_points += other.story_points
+        self.tester_story_points += other.tester_story_points
+        self.flagged += other.flagged
 
 
 class ReportData:
     not_delivered: list[Ticket]
-    story_points_by_category: dict[Category, int] = {}
-    story_points_by_status: dict[str, int] = {}
-    story_points_by_component: dict[str, int] = {}
-    story_points_by_priority: dict[str, int] = {}
-    story_points_by_issue_type: dict[str, int] = {}
+    totals: GroupTotals
+    by_category: dict[Optional[Category], GroupTotals]
+    by_status: dict[Status, GroupTotals]
+    by_component: dict[Optional[str], GroupTotals]
+    by_priority: dict[Optional[str], GroupTotals]
+    by_issue_type: dict[str, GroupTotals]
 
-    def __init__(self, not_delivered: list[Ticket]) -> None:
+    def __init__(
+        self, not_delivered: list[Ticket], tickets: Iterable[Ticket] = ()
+    ) -> None:
         self.not_delivered = not_delivered
+        self.totals = GroupTotals()
+        self.by_category = {}
+        self.by_status = {}
+        self.by_component = {}
+        self.by_priority = {}
+        self.by_issue_type = {}
+        self.add_tickets(tickets)
+
+    def add_tickets(self, tickets: Iterable[Ticket]) -> None:
+        """
+        Add the tickets to every aggregation in a single pass.
+        Can be called repeatedly, e.g. for chunks of a large export.
+        """
+        # Tickets are first grouped on all dimensions at once: there are few
+        # distinct combinations, so rolling them up per dimension is cheap.
+        if isinstance(tickets, TicketTable):
+            combinations = {
+                key: GroupTotals(*values)
+                for key, values in tickets.group_by_dimensions().items()
+            }
+        else:
+            combinations = _group_by_dimensions(tickets)
+
+        for key, totals in combinations.items():
+            category, status, component, priority, issue_type = key
+            self.totals.merge(totals)
+            _group(self.by_category, category).merge(totals)
+            _group(self.by_status, status).merge(totals)
+            _group(self.by_component, component).merge(totals)
+            _group(self.by_priority, priority).merge(totals)
+            _group(self.by_issue_type, issue_type).merge(totals)
+
+    @property
+    def story_points_by_category(self) -> dict[Optional[Category], int]:
+        return _story_points(self.by_category)
+
+    @property
+    def story_points_by_status(self) -> dict[Status, int]:
+        return _story_points(self.by_status)
+
+    @property
+    def story_points_by_component(self) -> dict[Optional[str], int]:
+        return _story_points(self.by_component)
+
+    @property
+    def story_points_by_priority(self) -> dict[Optional[str], int]:
+        return _story_points(self.by_priority)
+
+    @property
+    def story_points_by_issue_type(self) -> dict[str, int]:
+        return _story_points(self.by_issue_type)
+
+
+def _group_by_dimensions(tickets: Iterable[Ticket]) -> dict[DimensionKey, GroupTotals]:
+    combinations: dict[DimensionKey, GroupTotals] = {}
+    for t in tickets:
+        key = (t.category, t.status, t.component, t.priority, t.issue_type)
+        totals = combinations.get(key)
+        if totals is None:
+            totals = combinations[key] = GroupTotals()
+        totals.count += 1
+        totals.story_points += t.story_points or 0
+        totals.tester_story_points += t.tester_story_points or 0
+        totals.flagged += t.flagged
+    return combinations
+
+
+def _group(groups: dict[K, GroupTotals], key: K) -> GroupTotals:
+    totals = groups.get(key)
+    if totals is None:
+        totals = groups[key] = GroupTotals()
+    return totals
+
+
+def _story_points(groups: dict[K, GroupTotals]) -> dict[K, int]:
+    return {key: totals.story_points for key, totals in groups.items()}
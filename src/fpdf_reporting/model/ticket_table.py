@@ -0,0 +1,259 @@
+import math
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Generic, Iterable, Iterator, Optional, TypeVar
+
+from fpdf_reporting.model.ticket import Category, Status, Ticket
+
+T = TypeVar("T")
+
+STATUSES: tuple[Status, ...] = tuple(Status)
+CATEGORIES: tuple[Category, ...] = tuple(Category)
+
+# Dates are stored as microseconds since the epoch, in naive UTC
+EPOCH: datetime = datetime(1970, 1, 1)
+# Stands for None in the integer columns, dates included
+MISSING: int = -(2**63)
+_NO_CATEGORY = -1
+
+# Dictionary-encoded columns and the matching Ticket fields
+ENCODED_COLUMNS = ("issue_type", "priority", "component", "developer", "assignee")
+DATE_COLUMNS = ("start_date", "end_date", "due_date")
+
+# (category, status, component, priority, issue type)
+DimensionKey = tuple[Optional[Category], Status, Optional[str], Optional[str], str]
+
+
+class Dictionary(Generic[T]):
+    """
+    Maps the distinct values of a column to small integer codes.
+    Codes are stable: values are only ever added.
+    """
+
+    def __init__(self) -> None:
+        self.values: list[T] = []
+        self._codes: dict[T, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: T) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code(self, value: T) -> Optional[int]:
+        """Return the code of the value, or None if it was never encoded."""
+        return self._codes.get(value)
+
+
+class TicketTable:
+    """
+    Column-oriented storage for large ticket sets.
+
+    Statuses and categories are stored as enum indexes, repeated strings are
+    dictionary-encoded and dates and story points are kept in flat arrays.
+    Iterating or indexing the table creates `Ticket` objects on demand.
+    Timezone-aware dates are stored, and returned, as naive UTC.
+    """
+
+    def __init__(self, tickets: Iterable[Ticket] = ()) -> None:
+        self.keys: list[str] = []
+        self.summaries: list[str] = []
+        self.statuses = array("b")
+        self.categories = array("b")
+        self.flagged = array("b")
+        self.story_points = array("q")
+        self.tester_story_points = array("d")
+        self.dictionaries: dict[str, Dictionary[Optional[str]]] = {
+            name: Dictionary() for name in ENCODED_COLUMNS
+        }
+        self.codes: dict[str, array[int]] = {
+            name: array("i") for name in ENCODED_COLUMNS
+        }
+        self.dates: dict[str, array[int]] = {name: array("q") for name in DATE_COLUMNS}
+        self.extend(tickets)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __iter__(self) -> Iterator[Ticket]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> Ticket:
+        category = self.categories[index]
+        story_points = self.story_points[index]
+        tester_story_points = self.tester_story_points[index]
+        return Ticket(
+            key=self.keys[index],
+            summary=self.summaries[index],
+            status=STATUSES[self.statuses[index]],
+            category=None if category == _NO_CATEGORY else CATEGORIES[category],
+            flagged=bool(self.flagged[index]),
+            story_points=None if story_points == MISSING else story_points,
+            tester_story_points=(
+                None if math.isnan(tester_story_points) else tester_story_points
+            ),
+            issue_type=self._string("issue_type", index) or "",
+            priority=self._string("priority", index),
+            component=self._string("component", index),
+            developer=self._string("developer", index),
+            assignee=self._string("assignee", index),
+            start_date=decode_date(self.dates["start_date"][index]),
+            end_date=decode_date(self.dates["end_date"][index]),
+            due_date=decode_date(self.dates["due_date"][index]),
+        )
+
+    def _string(self, name: str, index: int) -> Optional[str]:
+        return self.dictionaries[name].values[self.codes[name][index]]
+
+    def append(self, ticket: Ticket) -> None:
+        self.keys.append(ticket.key)
+        self.summaries.append(ticket.summary)
+        self.statuses.append(STATUSES.index(Status(ticket.status)))
+        self.categories.append(
+            _NO_CATEGORY
+            if ticket.category is None
+            else CATEGORIES.index(Category(ticket.category))
+        )
+        self.flagged.append(ticket.flagged)
+        self.story_points.append(
+            MISSING if ticket.story_points is None else ticket.story_points
+        )
+        self.tester_story_points.append(
+            math.nan
+            if ticket.tester_story_points is None
+            else ticket.tester_story_points
+        )
+        for name in ENCODED_COLUMNS:
+            self.codes[name].append(
+                self.dictionaries[name].encode(getattr(ticket, name))
+            )
+        for name in DATE_COLUMNS:
+            self.dates[name].append(encode_date(getattr(ticket, name)))
+
+    def extend(self, tickets: Iterable[Ticket]) -> None:
+        for ticket in tickets:
+            self.append(ticket)
+
+    def select(self, indices: Iterable[int]) -> "TicketTable":
+        """Return a new table with the rows at the given indices."""
+        table = TicketTable()
+        # Sharing the dictionaries keeps the codes valid in both tables
+        table.dictionaries = self.dictionaries
+        table.codes = {name: array("i") for name in ENCODED_COLUMNS}
+        for index in indices:
+            table.keys.append(self.keys[index])
+            table.summaries.append(self.summaries[index])
+            table.statuses.append(self.statuses[index])
+            table.categories.append(self.categories[index])
+            table.flagged.append(self.flagged[index])
+            table.story_points.append(self.story_points[index])
+            table.tester_story_points.append(self.tester_story_points[index])
+            for name in ENCODED_COLUMNS:
+                table.codes[name].append(self.codes[name][index])
+            for name in DATE_COLUMNS:
+                table.dates[name].append(self.dates[name][index])
+        return table
+
+    def filter(self, **criteria: Any) -> "TicketTable":
+        """
+        Return the tickets whose fields equal all the given values, e.g.
+        `table.filter(status=Status.ON_HOLD, component=None)`.
+        Supports status, category, flagged and the dictionary-encoded columns.
+        """
+        columns: list[array[int]] = []
+        targets: list[int] = []
+        for name, value in criteria.items():
+            if name == "status":
+                columns.append(self.statuses)
+                targets.append(STATUSES.index(Status(value)))
+            elif name == "category":
+                columns.append(self.categories)
+                targets.append(
+                    _NO_CATEGORY if value is None else CATEGORIES.index(Category(value))
+                )
+            elif name == "flagged":
+                columns.append(self.flagged)
+                targets.append(int(bool(value)))
+            elif name in self.dictionaries:
+                code = self.dictionaries[name].code(value)
+                if code is None:
+                    return self.select(())
+                columns.append(self.codes[name])
+                targets.append(code)
+            else:
+                raise ValueError(f"Cannot filter tickets on {name}")
+
+        if not columns:
+            return self.select(range(len(self)))
+        wanted = tuple(targets)
+        return self.select(
+            index
+            for index, row in enumerate(zip(*columns, strict=True))
+            if row == wanted
+        )
+
+    def group_by_dimensions(self) -> dict[DimensionKey, tuple[int, int, float, int]]:
+        """
+        Return (count, story points, tester story points, flagged) for each
+        distinct (category, status, component, priority, issue type) found.
+        Works on the integer codes, without creating tickets.
+        """
+        groups: dict[tuple[int, int, int, int, int], list[Any]] = {}
+        for category, status, component, priority, issue_type, sp, tsp, flag in zip(
+            self.categories,
+            self.statuses,
+            self.codes["component"],
+            self.codes["priority"],
+            self.codes["issue_type"],
+            self.story_points,
+            self.tester_story_points,
+            self.flagged,
+            strict=True,
+        ):
+            key = (category, status, component, priority, issue_type)
+            totals = groups.get(key)
+            if totals is None:
+                totals = groups[key] = [0, 0, 0.0, 0]
+            totals[0] += 1
+            if sp != MISSING:
+                totals[1] += sp
+            if tsp == tsp:  # not NaN
+                totals[2] += tsp
+            totals[3] += flag
+
+        components = self.dictionaries["component"].values
+        priorities = self.dictionaries["priority"].values
+        issue_types = self.dictionaries["issue_type"].values
+        return {
+            (
+                None if category == _NO_CATEGORY else CATEGORIES[category],
+                STATUSES[status],
+                components[component],
+                priorities[priority],
+                issue_types[issue_type],  # type: ignore[misc]
+            ): (totals[0], totals[1], totals[2], totals[3])
+            for (category, status, component, priority, issue_type), totals in (
+                groups.items()
+            )
+        }
+
+
+def encode_date(value: Optional[datetime]) -> int:
+    """Return a date as stored in a `TicketTable`: microseconds since `EPOCH`."""
+    if value is None:
+        return MISSING
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def decode_date(value: int) -> Optional[datetime]:
+    """Return the naive UTC date stored by `encode_date`, or None for `MISSING`."""
+    if value == MISSING:
+        return None
+    return EPOCH + timedelta(microseconds=value)
@@ -0,0 +1,111 @@
+import asyncio
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from fpdf_reporting.rendering.batch import (
+    JobResult,
+    RenderFunction,
+    ReportJob,
+    init_worker,
+    render_bytes,
+    render_ticket_report,
+    run_job,
+)
+from fpdf_reporting.rendering.graphs import ChartBackend
+
+T = TypeVar("T")
+
+
+class AsyncRenderer:
+    """
+    Renders reports from asyncio code without blocking the event loop.
+
+    The rendering runs in an executor: threads by default, or worker processes
+    to use several cores. At most `max_concurrency` reports render at once,
+    further calls wait for a free slot. Cancelling a call drops a render that
+    has not started yet; a render already running cannot be interrupted, so
+    it keeps its slot until it ends and its result is discarded.
+
+        async with AsyncRenderer(max_concurrency=2) as renderer:
+            pdf_bytes = await renderer.render(job)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        executor: Optional[Executor] = None,
+        processes: bool = False,
+        render: RenderFunction = render_ticket_report,
+        chart_backend: ChartBackend = ChartBackend.VECTOR,
+    ) -> None:
+        """
+        :param max_concurrency: The number of reports rendering at the same time
+        :param executor: Runs the rendering, defaults to a pool owned by the renderer
+        :param processes: Whether the default pool uses processes instead of threads
+        :param render: A module-level function drawing a job into a PDF
+        :param chart_backend: The chart backend of every report
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.render_function = render
+        self.chart_backend = chart_backend
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._owns_executor = executor is None
+        if executor is not None:
+            self._executor = executor
+        elif processes:
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_concurrency,
+                initializer=init_worker,
+                initargs=(chart_backend,),
+            )
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    async def __aenter__(self) -> "AsyncRenderer":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def render(self, job: ReportJob) -> bytes:
+        """Render the job and return the PDF. Errors are raised to the caller."""
+        return await self._submit(
+            render_bytes, job, self.render_function, self.chart_backend
+        )
+
+    async def write(self, job: ReportJob) -> JobResult:
+        """Render the job to its output path. Errors are reported in the result."""
+        return await self._submit(
+            run_job, job, self.render_function, self.chart_backend
+        )
+
+    async def close(self) -> None:
+        """Wait for running renders and shut the default executor down."""
+        if self._owns_executor:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._executor.shutdown)
+
+    async def _submit(self, function: Callable[..., T], *args: Any) -> T:
+        await self._semaphore.acquire()
+        try:
+            future: Future[T] = self._executor.submit(function, *args)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        # The slot is freed when the work ends, not when the caller stops
+        # waiting, so that cancelled renders still count against the limit.
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: _call_soon(loop, self._semaphore.release))
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[[], None]) -> None:
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:  # the loop is closed, nobody is waiting anymore
+        pass
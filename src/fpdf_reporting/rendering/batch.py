@@ -0,0 +1,161 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Callable, ContextManager, Iterable, Iterator, Optional, Union
+
+from fpdf_reporting.model.style import Style
+from fpdf_reporting.model.ticket import Ticket
+from fpdf_reporting.model.ticket_table import TicketTable
+from fpdf_reporting.rendering.graphs import ChartBackend
+from fpdf_reporting.rendering.page_store import PageStore
+from fpdf_reporting.rendering.pdf_generator import PDF
+from fpdf_reporting.rendering.streaming import DEFAULT_COMPRESSION_LEVEL
+
+
+@dataclass(slots=True)
+class ReportJob:
+    style: Style
+    # A `TicketTable` keeps large ticket sets small in memory
+    tickets: Union[list[Ticket], TicketTable]
+    output_path: Path
+    title: str = "JIRA Report"
+    # The zlib level of the page streams: 1 favours speed, 9 favours size
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL
+    # Keep finished pages in a temporary file, for exports of many pages
+    spill_pages: bool = False
+
+
+@dataclass(slots=True)
+class JobResult:
+    output_path: Path
+    duration: float
+    error: Optional[str] = None
+    pages: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+RenderFunction = Callable[[PDF, ReportJob], None]
+
+# Jobs queued per worker process, enough to keep it busy between two results
+JOBS_PER_WORKER: int = 2
+
+
+def render_ticket_report(pdf: PDF, job: ReportJob) -> None:
+    """The default report: a header followed by a card for every ticket."""
+    pdf.add_page()
+    pdf.document_header(job.title)
+    pdf.detailed_tickets_table(job.tickets)
+
+
+def generate_reports(
+    jobs: Iterable[ReportJob],
+    render: RenderFunction = render_ticket_report,
+    max_workers: Optional[int] = None,
+    chart_backend: ChartBackend = ChartBackend.VECTOR,
+) -> Iterator[JobResult]:
+    """
+    Render the jobs in a pool of worker processes and write each PDF to its
+    output path. Results are yielded as jobs finish, in completion order.
+    A failing job is reported in its result and does not stop the batch.
+    At most `JOBS_PER_WORKER` jobs per process are submitted at a time, so a
+    generator of jobs is only read as the workers need more.
+    :param jobs: The reports to generate
+    :param render: A module-level function drawing a job into a PDF
+    :param max_workers: The number of processes, defaults to the CPU count
+    :param chart_backend: The chart backend used by every worker
+    """
+    jobs = iter(jobs)
+    in_flight = (max_workers or os.cpu_count() or 1) * JOBS_PER_WORKER
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=init_worker,
+        initargs=(chart_backend,),
+    ) as executor:
+        futures: dict[Future[JobResult], ReportJob] = {}
+        while True:
+            for job in islice(jobs, in_flight - len(futures)):
+                futures[executor.submit(run_job, job, render, chart_backend)] = job
+            if not futures:
+                return
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = futures.pop(future)
+                try:
+                    yield future.result()
+                except Exception as e:  # the worker process itself died
+                    yield JobResult(job.output_path, 0, error=repr(e))
+
+
+def init_worker(chart_backend: ChartBackend) -> None:
+    """
+    Prepare a process to render jobs: parse the fonts into its font registry
+    and import matplotlib if charts are drawn as images, once, up front.
+    :param chart_backend: The chart backend of the jobs rendered
+    """
+    PDF(Style())
+    if chart_backend is ChartBackend.PNG:
+        from matplotlib import figure  # noqa: F401
+
+
+def run_job(
+    job: ReportJob, render: RenderFunction, chart_backend: ChartBackend
+) -> JobResult:
+    """
+    Render a job and write its PDF to its output path. A failure is reported
+    in the result instead of raised.
+    :param job: The report to generate
+    :param render: Draws the job into a PDF
+    :param chart_backend: How charts are drawn
+    """
+    start = time.perf_counter()
+    try:
+        with _page_store(job) as page_store:
+            pdf = _render_document(job, render, chart_backend, page_store)
+            Path(job.output_path).parent.mkdir(parents=True, exist_ok=True)
+            pdf.output_stream(job.output_path)
+    except Exception as e:
+        return JobResult(job.output_path, time.perf_counter() - start, error=repr(e))
+    return JobResult(
+        job.output_path, time.perf_counter() - start, pages=pdf.pages_count
+    )
+
+
+def render_bytes(
+    job: ReportJob, render: RenderFunction, chart_backend: ChartBackend
+) -> bytes:
+    """
+    Render a job and return its PDF, without writing it to the output path.
+    :param job: The report to generate
+    :param render: Draws the job into a PDF
+    :param chart_backend: How charts are drawn
+    """
+    with _page_store(job) as page_store:
+        pdf = _render_document(job, render, chart_backend, page_store)
+        return bytes(pdf.output())
+
+
+def _page_store(job: ReportJob) -> ContextManager[Optional[PageStore]]:
+    return PageStore() if job.spill_pages else nullcontext()
+
+
+def _render_document(
+    job: ReportJob,
+    render: RenderFunction,
+    chart_backend: ChartBackend,
+    page_store: Optional[PageStore] = None,
+) -> PDF:
+    pdf = PDF(
+        job.style,
+        chart_backend=chart_backend,
+        compression_level=job.compression_level,
+        page_store=page_store,
+    )
+    render(pdf, job)
+    return pdf
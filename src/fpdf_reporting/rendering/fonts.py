@@ -0,0 +1,157 @@
+import copy
+from io import BytesIO
+from pathlib import Path
+from threading import Lock
+
+from fontTools import ttLib  # type: ignore[import-untyped]
+from fpdf import FPDF
+from fpdf.font_type_3 import get_color_font_object
+from fpdf.fonts import SubsetMap, TTFFont
+
+# TTFFont attributes computed from the font file only and read, never
+# written, while rendering: every document references the same objects.
+_SHARED_ATTRIBUTES = (
+    "type",
+    "name",
+    "glyph_ids",
+    "sp",
+    "ss",
+    "up",
+    "ut",
+    "ttffile",
+    "emphasis",
+    "scale",
+    "cmap",
+    "palette_index",
+    "is_compressed",
+    "is_cff",
+    "is_cid_keyed",
+    "is_symbol",
+    "cff_ros",
+    "collection_font_number",
+)
+# TTFFont attributes set for each document by `FontRegistry.add_font`
+_DOCUMENT_ATTRIBUTES = (
+    "cw",
+    "desc",
+    "i",
+    "fontkey",
+    "biggest_size_pt",
+    "missing_glyphs",
+    "_hbfont",
+    "ttfont",
+    "subset",
+    "color_font",
+)
+
+
+class _ParsedFont:
+    __slots__ = ("prototype", "data", "has_color_glyphs")
+
+    def __init__(self, prototype: TTFFont, data: bytes, has_color_glyphs: bool) -> None:
+        self.prototype = prototype
+        self.data = data
+        self.has_color_glyphs = has_color_glyphs
+
+
+class FontRegistry:
+    """
+    Process-wide cache of parsed TrueType fonts.
+
+    Each font file is read and parsed once; every document receives a font
+    object sharing the parsed metrics, with its own glyph subset and its own
+    copy of the font tables to subset on output.
+    """
+
+    def __init__(self) -> None:
+        self._fonts: dict[tuple[Path, str], _ParsedFont] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._fonts)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fonts.clear()
+
+    def add_font(self, pdf: FPDF, family: str, style: str, path: Path) -> None:
+        """
+        Make the font available in the given document, like `FPDF.add_font`.
+        :param pdf: The document to add the font to
+        :param family: The font family used with `set_font`
+        :param style: "" for regular, "B" for bold, "I" for italic
+        :param path: The path to the TTF file
+        """
+        style = "".join(sorted(style.upper()))
+        fontkey = f"{family.lower()}{style}"
+        if fontkey in pdf.fonts:
+            return
+
+        parsed = self._get(pdf, Path(path), fontkey, style)
+        font = TTFFont.__new__(TTFFont)
+        for attribute in _SHARED_ATTRIBUTES:
+            setattr(font, attribute, getattr(parsed.prototype, attribute))
+        # The widths are a defaultdict, that inserts every missing code point
+        # looked up, and output sets the object id, font name and font file
+        # of the descriptor.
+        font.cw = copy.copy(parsed.prototype.cw)
+        font.desc = copy.copy(parsed.prototype.desc)
+        font.i = len(pdf.fonts) + 1
+        font.fontkey = fontkey
+        font.biggest_size_pt = 0
+        font.missing_glyphs = []
+        font._hbfont = None
+        # Subsetting on output modifies the tables in place, so each document
+        # opens its own (lazily loaded) copy from the cached file contents.
+        font.ttfont = ttLib.TTFont(
+            BytesIO(parsed.data),
+            recalcTimestamp=False,
+            fontNumber=font.collection_font_number,
+            lazy=True,
+        )
+        font.subset = SubsetMap(font)
+        font.color_font = (
+            get_color_font_object(pdf, font, font.palette_index)
+            if parsed.has_color_glyphs and pdf.render_color_fonts
+            else None
+        )
+        pdf.fonts[fontkey] = font
+        if font.is_cff and font.is_cid_keyed:
+            pdf._set_min_pdf_version("1.6")
+
+    def _get(self, pdf: FPDF, path: Path, fontkey: str, style: str) -> _ParsedFont:
+        key = (path.resolve(), style)
+        parsed = self._fonts.get(key)
+        if parsed is not None:
+            return parsed
+        with self._lock:
+            parsed = self._fonts.get(key)
+            if parsed is None:
+                prototype = TTFFont(pdf, path, fontkey, style)
+                _check_attributes(prototype)
+                has_color_glyphs = prototype.color_font is not None
+                # The prototype is only a source of metrics: drop references
+                # to the document it was parsed for.
+                prototype.color_font = None
+                prototype.subset = None  # type: ignore[assignment]
+                prototype.close()
+                parsed = _ParsedFont(prototype, path.read_bytes(), has_color_glyphs)
+                self._fonts[key] = parsed
+            return parsed
+
+
+def _check_attributes(prototype: TTFFont) -> None:
+    """Fail, rather than build incomplete fonts, when TTFFont gains attributes."""
+    known = {*_SHARED_ATTRIBUTES, *_DOCUMENT_ATTRIBUTES}
+    unknown = [
+        attribute
+        for attribute in TTFFont.__slots__
+        if attribute not in known and hasattr(prototype, attribute)
+    ]
+    if unknown:
+        raise RuntimeError(
+            f"Unsupported fpdf2 version, TTFFont has new attributes: {unknown}"
+        )
+
+
+FONT_REGISTRY = FontRegistry()
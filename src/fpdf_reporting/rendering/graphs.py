@@ -1,7 +1,10 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from enum import StrEnum
 from io import BytesIO
-from typing import Optional
+from threading import Lock
+from typing import Any, Optional, Sequence
 
-from matplotlib import pyplot as plt
+from fpdf_reporting.rendering.cache import LRUCache
 
 NOTION_CHART_COLORS = [
     (155, 207, 87),  # green
@@ -12,33 +15,254 @@ NOTION_CHART_COLORS = [
     (181, 181, 181),  # gray
 ]
 
+DEFAULT_DPI: int = 200
+# Resolution of chart images as printed, whatever their width on the page
+CHART_PRINT_DPI: int = 120
+# Bounds on the width of chart images, in pixels
+MIN_CHART_PIXELS: int = 96
+MAX_CHART_PIXELS: int = 1200
+# The bar that sums the categories left out of a bar chart
+OTHER_LABEL: str = "Other"
+
+# Palette size of indexed images, plenty for flat chart colors and antialiasing
+INDEXED_COLORS: int = 64
+
+
+class ChartBackend(StrEnum):
+    VECTOR = "vector"  # drawn with PDF paths
+    PNG = "png"  # rasterized with matplotlib
+
+
+class ImageFormat(StrEnum):
+    PNG = "png"  # true color with alpha
+    INDEXED = "indexed"  # a palette of INDEXED_COLORS, smaller to embed
+
+
+ChartKey = tuple[
+    tuple[float, ...], float, tuple[tuple[int, int, int], ...], int, ImageFormat, float
+]
+
+
+# Rendered chart images, keyed on the chart content
+PIE_CHART_CACHE: LRUCache[ChartKey, bytes] = LRUCache(max_size=128)
+_MATPLOTLIB_LOCK = Lock()
+
+
+def top_categories(
+    data: dict[str, float], max_bars: int, other_label: str = OTHER_LABEL
+) -> dict[str, float]:
+    """
+    Keep the `max_bars - 1` largest categories, in their original order,
+    and sum the others into a last `other_label` category.
+    """
+    if max_bars < 2:
+        raise ValueError("max_bars must be at least 2")
+    if len(data) <= max_bars:
+        return dict(data)
+
+    import numpy as np
+
+    labels = list(data)
+    values = np.fromiter(data.values(), dtype=float, count=len(data))
+    kept = np.zeros(len(values), dtype=bool)
+    kept[np.argsort(-values, kind="stable")[: max_bars - 1]] = True
+    top = {labels[index]: float(values[index]) for index in np.flatnonzero(kept)}
+    top[other_label] = top.get(other_label, 0) + float(values[~kept].sum())
+    return top
+
+
+def histogram_bins(
+    values: Sequence[float], bins: int
+) -> tuple[list[float], list[float]]:
+    """Return the counts of the values in equal bins over their range, and the edges."""
+    import numpy as np
+
+    counts, edges = np.histogram(np.asarray(values, dtype=float), bins=bins)
+    return counts.astype(float).tolist(), edges.tolist()
+
+
+def chart_dpi(width: float, print_dpi: int = CHART_PRINT_DPI) -> int:
+    """
+    Return the dpi of a chart image drawn `width` mm wide, so that it prints
+    at `print_dpi` within MIN_CHART_PIXELS and MAX_CHART_PIXELS.
+    """
+    inches = width / 25.4
+    pixels = min(max(inches * print_dpi, MIN_CHART_PIXELS), MAX_CHART_PIXELS)
+    return max(1, round(pixels / inches))
+
+
+def pie_chart_key(
+    values: list[float],
+    size: float = 35,
+    colors: Optional[list[tuple[int, int, int]]] = None,
+    dpi: int = DEFAULT_DPI,
+    image_format: ImageFormat = ImageFormat.PNG,
+    hole: float = 0,
+) -> ChartKey:
+    """Return the key identifying a pie chart image, see `build_pie_chart_bytes`."""
+    colors = colors or NOTION_CHART_COLORS
+    return (
+        tuple(float(v) for v in values),
+        float(size),
+        tuple((r, g, b) for r, g, b in colors[: len(values)]),
+        dpi,
+        image_format,
+        float(hole),
+    )
+
+
+def check_hole(hole: float) -> None:
+    """:raises ValueError: The donut hole is not a fraction of the radius"""
+    if not 0 <= hole < 1:
+        raise ValueError(f"The donut hole must be within [0, 1), not {hole}")
+
 
 def build_pie_chart_bytes(
     values: list[float],
     size: float = 35,
     colors: Optional[list[tuple[int, int, int]]] = None,
+    dpi: int = DEFAULT_DPI,
+    image_format: ImageFormat = ImageFormat.PNG,
+    hole: float = 0,
 ) -> Optional[BytesIO]:
     """
     Return a PNG image as bytes for a pie chart.
+    Identical charts are served from `PIE_CHART_CACHE` instead of being redrawn.
     :param values: The values to plot
     :param size: The size of the chart in mm
     :param colors: Optional list of colors to use for each value
+    :param dpi: The resolution of the image
+    :param image_format: True color or indexed color PNG
+    :param hole: The radius of the donut hole, as a fraction of the chart radius
     :return: the bytes of the chart or None if there are no values
     """
-
-    size_inch = size / 25.4
-
+    check_hole(hole)
     if sum(values) == 0:
         return None
 
-    fig, ax = plt.subplots(figsize=(size_inch, size_inch))
     colors = colors or NOTION_CHART_COLORS
+    key = pie_chart_key(values, size, colors, dpi, image_format, hole)
+    image = PIE_CHART_CACHE.get(key)
+    if image is None:
+        image = _render_pie_chart(values, size, colors, dpi, image_format, hole)
+        PIE_CHART_CACHE.put(key, image)
+    return BytesIO(image)
+
+
+class ChartPool:
+    """
+    Renders chart images in worker processes, so that a document goes on with
+    its layout while its charts are rasterized. Charts only render side by
+    side when they are submitted before any is needed, see
+    `PDF.prefetch_pie_chart`. Processes rather than threads, as matplotlib is
+    not thread-safe and renders one chart at a time per process. A pool is
+    meant to outlive documents: its workers import matplotlib once.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """:param max_workers: The number of processes, defaults to the CPU count"""
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_chart_worker
+        )
+
+    def submit_pie_chart(
+        self,
+        values: list[float],
+        size: float,
+        colors: Optional[list[tuple[int, int, int]]] = None,
+        dpi: int = DEFAULT_DPI,
+        image_format: ImageFormat = ImageFormat.PNG,
+        hole: float = 0,
+    ) -> "Future[bytes]":
+        """
+        Start rendering a pie chart image, see `build_pie_chart_bytes`.
+        Images are shared with `PIE_CHART_CACHE`: a cached chart is not
+        rendered again, and a rendered chart is cached when done.
+        """
+        check_hole(hole)
+        colors = colors or NOTION_CHART_COLORS
+        key = pie_chart_key(values, size, colors, dpi, image_format, hole)
+        image = PIE_CHART_CACHE.get(key)
+        if image is not None:
+            future: Future[bytes] = Future()
+            future.set_result(image)
+            return future
+
+        def cache(done: "Future[bytes]") -> None:
+            if not done.cancelled() and done.exception() is None:
+                PIE_CHART_CACHE.put(key, done.result())
+
+        future = self._executor.submit(
+            _render_pie_chart,
+            list(values),
+            size,
+            list(colors),
+            dpi,
+            image_format,
+            hole,
+        )
+        future.add_done_callback(cache)
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self) -> "ChartPool":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+
+
+def _init_chart_worker() -> None:
+    from matplotlib import figure  # noqa: F401
+
+
+def _render_pie_chart(
+    values: list[float],
+    size: float,
+    colors: list[tuple[int, int, int]],
+    dpi: int,
+    image_format: ImageFormat = ImageFormat.PNG,
+    hole: float = 0,
+) -> bytes:
+    # matplotlib takes longer to import than the rest of the package together;
+    # import it on the first chart instead of at start-up.
+    from matplotlib.figure import Figure
+
+    size_inch = size / 25.4
     graph_colors = [(r / 255, g / 255, b / 255) for r, g, b in colors[: len(values)]]
-    ax.pie(values, colors=graph_colors, startangle=90, counterclock=False)
 
+    # A standalone Figure does not touch pyplot's global figure state, and
+    # the lock covers the rest of matplotlib (rcParams, font cache), which is
+    # not thread-safe either.
+    with _MATPLOTLIB_LOCK:
+        fig = Figure(figsize=(size_inch, size_inch))
+        ax = fig.subplots()
+        # Wedges are rings of the given width, as a fraction of the radius
+        wedges = {"width": 1 - hole} if hole else None
+        ax.pie(
+            values,
+            colors=graph_colors,
+            startangle=90,
+            counterclock=False,
+            wedgeprops=wedges,
+        )
+        buf = BytesIO()
+        fig.tight_layout(pad=0)
+        fig.savefig(buf, format="png", dpi=dpi, transparent=True)
+    if image_format is ImageFormat.INDEXED:
+        return _to_indexed(buf)
+    return buf.getvalue()
+
+
+def _to_indexed(png: BytesIO) -> bytes:
+    from PIL import Image
+
+    png.seek(0)
+    with Image.open(png) as image:
+        # Fast octree is the quantizer that keeps the alpha channel
+        indexed = image.quantize(INDEXED_COLORS, method=Image.Quantize.FASTOCTREE)
     buf = BytesIO()
-    plt.tight_layout(pad=0)
-    plt.savefig(buf, format="png", dpi=200, transparent=True)
-    plt.close(fig)
-    buf.seek(0)
-    return buf
+    indexed.save(buf, format="png", optimize=True)
+    return buf.getvalue()
@@ -0,0 +1,129 @@
+"""
+Two-pass layout of report blocks. The boxes of the blocks are measured
+first, without drawing anything, then packed into rows, page after page,
+so that page breaks are known before the first block is drawn. A layout
+only depends on the structure of a report, not on its values: it is
+cached, and reports built alike skip measuring and packing.
+"""
+
+from dataclasses import dataclass
+from math import ceil
+from typing import Hashable, Optional, Sequence, Union
+
+from fpdf_reporting.rendering.cache import LRUCache
+from fpdf_reporting.rendering.graphs import ChartBackend
+
+# Tolerance on positions, in mm, so that boxes filling a row exactly fit
+_EPSILON: float = 1e-6
+
+
+@dataclass(slots=True)
+class SummaryCard:
+    items: list[str]
+    width: float = 80
+
+
+@dataclass(slots=True)
+class BarChart:
+    data: dict[str, float]
+    caption: Optional[str] = None
+    width: float = 60
+    max_bars: Optional[int] = None  # the default of `PDF.bar_chart`
+
+
+@dataclass(slots=True)
+class PieChart:
+    data: dict[str, float]
+    width: float = 70
+    caption: Optional[str] = None
+    hole: float = 0
+    backend: Optional[ChartBackend] = None
+
+
+@dataclass(slots=True)
+class Legend:
+    labels: list[str]
+    caption: Optional[str] = None
+
+
+Block = Union[SummaryCard, BarChart, PieChart, Legend]
+
+
+@dataclass(frozen=True, slots=True)
+class Box:
+    width: float
+    height: float
+
+
+@dataclass(frozen=True, slots=True)
+class Frame:
+    """The area blocks are laid out in: the page within its margins."""
+
+    left: float
+    top: float
+    width: float
+    bottom: float  # the page break trigger
+    y: float  # where the layout starts on the first page
+
+
+@dataclass(frozen=True, slots=True)
+class Placement:
+    page: int  # counted from the page the layout starts on
+    x: float
+    y: float
+
+
+@dataclass(frozen=True, slots=True)
+class Layout:
+    boxes: tuple[Box, ...]
+    placements: tuple[Placement, ...]
+    end_y: float  # the bottom of the last row
+
+    @property
+    def pages(self) -> int:
+        """The number of pages the layout spans, including the first."""
+        return self.placements[-1].page + 1 if self.placements else 1
+
+
+def pack(
+    boxes: Sequence[Box], frame: Frame, gap: float, columns: Optional[int] = None
+) -> Layout:
+    """
+    Place boxes left to right in rows, starting a row when a box does not
+    fit in the width left, and a page when it does not fit in the height
+    left. A box larger than a page starts a page of its own, which it
+    overflows.
+    :param boxes: The sizes of the blocks, in drawing order
+    :param frame: The area of the pages
+    :param gap: The space between boxes, horizontally and vertically
+    :param columns: Align boxes on a grid of this many columns, a box
+        spanning as many columns as its width takes
+    """
+    pitch = (frame.width + gap) / columns if columns else None
+    right = frame.left + frame.width + _EPSILON
+    placements = []
+    page, x, y = 0, frame.left, frame.y
+    row_height = 0.0
+    for box in boxes:
+        width = box.width
+        if pitch is not None:
+            width = ceil((box.width + gap) / pitch - _EPSILON) * pitch - gap
+        if x > frame.left and x + width > right:
+            x, y = frame.left, y + row_height + gap
+            row_height = 0.0
+        if y + box.height > frame.bottom + _EPSILON and (
+            y > frame.top or x > frame.left
+        ):
+            page, x, y = page + 1, frame.left, frame.top
+            row_height = 0.0
+        placements.append(Placement(page, x, y))
+        x += width + gap
+        row_height = max(row_height, box.height)
+    return Layout(tuple(boxes), tuple(placements), y + row_height)
+
+
+LayoutKey = tuple[tuple[Hashable, ...], Frame, float, Optional[int]]
+
+
+# Layouts, keyed on the structure of the blocks and the frame they are laid out in
+LAYOUT_CACHE: LRUCache[LayoutKey, Layout] = LRUCache(max_size=256)
@@ -0,0 +1,109 @@
+"""
+Page contents moved out of memory once their page is finished. FPDF keeps
+the content stream of every page in memory until the document is
+serialized; with a `PageStore`, a page's contents are written to a
+temporary file when the next page starts, and read back one page at a time
+while the document is serialized. Memory then depends on the size of a
+page rather than on the number of pages.
+"""
+
+import tempfile
+import zlib
+from os import PathLike
+from typing import IO, Any, Optional, Union
+
+from fpdf.syntax import Name, PDFContentStream
+
+
+class PageStore:
+    """An append-only temporary file of page contents."""
+
+    def __init__(self, directory: Optional[Union[str, PathLike[str]]] = None) -> None:
+        """
+        :param directory: Where the temporary file is created, defaults to the
+            system's temporary directory
+        """
+        self._file: IO[bytes] = tempfile.TemporaryFile(dir=directory)
+        self.size = 0
+        self.pages = 0
+
+    def put(self, contents: Union[bytes, bytearray]) -> "SpilledContents":
+        """Write the contents of a page, and return what stands in for them."""
+        self._file.seek(self.size)
+        self._file.write(contents)
+        spilled = SpilledContents(self, self.size, len(contents))
+        self.size += len(contents)
+        self.pages += 1
+        return spilled
+
+    def read(self, offset: int, length: int) -> bytes:
+        self._file.seek(offset)
+        return self._file.read(length)
+
+    def close(self) -> None:
+        """Delete the temporary file. Pages in the store can no longer be read."""
+        self._file.close()
+
+    def __enter__(self) -> "PageStore":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class SpilledContents:
+    """
+    Stands in for the contents of a page in a `PageStore`. FPDF appends to
+    finished pages, e.g. a table of contents, and replaces text in them, e.g.
+    the total page count alias: both are recorded, and applied when the
+    contents are read back.
+    """
+
+    __slots__ = ("store", "offset", "length", "tail", "substitutions")
+
+    def __init__(self, store: PageStore, offset: int, length: int) -> None:
+        self.store = store
+        self.offset = offset
+        self.length = length
+        self.tail = bytearray()
+        self.substitutions: list[tuple[bytes, bytes]] = []
+
+    def __iadd__(self, data: bytes) -> "SpilledContents":
+        self.tail += data
+        return self
+
+    def replace(self, old: bytes, new: bytes) -> "SpilledContents":
+        self.substitutions.append((old, new))
+        return self
+
+    def read(self) -> bytes:
+        contents = self.store.read(self.offset, self.length) + self.tail
+        for old, new in self.substitutions:
+            contents = contents.replace(old, new)
+        return contents
+
+
+class SpilledContentStream(PDFContentStream):
+    """
+    The content stream of a page in a `PageStore`, read back and compressed
+    only while it is serialized, then released.
+    """
+
+    def __init__(self, contents: SpilledContents, compress: bool, level: int) -> None:
+        super().__init__(contents=b"")
+        self._spilled = contents
+        self._compress = compress
+        self._level = level
+        if compress:
+            self.filter = Name("FlateDecode")
+
+    def serialize(self, obj_dict: Any = None, _security_handler: Any = None) -> str:
+        contents = self._spilled.read()
+        self._contents = (
+            zlib.compress(contents, level=self._level) if self._compress else contents
+        )
+        self.length = len(self._contents)
+        try:
+            return super().serialize(obj_dict, _security_handler)
+        finally:
+            self._contents = b""
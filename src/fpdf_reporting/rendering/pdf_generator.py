@@ -1,11 +1,91 @@
+import math
+from concurrent.futures import Future
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache, partial
+from io import BytesIO
+from itertools import chain, islice
+from os import PathLike
 from pathlib import Path
-from typing import Any, List, Optional, Tuple
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    ContextManager,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from fpdf import FPDF, XPos, YPos
+from fpdf.drawing import PaintedPath
+from fpdf.drawing_primitives import (
+    Color,
+    ColorInput,
+    convert_to_device_color,
+    rgb8,
+)
+from fpdf.enums import PathPaintRule, TextEmphasis
+from fpdf.fonts import TTFFont
+from fpdf.image_datastructures import RasterImageInfo
+from fpdf.util import Number
 
+from fpdf_reporting.model.flow import (
+    DailySeries,
+    Tickets,
+    burndown,
+    cumulative_flow,
+    cycle_times,
+)
 from fpdf_reporting.model.style import Style
 from fpdf_reporting.model.ticket import Status, Ticket
-from fpdf_reporting.rendering.graphs import build_pie_chart_bytes
+from fpdf_reporting.rendering.fonts import FONT_REGISTRY
+from fpdf_reporting.rendering.graphs import (
+    ChartBackend,
+    ChartKey,
+    ChartPool,
+    ImageFormat,
+    build_pie_chart_bytes,
+    chart_dpi,
+    check_hole,
+    histogram_bins,
+    pie_chart_key,
+    top_categories,
+)
+from fpdf_reporting.rendering.layout import (
+    LAYOUT_CACHE,
+    BarChart,
+    Block,
+    Box,
+    Frame,
+    Layout,
+    Legend,
+    PieChart,
+    SummaryCard,
+    pack,
+)
+from fpdf_reporting.rendering.page_store import PageStore
+from fpdf_reporting.rendering.profiling import Profiler, profiled
+from fpdf_reporting.rendering.streaming import (
+    DEFAULT_COMPRESSION_LEVEL,
+    ReportOutputProducer,
+    StreamBuffer,
+    StreamingOutputProducer,
+    content_stream,
+    validate_compression_level,
+)
+from fpdf_reporting.rendering.text import TextOverflow, truncate, wrap
+from fpdf_reporting.rendering.xobjects import (
+    add_form_xobject,
+    captured_contents,
+    claim_image_index,
+    use_xobject,
+)
 
 FONT_FAMILY: str = "Inter"
 HEADER_SIZE: int = 20
@@ -18,6 +98,23 @@ _SMALL_SPACING: float = 2
 _MEDIUM_SPACING: float = 5
 _LARGE_SPACING: float = 10
 
+_CARD_ROW_HEIGHT: float = 6
+
+# Tables
+TABLE_SAMPLE_SIZE: int = 1000
+_TABLE_LINE_HEIGHT: float = 3.5
+
+# Bar charts
+_BAR_CHART_HEIGHT: int = 30
+_BAR_WIDTH: float = 3
+_BAR_SPACING: float = 2
+_MIN_BAR_WIDTH: float = 0.6
+_LEGEND_WIDTH: float = 22
+# The narrowest chart drawn in the space left on a line
+_MIN_CHART_WIDTH: float = 20
+DEFAULT_MAX_BARS: int = 12
+DEFAULT_HISTOGRAM_BINS: int = 60
+
 # Priority indicator
 PRIORITY_COLORS = {
     "High": (252, 216, 212),  # red
@@ -27,24 +124,301 @@ PRIORITY_COLORS = {
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 OUTPUT_DIR = PROJECT_ROOT / "fonts"
+TEXT_WIDTH_CACHE_SIZE: int = 4096
+
+FONT_FILES = {
+    "": "Inter-Regular.ttf",
+    "B": "Inter-Bold.ttf",
+    "I": "Inter-Italic.ttf",
+}
+
+
+TextWidthKey = tuple[str, str, float, float, float, str]
+FontRequest = tuple[Optional[str], Union[str, TextEmphasis], float]
+FontState = tuple[str, str, float, bool, bool]
+TemplateKey = tuple[Any, ...]
+
+
+@dataclass(slots=True)
+class GraphicsStateStats:
+    """Graphics state changes dropped while drawing a document."""
+
+    # Setter calls that would not have changed the active font or color
+    redundant_calls: int = 0
 
 
 class PDF(FPDF):
     style: Style
+    chart_backend: ChartBackend
+    graphics_stats: GraphicsStateStats
+    templates: bool
+    profiler: Optional[Profiler]
+    compression_level: int
+    chart_image_format: ImageFormat
+    page_store: Optional[PageStore]
+    chart_pool: Optional[ChartPool]
+    _text_widths: dict[TextWidthKey, float]
+    _templates: dict[TemplateKey, int]
+    _chart_images: dict[ChartKey, bytes]
+    _chart_futures: dict[ChartKey, Future[bytes]]
+    _font_request: Optional[tuple[FontRequest, FontState]]
 
-    def __init__(self, style: Style, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        style: Style,
+        chart_backend: ChartBackend = ChartBackend.VECTOR,
+        templates: bool = True,
+        profiler: Optional[Profiler] = None,
+        compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+        chart_image_format: ImageFormat = ImageFormat.PNG,
+        page_store: Optional[PageStore] = None,
+        chart_pool: Optional[ChartPool] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param style: The colors of the report
+        :param chart_backend: How charts are drawn by default
+        :param templates: Draw the static parts of cards and tags once per
+            document, as reusable Form XObjects
+        :param profiler: Records the calls and time of the drawing methods
+        :param compression_level: The zlib level of the page content streams,
+            from 0 (fastest) to 9 (smallest), -1 for zlib's default
+        :param chart_image_format: The image format of charts drawn as images
+        :param page_store: Moves the contents of every finished page out of
+            memory until the document is output
+        :param chart_pool: Renders the chart images prefetched with
+            `prefetch_pie_chart` in other processes
+        """
         super().__init__(**kwargs)
         self.style = style
+        self.chart_backend = chart_backend
+        self.templates = templates
+        self.profiler = profiler
+        self.compression_level = validate_compression_level(compression_level)
+        self.chart_image_format = chart_image_format
+        self.page_store = page_store
+        self.chart_pool = chart_pool
+        self.graphics_stats = GraphicsStateStats()
+        self._text_widths = {}
+        self._templates = {}
+        self._chart_images = {}
+        self._chart_futures = {}
+        self._font_request = None
         self.set_margin(MARGIN_SIZE)
-        self.add_font(FONT_FAMILY, "", OUTPUT_DIR / "Inter-Regular.ttf")
-        self.add_font(FONT_FAMILY, "B", OUTPUT_DIR / "Inter-Bold.ttf")
-        self.add_font(FONT_FAMILY, "I", OUTPUT_DIR / "Inter-Italic.ttf")
+        for font_style, file_name in FONT_FILES.items():
+            FONT_REGISTRY.add_font(
+                self, FONT_FAMILY, font_style, OUTPUT_DIR / file_name
+            )
+
+    def _beginpage(self, *args: Any, **kwargs: Any) -> None:
+        """Move the finished page to the page store, if any, then start the next."""
+        if self.page_store is not None and self.page > 0:
+            page = self.pages[self.page]
+            if isinstance(page.contents, bytearray):
+                page.contents = self.page_store.put(page.contents)  # type: ignore[assignment]
+        super()._beginpage(*args, **kwargs)
+
+    def set_font(
+        self,
+        family: Optional[str] = None,
+        style: Union[str, TextEmphasis] = "",
+        size: float = 0,
+    ) -> None:
+        request = (family, style, size)
+        if self._font_request == (request, self._font_state()):
+            self.graphics_stats.redundant_calls += 1
+            return
+        super().set_font(family, style, size)
+        self._font_request = (request, self._font_state())
+
+    def _font_state(self) -> FontState:
+        return (
+            self.font_family,
+            self.font_style,
+            self.font_size_pt,
+            self.underline,
+            self.strikethrough,
+        )
+
+    def set_fill_color(self, r: ColorInput, g: Number = -1, b: Number = -1) -> None:
+        color = _device_color(r, g, b)
+        if color == self.fill_color:
+            self.graphics_stats.redundant_calls += 1
+            return
+        super().set_fill_color(color)
+
+    def set_draw_color(self, r: ColorInput, g: Number = -1, b: Number = -1) -> None:
+        color = _device_color(r, g, b)
+        if color == self.draw_color:
+            self.graphics_stats.redundant_calls += 1
+            return
+        super().set_draw_color(color)
+
+    def set_text_color(self, r: ColorInput, g: Number = -1, b: Number = -1) -> None:
+        color = _device_color(r, g, b)
+        if color == self.text_color:
+            self.graphics_stats.redundant_calls += 1
+            return
+        super().set_text_color(color)
+
+    def stamp(
+        self,
+        key: TemplateKey,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        draw: Callable[[float, float], None],
+    ) -> None:
+        """
+        Draw static geometry at (x, y) through a template.
+        The first use of a key compiles `draw(0, 0)` into a Form XObject, later
+        uses only place it, so the geometry is written once per document.
+        :param key: Identifies the geometry, including everything that changes it
+        :param width: The width of the geometry drawn
+        :param height: The height of the geometry drawn
+        :param draw: Draws the geometry with its top left corner at the given point
+        """
+        if not self.templates:
+            draw(x, y)
+            return
+        index = self._templates.get(key)
+        if index is None:
+            index = self._templates[key] = self._compile_template(width, height, draw)
+        use_xobject(self, index)
+        self._out(f"q 1 0 0 1 {x * self.k:.2f} {-y * self.k:.2f} cm /I{index} Do Q")
+
+    def _compile_template(
+        self, width: float, height: float, draw: Callable[[float, float], None]
+    ) -> int:
+        state = self.fill_color, self.draw_color
+        # The template may be placed anywhere, so it sets every color it uses
+        self.fill_color = self.draw_color = None
+        try:
+            with captured_contents(self) as contents:
+                self._out(f"{self.line_width * self.k:.2f} w")
+                draw(0, 0)
+        finally:
+            self.fill_color, self.draw_color = state
+
+        margin = self.line_width * self.k
+        return add_form_xobject(
+            self,
+            content_stream(bytes(contents), self.compress, self.compression_level),
+            (
+                -margin,
+                (self.h - height) * self.k - margin,
+                width * self.k + margin,
+                self.h * self.k + margin,
+            ),
+        )
+
+    def _raster_image(
+        self, name: str, img: Any, info: RasterImageInfo, *args: Any, **kwargs: Any
+    ) -> RasterImageInfo:
+        """Number a new image after the templates, see `claim_image_index`."""
+        claim_image_index(self, info)
+        return super()._raster_image(name, img, info, *args, **kwargs)
+
+    def measure_text(self, text: str) -> float:
+        """
+        Return the width of the text in the current font, like `get_string_width`.
+        Widths are memoized, as labels like statuses and issue types repeat often.
+        """
+        key = (
+            self.font_family,
+            self.font_style,
+            self.font_size_pt,
+            self.font_stretching,
+            self.char_spacing,
+            text,
+        )
+        width = self._text_widths.get(key)
+        if width is None:
+            if len(self._text_widths) >= TEXT_WIDTH_CACHE_SIZE:
+                self._text_widths.clear()
+            width = self._text_widths[key] = self._text_width(text)
+        return width
+
+    def _text_width(self, text: str) -> float:
+        """
+        Return the width of the text in the current font. Without text shaping,
+        a TrueType font measures text by summing its glyph widths, done here
+        directly instead of through the fragments `get_string_width` builds.
+        """
+        font = self.current_font
+        if self.text_shaping or not isinstance(font, TTFFont) or font.is_symbol:
+            return self.get_string_width(text)
+        width = sum(map(font.cw.__getitem__, map(ord, text)))
+        width *= self.font_size_pt * 0.001
+        char_spacing = self.char_spacing
+        if self.font_stretching != 100:
+            width *= self.font_stretching * 0.01
+            char_spacing *= self.font_stretching * 0.01
+        return (width + char_spacing * len(text)) / self.k
+
+    def measure_texts(self, texts: Iterable[str]) -> list[float]:
+        """Return the widths of many texts in the current font."""
+        return [self.measure_text(text) for text in texts]
+
+    def set_compression_level(self, level: int) -> None:
+        """
+        Set the zlib level of the page content streams, from 0 (fastest)
+        to 9 (smallest), or -1 for zlib's default.
+        """
+        self.compression_level = validate_compression_level(level)
+
+    def output(self, *args: Any, **kwargs: Any) -> Any:
+        """Serialize the document like `FPDF.output`, then flush the profiler."""
+        kwargs.setdefault("output_producer_class", ReportOutputProducer)
+        if self.profiler is None:
+            return super().output(*args, **kwargs)
+        with self.profiler.section("output"):
+            result = super().output(*args, **kwargs)
+        self.profiler.flush()
+        return result
+
+    def output_stream(self, target: Union[str, PathLike[str], BinaryIO]) -> int:
+        """
+        Serialize the document into a file, writing every PDF object as soon
+        as it is serialized instead of building the whole document in memory
+        first. A document can only be written once this way.
+        :param target: A file path or a binary file-like object
+        :return: The number of bytes written
+        """
+        if self._sign_key:
+            raise ValueError("Signed documents cannot be streamed")
+        if isinstance(target, (str, PathLike)):
+            with open(target, "wb") as f:
+                return self.output_stream(f)
+
+        def producer(fpdf: FPDF) -> StreamingOutputProducer:
+            return StreamingOutputProducer(fpdf, target)
+
+        return len(self.output(output_producer_class=producer))
+
+    def _default_file_id(self, buffer: Any) -> str:
+        if not isinstance(buffer, StreamBuffer):
+            return super()._default_file_id(buffer)
+        # The streamed bytes are gone, their running hash gives the same ID
+        id_hash = buffer.md5.copy()
+        if self.creation_date:
+            id_hash.update(self.creation_date.strftime("%Y%m%d%H%M%S").encode("utf8"))
+        hash_hex = id_hash.hexdigest().upper()
+        return f"<{hash_hex}><{hash_hex}>"
 
-    def footer(self):
+    def _section(self, name: str) -> ContextManager[None]:
+        """Time a step of a drawing method, when profiling."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.section(name)
+
+    def footer(self) -> None:
         self.set_y(-15)
         self.set_font(FONT_FAMILY, "I", 8)
         self.cell(0, 10, f"Page {self.page_no()}", align="C")
 
+    @profiled
     def document_header(self, text: str, centered: bool = False) -> None:
         self.set_font(FONT_FAMILY, "B", size=HEADER_SIZE)
         self.set_fill_color(*self.style.header_background)  # warm gray
@@ -79,23 +453,25 @@ class PDF(FPDF):
         self.line(x1, y, x2, y)
         self.ln(_MEDIUM_SPACING)
 
+    @profiled
     def section_title(self, text: str) -> None:
         self.set_font(FONT_FAMILY, "B", SECTION_TITLE_SIZE)
         self.set_text_color(*self.style.section_title_color)
         self.cell(0, 10, text, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         self.set_xy(self.get_x(), self.get_y() + _LARGE_SPACING)
 
+    @profiled
     def summary_card(
         self,
         items: List[str],
-        width: int = 80,
+        width: float = 80,
         x: Optional[float] = None,
         y: Optional[float] = None,
     ) -> tuple[float, float]:
         start_x = x or self.x
         start_y = y or self.y
         padding = _MEDIUM_SPACING
-        row_height = 6
+        row_height = _CARD_ROW_HEIGHT
         card_height = (len(items) * row_height) + 2 * padding
 
         self.set_fill_color(*self.style.card_background)
@@ -125,33 +501,144 @@ class PDF(FPDF):
             self.set_xy(start_x + width + padding, start_y)
         return start_x + width, start_y + card_height
 
+    @profiled
     def styled_table(
         self,
-        headers: list[str],
-        rows: list[tuple[str, str, str, str]],
-        col_widths: list[int],
+        headers: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        col_widths: Optional[list[float]] = None,
+        overflow: TextOverflow = TextOverflow.TRUNCATE,
+        max_lines: int = 3,
+        sample_size: int = TABLE_SAMPLE_SIZE,
     ) -> None:
+        """
+        Draw a table, page after page, repeating the header row at the top of
+        every page. Rows are read one at a time from any iterable, so that
+        very large tables are drawn in linear time without being held in memory.
+        :param headers: The column titles, which set the number of columns
+        :param rows: The cells of each row: missing cells are left empty,
+            extra cells are ignored and values other than text are formatted
+        :param col_widths: The column widths in mm, defaults to widths fitting
+            the headers and the first `sample_size` rows
+        :param overflow: How cells wider than their column are shortened
+        :param max_lines: The number of lines of a wrapped cell at most
+        :param sample_size: The number of rows measured for the column widths
+        """
+        rows = iter(rows)
+        columns = len(headers)
+        if col_widths is None:
+            sample = [_table_cells(row, columns) for row in islice(rows, sample_size)]
+            col_widths = self.table_column_widths(headers, sample)
+            rows = chain(sample, rows)
+
+        self._table_header(headers, col_widths)
+        self.set_font(FONT_FAMILY, "", LABEL_SIZE)
+        for idx, row in enumerate(rows):
+            cells = self._fit_cells(
+                _table_cells(row, columns), col_widths, overflow, max_lines
+            )
+            height = LABEL_SIZE + _TABLE_LINE_HEIGHT * (max(map(len, cells)) - 1)
+            if self.will_page_break(height):
+                self.add_page(same=True)
+                self._table_header(headers, col_widths)
+                self.set_font(FONT_FAMILY, "", LABEL_SIZE)
+            self._table_row(
+                cells, col_widths, height, self.style.table_row_colors[idx % 2]
+            )
+        self.set_y(self.get_y() + _LARGE_SPACING)
+
+    def _table_header(self, headers: Sequence[str], col_widths: list[float]) -> None:
         self.set_font(FONT_FAMILY, "B", TEXT_SIZE)
-        self.set_fill_color(*self.style.table_header_color)
         self.set_text_color(*self.style.font_color)
+        cells = [
+            [
+                truncate(
+                    text,
+                    width - 2 * self.c_margin,
+                    self.measure_text,
+                    self._text_width,
+                )
+            ]
+            for text, width in zip(headers, col_widths, strict=False)
+        ]
+        self._table_row(cells, col_widths, 10, self.style.table_header_color)
 
-        for i, h in enumerate(headers):
-            self.cell(col_widths[i], 10, h, border="B", fill=True)
-        self.ln(10)
-
-        # rows
-        self.set_font(FONT_FAMILY, "", LABEL_SIZE)
+    def _fit_cells(
+        self,
+        cells: list[str],
+        col_widths: list[float],
+        overflow: TextOverflow,
+        max_lines: int,
+    ) -> list[list[str]]:
+        """
+        Return the lines of each cell, shortened to fit its column. Whole
+        cells and words are measured through the memoized `measure_text`,
+        the starts tried when cutting them are not.
+        """
+        measure, measure_prefix = self.measure_text, self._text_width
+        fitted = []
+        for text, width in zip(cells, col_widths, strict=False):
+            width -= 2 * self.c_margin
+            if overflow is TextOverflow.WRAP:
+                fitted.append(wrap(text, width, measure, max_lines, measure_prefix))
+            else:
+                fitted.append([truncate(text, width, measure, measure_prefix)])
+        return fitted
 
-        for idx, row in enumerate(rows):
-            self.set_fill_color(*self.style.table_row_colors[idx % 2])
-            self.set_text_color(*self.style.font_color)
+    def _table_row(
+        self,
+        cells: Sequence[Sequence[str]],
+        col_widths: list[float],
+        height: float,
+        background: tuple[int, int, int],
+    ) -> None:
+        """
+        Draw the background and bottom border of a row once, instead of for
+        every cell, then print the lines of the cells over it, vertically
+        centered.
+        """
+        if self.will_page_break(height):
+            self.add_page(same=True)
+        widths = col_widths[: len(cells)]
+        x, y = self.x, self.y
+        row_width = sum(widths)
+        self.set_fill_color(*background)
+        self.rect(x, y, row_width, height, style="F")
+        self.line(x, y + height, x + row_width, y + height)
+        for width, lines in zip(widths, cells, strict=True):
+            if len(lines) == 1:
+                self.cell(width, height, lines[0])
+                continue
+            cell_x = self.x
+            top = y + (height - _TABLE_LINE_HEIGHT * len(lines)) / 2
+            for index, line in enumerate(lines):
+                self.set_xy(cell_x, top + index * _TABLE_LINE_HEIGHT)
+                self.cell(width, _TABLE_LINE_HEIGHT, line)
+            self.set_xy(cell_x + width, y)
+        self.ln(height)
 
-            for i, cell in enumerate(row):
-                self.cell(col_widths[i], LABEL_SIZE, cell, border="B", fill=True)
+    def table_column_widths(
+        self, headers: Sequence[str], rows: Iterable[Sequence[str]]
+    ) -> list[float]:
+        """
+        Return column widths fitting the widest header or cell of each column,
+        scaled down to the page width if needed.
+        """
+        self.set_font(FONT_FAMILY, "B", TEXT_SIZE)
+        widths = self.measure_texts(headers)
+        self.set_font(FONT_FAMILY, "", LABEL_SIZE)
+        for row in rows:
+            for i, width in enumerate(self.measure_texts(row)):
+                if width > widths[i]:
+                    widths[i] = width
 
-            self.ln()
-        self.set_y(self.get_y() + _LARGE_SPACING)
+        widths = [width + 2 * self.c_margin for width in widths]
+        total = sum(widths)
+        if total > self.epw:
+            widths = [width * self.epw / total for width in widths]
+        return widths
 
+    @profiled
     def tag(self, text: str, status: Status) -> Tuple[float, float]:
         bg = self.style.status_colors.get(
             status, self.style.status_colors[Status.OTHER]
@@ -159,52 +646,69 @@ class PDF(FPDF):
         self.set_font(FONT_FAMILY, "", LABEL_SIZE)
         self.set_text_color(*self.style.font_color)
 
-        text_w = self.get_string_width(text) + _SMALL_SPACING * 2
+        text_w = self.measure_text(text) + _SMALL_SPACING * 2
         text_h = _SMALL_SPACING + LABEL_SIZE * 25.4 / 72.0
         x, y = self.get_x(), self.get_y()
 
-        self.set_fill_color(*bg)
-        self.rect(
-            x, y, text_w, text_h, style="F", round_corners=True, corner_radius=1.5
+        self.stamp(
+            ("tag", text_w, text_h, bg),
+            x,
+            y,
+            text_w,
+            text_h,
+            partial(self._draw_tag_background, bg, text_w, text_h),
         )
 
         self.set_xy(x + _SMALL_SPACING - 1, y + 1)
-        self.cell(text_w, text_h - _SMALL_SPACING, text, border=0)
+        self.cell(text_w, text_h - _SMALL_SPACING, text)
         self.set_xy(x + text_w, y)  # end cell
         return text_w, text_h
 
-    def detailed_tickets_table(self, tickets: list[Ticket]) -> None:
+    def _draw_tag_background(
+        self,
+        color: tuple[int, int, int],
+        width: float,
+        height: float,
+        x: float,
+        y: float,
+    ) -> None:
+        self.set_fill_color(*color)
+        self.rect(x, y, width, height, style="F", round_corners=True, corner_radius=1.5)
+
+    @profiled
+    def detailed_tickets_table(self, tickets: Iterable[Ticket]) -> None:
+        """
+        Draw a card for every ticket, starting a new page when a card does not fit.
+        Tickets are consumed one at a time, so any iterable or generator works.
+        """
         self.set_font(FONT_FAMILY, "", TEXT_SIZE)
 
         for t in tickets:
             self.ticket_card_long(t)
 
+    @profiled
     def ticket_card_long(
         self, ticket: Ticket, x: Optional[float] = None, y: Optional[float] = None
     ) -> None:
+        height = 22
+        if y is None and self.will_page_break(height):
+            self.add_page(same=True)
         start_x = x or self.x
         start_y = y or self.y
         width = self.w - self.r_margin - self.l_margin
-        height = 22
         left_padding = 6
         top_padding = 2
 
         stripe_color: tuple[int, int, int] = self.style.category_colors.get(
             ticket.category, self.style.border_color
         )
-        self.set_fill_color(*stripe_color)
-        self.rect(
+        self.stamp(
+            ("card", stripe_color, self.style.border_color, width, height),
             start_x,
             start_y,
-            2.5,
+            width,
             height,
-            style="F",
-            round_corners=True,
-            corner_radius=3,
-        )
-        self.set_draw_color(*self.style.border_color)
-        self.rect(
-            start_x, start_y, width, height, round_corners=True, corner_radius=1.5
+            partial(self._draw_card_frame, stripe_color, width, height),
         )
 
         self.set_xy(start_x + left_padding, start_y + top_padding)
@@ -226,8 +730,14 @@ class PDF(FPDF):
             )
             dot_x = self.get_x() + left_padding
             dot_y = self.get_y() + (line_height - 3) / 2
-            self.set_fill_color(*dot_color)
-            self.ellipse(dot_x, dot_y, 3, 3, style="F")
+            self.stamp(
+                ("dot", dot_color),
+                dot_x,
+                dot_y,
+                3,
+                3,
+                partial(self._draw_priority_dot, dot_color),
+            )
             self.set_x(dot_x + 3)
             self.cell(10, line_height, ticket.priority)
 
@@ -240,77 +750,418 @@ class PDF(FPDF):
 
         self.set_y(start_y + height + _MEDIUM_SPACING)
 
-    def _plot_bar_chart(self, values: list[float]) -> tuple[float, float]:
-        spacing = 2
-        bar_width = 3
+    def _draw_card_frame(
+        self,
+        stripe_color: tuple[int, int, int],
+        width: float,
+        height: float,
+        x: float,
+        y: float,
+    ) -> None:
+        self.set_fill_color(*stripe_color)
+        self.rect(x, y, 2.5, height, style="F", round_corners=True, corner_radius=3)
+        self.set_draw_color(*self.style.border_color)
+        self.rect(x, y, width, height, round_corners=True, corner_radius=1.5)
+
+    def _draw_priority_dot(
+        self, color: tuple[int, int, int], x: float, y: float
+    ) -> None:
+        self.set_fill_color(*color)
+        self.ellipse(x, y, 3, 3, style="F")
+
+    def _plot_bar_chart(
+        self,
+        values: Sequence[float],
+        width: float,
+        color: Optional[tuple[int, int, int]] = None,
+    ) -> tuple[float, float]:
+        """
+        Draw the bars of a chart over a 30 mm grid. Bars are 3 mm wide with
+        2 mm gaps, narrowed in the same proportions when they do not fit.
+        :param values: The bar values, as many as fit, see `_bars_fitting`
+        :param width: The available width in mm
+        :param color: The color of every bar, instead of the chart colors in turn
+        """
+        import numpy as np
+
         x = self.x
         start_y = self.y
-        height = 30
-        width = x + len(values) * (bar_width + spacing) + spacing
-        max_value = max(values) if values else 0
-
-        self.line(x, start_y, width, start_y)
-        self.line(x, start_y + 5, width, start_y + 5)
-        self.line(x, start_y + 10, width, start_y + 10)
-        self.line(x, start_y + 15, width, start_y + 15)
-        self.line(x, start_y + 20, width, start_y + 20)
-        self.line(x, start_y + 25, width, start_y + 25)
+        heights = np.asarray(values, dtype=float)
+        pitch = min(_BAR_WIDTH + _BAR_SPACING, width / (len(heights) + 0.4))
+        bar_width = pitch * _BAR_WIDTH / (_BAR_WIDTH + _BAR_SPACING)
+        spacing = pitch - bar_width
+        end_x = x + len(heights) * pitch + spacing
 
-        x += spacing
+        self._plot_grid(x, start_y, end_x)
 
-        for index, value in enumerate(values):
-            self.set_fill_color(
-                *self.style.chart_colors[index % len(self.style.chart_colors)]
-            )
-            bar_height = height * value / max_value
-            y = start_y + height - bar_height
+        # All-zero series draw no bars instead of dividing by zero
+        max_value = heights.max(initial=0)
+        heights *= _BAR_CHART_HEIGHT / max_value if max_value > 0 else 0
+        lefts = x + spacing + pitch * np.arange(len(heights))
+        tops = start_y + _BAR_CHART_HEIGHT - heights
+        radius = min(1.5, bar_width / 2)
+        colors = self.style.chart_colors
+        for index in np.flatnonzero(heights > 0):
+            self.set_fill_color(*(color or colors[index % len(colors)]))
             self.rect(
-                x,
-                y,
+                float(lefts[index]),
+                float(tops[index]),
                 bar_width,
-                bar_height,
+                float(heights[index]),
                 style="F",
                 round_corners=True,
-                corner_radius=1.5,
+                corner_radius=radius,
             )
-            x += bar_width + spacing
 
-        return x - spacing, start_y + height
+        return end_x, start_y + _BAR_CHART_HEIGHT
+
+    def _bars_fitting(self, width: float) -> int:
+        """Return the number of the narrowest bars fitting the width."""
+        pitch = _MIN_BAR_WIDTH * (_BAR_WIDTH + _BAR_SPACING) / _BAR_WIDTH
+        return max(2, int(width / pitch - 0.4))
 
+    def _chart_width(self, width: Optional[float]) -> float:
+        """
+        The given width, or the space left of the legend on this line.
+        :raises ValueError: if the width is not positive, or if the space
+            left is narrower than `_MIN_CHART_WIDTH`
+        """
+        if width is not None:
+            if not width > 0:
+                raise ValueError(f"Chart width must be positive, got {width}")
+            return width
+        width = self.l_margin + self.epw - self.x - _LEGEND_WIDTH
+        if width < _MIN_CHART_WIDTH:
+            raise ValueError(
+                f"Only {max(width, 0):.1f} mm left for a chart on this line, "
+                f"{_MIN_CHART_WIDTH:g} mm at least: pass a width or start a new line"
+            )
+        return width
+
+    @profiled
     def bar_chart(
-        self, data: dict[str, float], caption: Optional[str] = None
+        self,
+        data: dict[str, float],
+        caption: Optional[str] = None,
+        width: Optional[float] = None,
+        max_bars: int = DEFAULT_MAX_BARS,
+    ) -> tuple[float, float]:
+        """
+        Draw a bar chart with a legend at the current position. Beyond
+        `max_bars` categories, or the bars fitting the width, the largest
+        categories are drawn and the others are summed into an "Other" bar.
+        :param data: The values to plot, by label
+        :param caption: Optional caption above the legend
+        :param width: The width of the bars in mm, defaults to the space left
+            of the legend
+        :param max_bars: The number of bars, and legend labels, at most
+        """
+        x = self.x
+        y = self.y
+        width = self._chart_width(width)
+        data = top_categories(data, min(max_bars, self._bars_fitting(width)))
+        end_x, _ = self._plot_bar_chart(list(data.values()), width)
+        legend_x = max(x + 30, end_x + _MEDIUM_SPACING)
+        self.legend(list(data.keys()), legend_x, y + _SMALL_SPACING, caption=caption)
+        self.set_xy(self.x + 15, y)
+        return self.x, y + _BAR_CHART_HEIGHT
+
+    @profiled
+    def histogram(
+        self,
+        values: Sequence[float],
+        caption: Optional[str] = None,
+        width: Optional[float] = None,
+        bins: int = DEFAULT_HISTOGRAM_BINS,
+    ) -> tuple[float, float]:
+        """
+        Draw the distribution of many values as bars at the current position,
+        with the range of the values as legend.
+        :param values: The values to count, e.g. cycle times in days
+        :param caption: Optional caption above the legend
+        :param width: The width of the bars in mm, defaults to the space left
+            of the legend
+        :param bins: The number of bars at most, fewer when they do not fit
+        """
+        x = self.x
+        y = self.y
+        width = self._chart_width(width)
+        counts, edges = histogram_bins(values, min(bins, self._bars_fitting(width)))
+        end_x, _ = self._plot_bar_chart(counts, width, self.style.chart_colors[0])
+        legend_x = max(x + 30, end_x + _MEDIUM_SPACING)
+        label = f"{edges[0]:.3g} to {edges[-1]:.3g}" if len(values) else "No values"
+        self.legend([label], legend_x, y + _SMALL_SPACING, caption=caption)
+        self.set_xy(self.x + 15, y)
+        return self.x, y + _BAR_CHART_HEIGHT
+
+    @profiled
+    def burndown_chart(
+        self,
+        tickets: Tickets,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        story_points: bool = False,
+        caption: Optional[str] = None,
+        width: Optional[float] = None,
+    ) -> tuple[float, float]:
+        """
+        Draw the work remaining every day, with the ideal line dashed.
+        :param tickets: The tickets in scope, a `TicketTable` is the fastest
+        :param start: The first day, defaults to the earliest ticket date
+        :param end: The last day, defaults to the latest ticket date
+        :param story_points: Count story points instead of tickets
+        :param caption: Optional caption above the legend
+        :param width: The width of the chart in mm, defaults to the space left
+            of the legend
+        """
+        daily = burndown(tickets, start, end, story_points)
+        return self._daily_chart(daily, width, caption, stacked=False)
+
+    @profiled
+    def cumulative_flow_chart(
+        self,
+        tickets: Tickets,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        caption: Optional[str] = None,
+        width: Optional[float] = None,
+    ) -> tuple[float, float]:
+        """
+        Draw the tickets done, in progress and to do every day, as stacked areas.
+        :param tickets: The tickets in scope, a `TicketTable` is the fastest
+        :param start: The first day, defaults to the earliest ticket date
+        :param end: The last day, defaults to the latest ticket date
+        :param caption: Optional caption above the legend
+        :param width: The width of the chart in mm, defaults to the space left
+            of the legend
+        """
+        daily = cumulative_flow(tickets, start, end)
+        return self._daily_chart(daily, width, caption, stacked=True)
+
+    @profiled
+    def cycle_time_chart(
+        self,
+        tickets: Tickets,
+        caption: Optional[str] = None,
+        width: Optional[float] = None,
+        bins: int = DEFAULT_HISTOGRAM_BINS,
+    ) -> tuple[float, float]:
+        """
+        Draw the distribution of the days from start to end of the tickets.
+        :param tickets: The tickets, those without both dates are left out
+        :param caption: Optional caption above the legend
+        :param width: The width of the bars in mm, defaults to the space left
+            of the legend
+        :param bins: The number of bars at most
+        """
+        return self.histogram(cycle_times(tickets), caption, width, bins)
+
+    def _daily_chart(
+        self,
+        daily: DailySeries,
+        width: Optional[float],
+        caption: Optional[str],
+        stacked: bool,
     ) -> tuple[float, float]:
         x = self.x
         y = self.y
-        self._plot_bar_chart(list(data.values()))
-        self.legend(list(data.keys()), x + 30, y + _SMALL_SPACING, caption=caption)
+        width = self._chart_width(width)
+        self._plot_daily_series(daily, width, stacked)
+        self.set_font(FONT_FAMILY, "", LABEL_SIZE)
+        self.set_text_color(*self.style.font_color)
+        if daily.days:
+            self.set_xy(x, y + _BAR_CHART_HEIGHT + 1)
+            self.cell(width / 2, 3, daily.start.isoformat())
+            self.cell(width / 2, 3, daily.end.isoformat(), align="R")
+        legend_x = max(x + 30, x + width + _MEDIUM_SPACING)
+        self.legend(list(daily.series), legend_x, y + _SMALL_SPACING, caption=caption)
         self.set_xy(self.x + 15, y)
-        return self.x, y + 30
+        return self.x, y + _BAR_CHART_HEIGHT + 4
+
+    def _plot_daily_series(
+        self, daily: DailySeries, width: float, stacked: bool
+    ) -> None:
+        """
+        Draw one value a day over the width, as lines or as stacked areas.
+        The second line is dashed, as it is the reference of a burndown.
+        """
+        import numpy as np
+
+        x = self.x
+        start_y = self.y
+        self._plot_grid(x, start_y, x + width)
+        if not daily.days:
+            return
+
+        values = np.array(list(daily.series.values()), dtype=float)
+        if stacked:
+            values = np.cumsum(values, axis=0)
+        max_value = values.max()
+        scale = _BAR_CHART_HEIGHT / max_value if max_value > 0 else 0
+        xs = x + np.linspace(0, width, daily.days)
+        ys = start_y + _BAR_CHART_HEIGHT - values * scale
 
+        colors = self.style.chart_colors
+        bottom = np.full(daily.days, start_y + _BAR_CHART_HEIGHT)
+        for index, line in enumerate(ys):
+            color = colors[index % len(colors)]
+            points = list(zip(xs.tolist(), line.tolist(), strict=True))
+            if stacked:
+                # The area between this series and the one below
+                lower = list(zip(xs.tolist(), bottom.tolist(), strict=True))
+                self.set_fill_color(*color)
+                self.polygon(points + lower[::-1], style="F")
+                bottom = line
+            else:
+                self.set_draw_color(*color)
+                if index == 1:
+                    self.set_dash_pattern(dash=1, gap=1)
+                self.polyline(points)
+                self.set_dash_pattern()
+
+    def _plot_grid(self, x: float, y: float, end_x: float) -> None:
+        self.set_draw_color(*self.style.border_color)
+        for line_y in range(0, _BAR_CHART_HEIGHT, 5):
+            self.line(x, y + line_y, end_x, y + line_y)
+
+    def _plot_pie_chart(
+        self, values: list[float], diameter: float, hole: float = 0
+    ) -> tuple[float, float]:
+        radius = diameter / 2
+        inner_radius = radius * hole
+        center_x = self.x + radius
+        center_y = self.y + radius
+        total = sum(values)
+        colors = self.style.chart_colors
+
+        # Slices start at 12 o'clock and go clockwise, as in the PNG backend
+        angle = 0.0
+        for index, value in enumerate(values):
+            if value == 0:
+                continue
+            end_angle = angle + 360 * value / total
+            with self.new_path(
+                *_polar(center_x, center_y, radius, angle),
+                paint_rule=PathPaintRule.FILL_NONZERO,
+            ) as path:
+                path.style.fill_color = rgb8(*colors[index % len(colors)])
+                _arc_to(path, center_x, center_y, radius, angle, end_angle)
+                if inner_radius:
+                    path.line_to(*_polar(center_x, center_y, inner_radius, end_angle))
+                    _arc_to(path, center_x, center_y, inner_radius, end_angle, angle)
+                else:
+                    path.line_to(center_x, center_y)
+                path.close()
+            angle = end_angle
+
+        return self.x + diameter, self.y + diameter
+
+    @profiled
     def pie_chart(
         self,
         data: dict[str, float],
         width: float = 70,
         caption: Optional[str] = None,
+        hole: float = 0,
+        backend: Optional[ChartBackend] = None,
     ) -> None:
-        """Generate a pie chart in-memory and insert it into the PDF."""
-        img_buf = build_pie_chart_bytes(
-            list(data.values()), colors=self.style.chart_colors
-        )
-
-        if img_buf is None:
+        """
+        Draw a pie chart with a legend at the current position.
+        :param data: The values to plot, by label
+        :param width: The diameter of the chart in mm
+        :param caption: Optional caption above the legend
+        :param hole: The radius of the donut hole, as a fraction of the chart radius
+        :param backend: Overrides the document's chart backend
+        """
+        values = list(data.values())
+        if any(value < 0 for value in values):
+            raise ValueError("Pie chart values must be non-negative")
+        check_hole(hole)
+        if sum(values) == 0:
             return
 
         x = self.get_x()
         y = self.get_y()
 
-        self.image(img_buf, x=x, y=y, w=width)
+        if (backend or self.chart_backend) is ChartBackend.PNG:
+            with self._section("chart_image"):
+                image = self._pie_chart_image(values, width, hole)
+            self.image(BytesIO(image), x=x, y=y, w=width)
+        else:
+            self._plot_pie_chart(values, width, hole)
         self.set_xy(x + width, y)
 
         legend_x = x + width + _MEDIUM_SPACING
         legend_y = y + _SMALL_SPACING
         self.legend(list(data.keys()), legend_x, legend_y, caption=caption)
 
+    def prefetch_pie_chart(
+        self,
+        data: dict[str, float],
+        width: float = 70,
+        hole: float = 0,
+        backend: Optional[ChartBackend] = None,
+    ) -> None:
+        """
+        Start rendering the image of a pie chart that `pie_chart` draws later,
+        in the chart pool, so that the layout goes on meanwhile and only waits
+        for the image when the chart is drawn. Without a pool, the image is
+        rendered now. Charts drawn as vector paths have nothing to prefetch.
+        Prefetch every chart of a document before drawing the first, as
+        `RenderPlan.prerender` does: a chart drawn right after it is prefetched
+        waits for its own image, one chart at a time.
+        :param data: The values to plot, by label
+        :param width: The diameter of the chart in mm
+        :param hole: The radius of the donut hole, as a fraction of the chart radius
+        :param backend: Overrides the document's chart backend
+        """
+        values = list(data.values())
+        if (backend or self.chart_backend) is not ChartBackend.PNG:
+            return
+        if any(value < 0 for value in values) or sum(values) == 0:
+            return  # pie_chart raises or draws nothing
+        check_hole(hole)
+        if self.chart_pool is None:
+            self._pie_chart_image(values, width, hole)
+            return
+
+        colors = self.style.chart_colors
+        dpi = chart_dpi(width)
+        image_format = self.chart_image_format
+        key = pie_chart_key(values, width, colors, dpi, image_format, hole)
+        if key not in self._chart_images and key not in self._chart_futures:
+            self._chart_futures[key] = self.chart_pool.submit_pie_chart(
+                values, width, colors, dpi, image_format, hole
+            )
+
+    def _pie_chart_image(
+        self, values: list[float], width: float, hole: float = 0
+    ) -> bytes:
+        """
+        Return the image of a pie chart, rendered for its width on the page,
+        or prefetched. A chart repeated in the document is rendered once and,
+        as its bytes are identical, embedded once.
+        """
+        colors = self.style.chart_colors
+        dpi = chart_dpi(width)
+        image_format = self.chart_image_format
+        key = pie_chart_key(values, width, colors, dpi, image_format, hole)
+        image = self._chart_images.get(key)
+        if image is not None:
+            return image
+        future = self._chart_futures.pop(key, None)
+        if future is not None:
+            image = future.result()
+        else:
+            buffer = build_pie_chart_bytes(
+                values, width, colors, dpi, image_format, hole
+            )
+            assert buffer is not None  # pie_chart skips charts without values
+            image = buffer.getvalue()
+        self._chart_images[key] = image
+        return image
+
+    @profiled
     def legend(
         self, labels: list[str], x: float, y: float, caption: Optional[str] = None
     ) -> None:
@@ -345,3 +1196,151 @@ class PDF(FPDF):
         self.cell(15, 3, label)
         self.set_font(FONT_FAMILY, "", TEXT_SIZE)
         return start_x + 15, start_y + 4
+
+    def measure_block(self, block: Block) -> Box:
+        """Return the size of a block as drawn, without drawing it."""
+        match block:
+            case SummaryCard(items, width):
+                return Box(width, len(items) * _CARD_ROW_HEIGHT + 2 * _MEDIUM_SPACING)
+            case BarChart(data, caption, width, max_bars):
+                bars = min(len(data), max_bars or DEFAULT_MAX_BARS)
+                bars = min(bars, self._bars_fitting(width))
+                height = max(_BAR_CHART_HEIGHT, _legend_height(bars, caption))
+                return Box(max(width, 30 - _MEDIUM_SPACING) + _LEGEND_WIDTH, height)
+            case PieChart(data, width, caption):
+                height = max(width, _legend_height(len(data), caption))
+                return Box(width + _LEGEND_WIDTH, height)
+            case Legend(labels, caption):
+                height = _legend_height(len(labels), caption) - _SMALL_SPACING
+                return Box(_LEGEND_WIDTH - _MEDIUM_SPACING, height)
+        raise TypeError(f"Not a block: {block!r}")
+
+    def draw_block(self, block: Block, x: float, y: float) -> None:
+        """Draw a block with its top left corner at (x, y)."""
+        self.set_xy(x, y)
+        match block:
+            case SummaryCard(items, width):
+                self.summary_card(items, width, x, y)
+            case BarChart(data, caption, width, max_bars):
+                self.bar_chart(data, caption, width, max_bars or DEFAULT_MAX_BARS)
+            case PieChart(data, width, caption, hole, backend):
+                self.pie_chart(data, width, caption, hole, backend)
+            case Legend(labels, caption):
+                self.legend(labels, x, y, caption)
+            case _:
+                raise TypeError(f"Not a block: {block!r}")
+
+    def layout(self, blocks: Sequence[Block], columns: Optional[int] = None) -> Layout:
+        """
+        Measure the blocks and pack them into rows from the current position,
+        breaking pages where needed, without drawing. The layout of blocks of
+        the same structure, i.e. sizes and numbers of labels, is measured once
+        and then served from `LAYOUT_CACHE`.
+        :param blocks: The blocks, in drawing order
+        :param columns: Align the blocks on a grid of this many columns
+        """
+        frame = Frame(
+            self.l_margin, self.t_margin, self.epw, self.page_break_trigger, self.y
+        )
+        key = (tuple(map(_layout_key, blocks)), frame, _MEDIUM_SPACING, columns)
+        layout = LAYOUT_CACHE.get(key)
+        if layout is None:
+            boxes = [self.measure_block(block) for block in blocks]
+            layout = pack(boxes, frame, _MEDIUM_SPACING, columns)
+            LAYOUT_CACHE.put(key, layout)
+        return layout
+
+    @profiled
+    def place(self, blocks: Sequence[Block], columns: Optional[int] = None) -> Layout:
+        """
+        Lay the blocks out, see `layout`, then draw each at its place and move
+        below the last row. The pie chart images of the blocks are prefetched
+        first, which only overlaps the charts of this call: prefetch the charts
+        of several calls up front, see `prefetch_pie_chart`.
+        :param blocks: The blocks, in drawing order
+        :param columns: Align the blocks on a grid of this many columns
+        """
+        for block in blocks:
+            if isinstance(block, PieChart):
+                self.prefetch_pie_chart(
+                    block.data, block.width, block.hole, block.backend
+                )
+        layout = self.layout(blocks, columns)
+        first_page = self.page
+        for block, placement in zip(blocks, layout.placements, strict=True):
+            while self.page < first_page + placement.page:
+                self.add_page(same=True)
+            self.draw_block(block, placement.x, placement.y)
+        self.set_xy(self.l_margin, layout.end_y + _MEDIUM_SPACING)
+        return layout
+
+
+def _legend_height(labels: int, caption: Optional[str]) -> float:
+    """The height of a legend drawn below a chart's top, as in `legend`."""
+    caption_height = 5 + _SMALL_SPACING if caption else 0
+    return _SMALL_SPACING + caption_height + 4 * labels
+
+
+def _layout_key(block: Block) -> Hashable:
+    """What the size of a block depends on, but not its values."""
+    match block:
+        case SummaryCard(items, width):
+            return "card", width, len(items)
+        case BarChart(data, caption, width, max_bars):
+            return (
+                "bar",
+                width,
+                min(len(data), max_bars or DEFAULT_MAX_BARS),
+                bool(caption),
+            )
+        case PieChart(data, width, caption):
+            return "pie", width, len(data), bool(caption)
+        case Legend(labels, caption):
+            return "legend", len(labels), bool(caption)
+    raise TypeError(f"Not a block: {block!r}")
+
+
+def _table_cells(row: Sequence[Any], columns: int) -> list[str]:
+    cells = ["" if value is None else str(value) for value in row[:columns]]
+    return cells + [""] * (columns - len(cells))
+
+
+@lru_cache(maxsize=256)
+def _cached_device_color(r: ColorInput, g: Number, b: Number) -> Color:
+    return convert_to_device_color(r, g, b)
+
+
+def _device_color(r: ColorInput, g: Number, b: Number) -> Color:
+    """Convert a color like FPDF does, memoized as reports reuse a few colors."""
+    try:
+        return _cached_device_color(r, g, b)
+    except TypeError:  # unhashable, e.g. a list
+        return convert_to_device_color(r, g, b)
+
+
+def _polar(
+    center_x: float, center_y: float, radius: float, angle: float
+) -> tuple[float, float]:
+    """Return the point at the given clockwise angle from 12 o'clock, in degrees."""
+    radians = math.radians(angle)
+    return (
+        center_x + radius * math.sin(radians),
+        center_y - radius * math.cos(radians),
+    )
+
+
+def _arc_to(
+    path: PaintedPath,
+    center_x: float,
+    center_y: float,
+    radius: float,
+    start_angle: float,
+    end_angle: float,
+) -> None:
+    """Append a circular arc, split so that a full circle is not degenerate."""
+    clockwise = end_angle > start_angle
+    segments = math.ceil(abs(end_angle - start_angle) / 180)
+    step = (end_angle - start_angle) / segments
+    for segment in range(1, segments + 1):
+        x, y = _polar(center_x, center_y, radius, start_angle + step * segment)
+        path.arc_to(radius, radius, 0, False, clockwise, x, y)
@@ -0,0 +1,151 @@
+import json
+import logging
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from time import perf_counter
+from typing import (
+    IO,
+    Any,
+    Callable,
+    ContextManager,
+    Iterator,
+    Optional,
+    Protocol,
+    TypeVar,
+    Union,
+)
+
+from fpdf.output import OutputProducer
+
+# Receives the profiler when a document is written, e.g. any callback
+ProfileSink = Callable[["Profiler"], None]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass(slots=True)
+class MethodStats:
+    calls: int = 0
+    # Cumulative time, including the methods called from this one
+    seconds: float = 0
+
+
+class Profiler:
+    """
+    Call counts and cumulative time of the drawing methods of a document.
+    Sinks get the profiler every time the document is written with `output`.
+    """
+
+    def __init__(self, *sinks: ProfileSink) -> None:
+        self.sinks = list(sinks)
+        self.stats: dict[str, MethodStats] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = MethodStats()
+        stats.calls += 1
+        stats.seconds += seconds
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """Time a block of code, e.g. a step of a drawing method."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter() - start)
+
+    def report(self) -> dict[str, dict[str, float]]:
+        """Return the statistics by name, slowest first."""
+        ordered = sorted(self.stats.items(), key=lambda item: -item[1].seconds)
+        return {
+            name: {"calls": stats.calls, "seconds": stats.seconds}
+            for name, stats in ordered
+        }
+
+    def summary(self) -> str:
+        """Return the statistics as a text table."""
+        lines = [f"{'method':<24} {'calls':>8} {'seconds':>10}"]
+        for name, stats in self.report().items():
+            lines.append(f"{name:<24} {stats['calls']:>8} {stats['seconds']:>10.4f}")
+        return "\n".join(lines)
+
+    def flush(self) -> None:
+        for sink in self.sinks:
+            sink(self)
+
+    def reset(self) -> None:
+        self.stats.clear()
+
+
+class LoggingSink:
+    """Logs the summary table of the profiler."""
+
+    def __init__(
+        self, logger: Optional[logging.Logger] = None, level: int = logging.INFO
+    ) -> None:
+        self.logger = logger or logging.getLogger("fpdf_reporting.profiling")
+        self.level = level
+
+    def __call__(self, profiler: Profiler) -> None:
+        self.logger.log(self.level, "Render statistics\n%s", profiler.summary())
+
+
+class JsonSink:
+    """Writes the statistics of the profiler as JSON to a file."""
+
+    def __init__(self, target: Union[str, Path, IO[str]]) -> None:
+        self.target = target
+
+    def __call__(self, profiler: Profiler) -> None:
+        if isinstance(self.target, (str, Path)):
+            with open(self.target, "w", encoding="utf-8") as f:
+                json.dump(profiler.report(), f, indent=2)
+        else:
+            json.dump(profiler.report(), self.target, indent=2)
+
+
+class SupportsProfiling(Protocol):
+    profiler: Optional[Profiler]
+
+
+class ProfiledOutputProducer(OutputProducer):
+    """Times the font subsetting and image embedding steps of `output`, if profiling."""
+
+    def _add_fonts(self, *args: Any, **kwargs: Any) -> Any:
+        with self._section("output.fonts"):
+            return super()._add_fonts(*args, **kwargs)
+
+    def _add_images(self) -> Any:
+        with self._section("output.images"):
+            return super()._add_images()
+
+    def _section(self, name: str) -> ContextManager[None]:
+        profiler: Optional[Profiler] = getattr(self.fpdf, "profiler", None)
+        if profiler is None:
+            return nullcontext()
+        return profiler.section(name)
+
+
+def profiled(method: F) -> F:
+    """
+    Record the calls of a method in the profiler of its document, if any.
+    Without a profiler the only cost is an attribute check.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self: SupportsProfiling, *args: Any, **kwargs: Any) -> Any:
+        profiler = self.profiler
+        if profiler is None:
+            return method(self, *args, **kwargs)
+        start = perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            profiler.record(name, perf_counter() - start)
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,334 @@
+"""
+Declarative reports. A spec, as JSON or a dict, lists the sections of a
+report and the blocks of each section, with the `ReportData` aggregation
+every chart is bound to:
+
+    {"title": "Sprint report",
+     "sections": [
+        {"title": "Overview", "blocks": [
+            {"type": "summary", "items": ["count", "story_points", "flagged"]},
+            {"type": "pie", "data": "story_points_by_status", "caption": "Status"},
+            {"type": "bar", "data": "count_by_component", "width": 80}]},
+        {"title": "Not delivered", "blocks": [{"type": "tickets"}]}]}
+
+Aggregations are named `<measure>_by_<dimension>`, from `MEASURES` and
+`DIMENSIONS`. A spec is validated and compiled once into a `RenderPlan`,
+cached on the hash of the spec, which then renders any number of datasets:
+each distinct aggregation is computed once per dataset, chart images are
+all started before the layout, and the layout of the blocks is shared
+by every report of the plan.
+"""
+
+import hashlib
+import json
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass
+from enum import StrEnum
+from functools import lru_cache
+from typing import Any, Optional, Union
+
+from fpdf_reporting.model.report_data import ReportData
+from fpdf_reporting.rendering.batch import ReportJob
+from fpdf_reporting.rendering.layout import BarChart, Block, PieChart, SummaryCard
+from fpdf_reporting.rendering.pdf_generator import PDF
+
+MEASURES: tuple[str, ...] = ("count", "story_points", "tester_story_points", "flagged")
+DIMENSIONS: tuple[str, ...] = (
+    "category",
+    "status",
+    "component",
+    "priority",
+    "issue_type",
+)
+SUMMARY_LABELS: dict[str, str] = {
+    "count": "Tickets",
+    "story_points": "Story points",
+    "tester_story_points": "Tester story points",
+    "flagged": "Flagged",
+}
+# Measures that are not whole numbers, shown with their decimals
+FRACTIONAL_MEASURES: tuple[str, ...] = ("tester_story_points",)
+# The label of tickets without a value for the dimension
+UNSET_LABEL: str = "Unset"
+PLAN_CACHE_SIZE: int = 128
+
+_DONUT_HOLE: float = 0.5
+_DEFAULT_PIE_WIDTH: float = 40
+_DEFAULT_CARD_WIDTH: float = 50
+
+Series = dict[str, float]
+
+
+class BlockType(StrEnum):
+    SUMMARY = "summary"  # a card of totals
+    PIE = "pie"
+    DONUT = "donut"
+    BAR = "bar"
+    TICKETS = "tickets"  # a card for every ticket not delivered
+
+
+_CHARTS = (BlockType.PIE, BlockType.DONUT, BlockType.BAR)
+# The keys a spec may have, at each level
+_SPEC_KEYS = frozenset({"title", "sections"})
+_SECTION_KEYS = frozenset({"title", "blocks"})
+_BLOCK_KEYS: dict[BlockType, frozenset[str]] = {
+    BlockType.SUMMARY: frozenset({"type", "items", "width"}),
+    BlockType.TICKETS: frozenset({"type"}),
+    **{chart: frozenset({"type", "data", "caption", "width"}) for chart in _CHARTS},
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Aggregation:
+    measure: str
+    dimension: str
+
+    @classmethod
+    def parse(cls, name: str) -> "Aggregation":
+        measure, _, dimension = name.partition("_by_")
+        if measure not in MEASURES or dimension not in DIMENSIONS:
+            raise ValueError(
+                f"Unknown aggregation: {name!r}, expected <measure>_by_<dimension>"
+                f" with a measure in {MEASURES} and a dimension in {DIMENSIONS}"
+            )
+        return cls(measure, dimension)
+
+    def values(self, data: ReportData) -> Series:
+        groups = getattr(data, f"by_{self.dimension}")
+        return {
+            UNSET_LABEL if key is None else str(key): getattr(totals, self.measure)
+            for key, totals in groups.items()
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class BlockStep:
+    type: BlockType
+    aggregation: Optional[Aggregation] = None
+    items: tuple[str, ...] = ()
+    caption: Optional[str] = None
+    width: Optional[float] = None
+
+    def block(self, data: ReportData, series: dict[Aggregation, Series]) -> Block:
+        """The layout block of this step, bound to the values of a dataset."""
+        if self.type is BlockType.SUMMARY:
+            lines = [
+                f"{SUMMARY_LABELS[item]}: {_total(item, getattr(data.totals, item))}"
+                for item in self.items
+            ]
+            return SummaryCard(lines, self.width or _DEFAULT_CARD_WIDTH)
+        assert self.aggregation is not None
+        values = series[self.aggregation]
+        if self.type is BlockType.BAR:
+            if self.width is None:
+                return BarChart(values, self.caption)
+            return BarChart(values, self.caption, self.width)
+        width = self.width or _DEFAULT_PIE_WIDTH
+        return PieChart(values, width, self.caption, self.hole)
+
+    @property
+    def hole(self) -> float:
+        return _DONUT_HOLE if self.type is BlockType.DONUT else 0
+
+
+def _total(measure: str, value: float) -> str:
+    if measure in FRACTIONAL_MEASURES:
+        return f"{value:,.10g}"
+    return f"{value:,.0f}"
+
+
+@dataclass(frozen=True, slots=True)
+class SectionStep:
+    title: Optional[str]
+    blocks: tuple[BlockStep, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class RenderPlan:
+    """
+    A compiled spec. A plan is also a batch render function: `generate_reports`
+    and the report worker can run it on `ReportJob`s.
+    """
+
+    digest: str  # the SHA-256 of the spec
+    title: Optional[str]
+    sections: tuple[SectionStep, ...]
+    aggregations: tuple[Aggregation, ...]  # distinct, in order of first use
+
+    def aggregate(self, data: ReportData) -> dict[Aggregation, Series]:
+        """Compute every aggregation of the plan once, however often it is used."""
+        return {
+            aggregation: aggregation.values(data) for aggregation in self.aggregations
+        }
+
+    def prerender(self, pdf: PDF, series: dict[Aggregation, Series]) -> None:
+        """
+        Start rendering the images of every pie and donut chart up front, in
+        the document's chart pool if it has one, see `PDF.prefetch_pie_chart`.
+        """
+        for section in self.sections:
+            for step in section.blocks:
+                if step.type in (BlockType.PIE, BlockType.DONUT):
+                    assert step.aggregation is not None
+                    pdf.prefetch_pie_chart(
+                        series[step.aggregation],
+                        step.width or _DEFAULT_PIE_WIDTH,
+                        step.hole,
+                    )
+
+    def render(self, pdf: PDF, data: ReportData, title: Optional[str] = None) -> None:
+        """
+        Draw the report of a dataset, from a new page if the document has none.
+        :param pdf: The document to draw into
+        :param data: The aggregated tickets
+        :param title: Overrides the title of the spec
+        """
+        series = self.aggregate(data)
+        self.prerender(pdf, series)
+        if pdf.page == 0:
+            pdf.add_page()
+        title = title or self.title
+        if title:
+            pdf.document_header(title)
+        for section in self.sections:
+            if section.title:
+                pdf.section_title(section.title)
+            blocks: list[Block] = []
+            for step in section.blocks:
+                if step.type is not BlockType.TICKETS:
+                    blocks.append(step.block(data, series))
+                    continue
+                if blocks:
+                    pdf.place(blocks)
+                    blocks = []
+                pdf.detailed_tickets_table(data.not_delivered)
+            if blocks:
+                pdf.place(blocks)
+
+    def __call__(self, pdf: PDF, job: ReportJob) -> None:
+        """
+        Draw the report of a batch job. Tickets blocks list the tickets of the
+        job without an end date.
+        """
+        not_delivered = [ticket for ticket in job.tickets if ticket.end_date is None]
+        self.render(pdf, ReportData(not_delivered, job.tickets), job.title)
+
+
+def compile_spec(spec: Union[str, Mapping[str, Any]]) -> RenderPlan:
+    """
+    Validate a spec and compile it into a render plan. Plans are cached on
+    the hash of the spec, so compiling the same spec again is a lookup.
+    :param spec: The spec, as a JSON text or as a dict
+    :raises ValueError: The spec is not valid
+    """
+    if isinstance(spec, str):
+        spec = json.loads(spec)
+    canonical = json.dumps(spec, sort_keys=True, separators=(",", ":"))
+    return _compile(hashlib.sha256(canonical.encode()).hexdigest(), canonical)
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _compile(digest: str, canonical: str) -> RenderPlan:
+    spec = json.loads(canonical)
+    if not isinstance(spec, dict):
+        raise ValueError("A report spec must be an object")
+    _check_keys(spec, _SPEC_KEYS)
+    title = _string(spec, "title")
+    sections = tuple(
+        _section(section, f"sections[{index}]")
+        for index, section in enumerate(_list(spec, "sections"))
+    )
+    aggregations = dict.fromkeys(
+        step.aggregation
+        for section in sections
+        for step in section.blocks
+        if step.aggregation is not None
+    )
+    return RenderPlan(digest, title, sections, tuple(aggregations))
+
+
+def _section(spec: Any, path: str) -> SectionStep:
+    if not isinstance(spec, dict):
+        raise ValueError(f"{path}: a section must be an object")
+    _check_keys(spec, _SECTION_KEYS, path)
+    try:
+        title = _string(spec, "title")
+        blocks = _list(spec, "blocks")
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from e
+    return SectionStep(
+        title,
+        tuple(
+            _block(block, f"{path}.blocks[{index}]")
+            for index, block in enumerate(blocks)
+        ),
+    )
+
+
+def _block(spec: Any, path: str) -> BlockStep:
+    if not isinstance(spec, dict):
+        raise ValueError(f"{path}: a block must be an object")
+    try:
+        block_type = BlockType(spec.get("type", ""))
+        _check_keys(spec, _BLOCK_KEYS[block_type])
+        aggregation = None
+        if block_type in _CHARTS:
+            aggregation = Aggregation.parse(str(spec.get("data", "")))
+        items: tuple[str, ...] = ()
+        if block_type is BlockType.SUMMARY:
+            items = _items(spec.get("items", list(SUMMARY_LABELS)))
+        caption = _string(spec, "caption")
+        return BlockStep(block_type, aggregation, items, caption, _width(spec))
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from e
+
+
+def _check_keys(spec: dict[str, Any], keys: frozenset[str], path: str = "") -> None:
+    unknown = sorted(set(spec) - keys)
+    if unknown:
+        prefix = f"{path}: " if path else ""
+        raise ValueError(
+            f"{prefix}Unknown keys {unknown}, expected some of {sorted(keys)}"
+        )
+
+
+def _items(items: Any) -> tuple[str, ...]:
+    if not isinstance(items, list):
+        raise ValueError(f"The summary items must be a list, not {items!r}")
+    unknown = [
+        item
+        for item in items
+        if not isinstance(item, str) or item not in SUMMARY_LABELS
+    ]
+    if unknown:
+        raise ValueError(f"Unknown summary items: {unknown}")
+    return tuple(items)
+
+
+def _list(spec: dict[str, Any], key: str) -> list[Any]:
+    value = spec.get(key, [])
+    if not isinstance(value, list):
+        raise ValueError(f"The {key} must be a list, not {value!r}")
+    return value
+
+
+def _string(spec: dict[str, Any], key: str) -> Optional[str]:
+    value = spec.get(key)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"The {key} must be a string, not {value!r}")
+    return value
+
+
+def _width(spec: dict[str, Any]) -> Optional[float]:
+    width = spec.get("width")
+    if width is None:
+        return None
+    if (
+        isinstance(width, bool)
+        or not isinstance(width, (int, float))
+        or not math.isfinite(width)
+        or width <= 0
+    ):
+        raise ValueError(f"The width must be a positive number, not {width!r}")
+    return float(width)
@@ -0,0 +1,135 @@
+import hashlib
+import zlib
+from typing import IO, Any, Optional
+
+from fpdf.output import PDFPage, _dimensions_to_mediabox
+from fpdf.syntax import Name, PDFContentStream, PDFObject, create_dictionary_string
+
+from fpdf_reporting.rendering.page_store import SpilledContents, SpilledContentStream
+from fpdf_reporting.rendering.profiling import ProfiledOutputProducer
+
+# zlib's own default, currently equivalent to 6
+DEFAULT_COMPRESSION_LEVEL: int = -1
+
+
+def content_stream(
+    contents: bytes, compress: bool, level: int = DEFAULT_COMPRESSION_LEVEL
+) -> PDFContentStream:
+    """Return a content stream deflated at the given zlib level, if compressed."""
+    stream = PDFContentStream(contents=contents)
+    if compress:
+        _deflate(stream, level)
+    return stream
+
+
+def validate_compression_level(level: int) -> int:
+    if not DEFAULT_COMPRESSION_LEVEL <= level <= 9:
+        raise ValueError(f"Compression level must be between -1 and 9, got {level}")
+    return level
+
+
+class ReportOutputProducer(ProfiledOutputProducer):
+    """
+    Deflates the page content streams at the compression level of the document.
+    FPDF compresses them at zlib's default level while building its objects,
+    so compression is switched off for that step and applied here instead.
+    Font streams are always compressed by FPDF at the default level.
+    """
+
+    def __init__(self, fpdf: Any) -> None:
+        super().__init__(fpdf)
+        level = getattr(fpdf, "compression_level", DEFAULT_COMPRESSION_LEVEL)
+        self._level: Optional[int] = (
+            level if fpdf.compress and level != DEFAULT_COMPRESSION_LEVEL else None
+        )
+
+    def bufferize(self) -> Any:
+        if self._level is None:
+            return super().bufferize()
+        self.fpdf.compress = False
+        try:
+            return super().bufferize()
+        finally:
+            self.fpdf.compress = True
+
+    def _add_pages(self, _slice: slice = slice(0, None)) -> list[PDFPage]:
+        """
+        Add the pages and their content streams like `OutputProducer._add_pages`,
+        except that the contents of pages in a `PageStore` are only read back
+        while their stream is serialized. This follows the private fpdf2
+        method, hence the pin of fpdf2 below 2.9: the tests compare the output
+        with that of `OutputProducer`.
+        """
+        fpdf = self.fpdf
+        # Compression is switched off while bufferizing at a given level
+        compress = fpdf.compress or self._level is not None
+        level = DEFAULT_COMPRESSION_LEVEL if self._level is None else self._level
+        page_objs: list[PDFPage] = []
+        for page_obj in list(self._iter_pages_in_order())[_slice]:
+            if fpdf.pdf_version > "1.3" and fpdf.allow_images_transparency:
+                page_obj.group = create_dictionary_string(
+                    {"/Type": "/Group", "/S": "/Transparency", "/CS": "/DeviceRGB"},
+                    field_join=" ",
+                )
+            if page_obj.dimensions() != fpdf.default_page_dimensions:
+                page_obj.media_box = _dimensions_to_mediabox(page_obj.dimensions())
+            self._add_pdf_obj(page_obj, "pages")
+            page_objs.append(page_obj)
+
+            contents: Any = page_obj.contents
+            if isinstance(contents, SpilledContents):
+                stream: PDFContentStream = SpilledContentStream(
+                    contents, compress, level
+                )
+            else:
+                stream = PDFContentStream(contents=contents, compress=fpdf.compress)
+            self._add_pdf_obj(stream, "pages")
+            page_obj.contents = stream
+        return page_objs
+
+    def _add_pdf_obj(
+        self, pdf_obj: PDFObject, trace_label: Optional[str] = None
+    ) -> int:
+        if (
+            self._level is not None
+            and type(pdf_obj) is PDFContentStream
+            and pdf_obj.filter is None
+        ):
+            _deflate(pdf_obj, self._level)
+        return super()._add_pdf_obj(pdf_obj, trace_label)
+
+
+class StreamBuffer:
+    """
+    Stands in for the bytearray `OutputProducer` serializes the document into:
+    every object is written to the sink as soon as it is appended. Only the
+    size, for the xref offsets, and a running hash, for the file ID, are kept.
+    """
+
+    def __init__(self, sink: IO[bytes]) -> None:
+        self.sink = sink
+        self.size = 0
+        self.md5 = hashlib.md5(usedforsecurity=False)
+
+    def __iadd__(self, data: bytes) -> "StreamBuffer":
+        self.sink.write(data)
+        self.md5.update(data)
+        self.size += len(data)
+        return self
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class StreamingOutputProducer(ReportOutputProducer):
+    """Writes the serialized objects to a binary file instead of a buffer."""
+
+    def __init__(self, fpdf: Any, sink: IO[bytes]) -> None:
+        super().__init__(fpdf)
+        self.buffer: Any = StreamBuffer(sink)
+
+
+def _deflate(stream: PDFContentStream, level: int) -> None:
+    stream._contents = zlib.compress(stream._contents, level=level)
+    stream.filter = Name("FlateDecode")
+    stream.length = len(stream._contents)
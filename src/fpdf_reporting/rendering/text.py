@@ -0,0 +1,87 @@
+from enum import StrEnum
+from typing import Callable, Optional
+
+# Width of a text in the current font, e.g. `PDF.measure_text`
+Measure = Callable[[str], float]
+
+ELLIPSIS: str = "…"
+
+
+class TextOverflow(StrEnum):
+    TRUNCATE = "truncate"  # cut with an ellipsis
+    WRAP = "wrap"  # break between words, over several lines
+
+
+def truncate(
+    text: str,
+    width: float,
+    measure: Measure,
+    measure_prefix: Optional[Measure] = None,
+) -> str:
+    """
+    Return the text, or its longest start followed by an ellipsis, that fits
+    the width. The cut is first estimated from the average character width,
+    so only a few widths are measured whatever the length of the text.
+    The starts tried are measured with `measure_prefix`, defaulting to
+    `measure`: they are seldom measured twice, so they are better kept out
+    of a memoized `measure`.
+    """
+    full_width = measure(text)
+    if full_width <= width:
+        return text
+    available = width - measure(ELLIPSIS)
+    if available <= 0:
+        return ""
+
+    # Grow or shrink the estimate until it is the longest start that fits
+    measure_prefix = measure_prefix or measure
+    end = min(len(text) - 1, int(len(text) * available / full_width))
+    while end > 0 and measure_prefix(text[:end]) > available:
+        end -= 1
+    while end + 1 < len(text) and measure_prefix(text[: end + 1]) <= available:
+        end += 1
+    return text[:end].rstrip() + ELLIPSIS if end else ""
+
+
+def wrap(
+    text: str,
+    width: float,
+    measure: Measure,
+    max_lines: int,
+    measure_prefix: Optional[Measure] = None,
+) -> list[str]:
+    """
+    Break the text between words into lines fitting the width. Words are
+    measured one by one, which the memoized `measure` makes cheap on tables
+    where words repeat. A word wider than a line, or the text left after
+    `max_lines`, is truncated, see `truncate`; that rest of the text is
+    measured with `measure_prefix` too.
+    """
+    words = text.split()
+    if not words:
+        return [""]
+
+    space = measure(" ")
+    lines: list[str] = []
+    line: list[str] = []
+    line_width = 0.0
+    for index, word in enumerate(words):
+        word_width = measure(word)
+        if line and line_width + space + word_width <= width:
+            line.append(word)
+            line_width += space + word_width
+            continue
+        if line:
+            lines.append(" ".join(line))
+        if len(lines) == max_lines - 1:
+            # The last line takes the rest of the text
+            # The rest of the text is measured like the starts of a text
+            rest = " ".join(words[index:])
+            measure_rest = measure_prefix or measure
+            lines.append(truncate(rest, width, measure_rest, measure_rest))
+            return lines
+        line, line_width = [word], word_width
+        if word_width > width:
+            line = [truncate(word, width, measure, measure_prefix)]
+    lines.append(" ".join(line))
+    return lines
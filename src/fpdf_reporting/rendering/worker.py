@@ -0,0 +1,257 @@
+"""
+A resident report renderer: fonts, styles and chart backends are loaded once,
+then report jobs are read as JSON lines from stdin or a local socket.
+
+A job names the output file, the title and either inline tickets or an export:
+
+    {"id": "42", "output": "out/sprint-42.pdf", "title": "Sprint 42",
+     "style": "notion", "chart_backend": "png", "compression_level": 1,
+     "spill_pages": true, "export": "exports/sprint-42.csv"}
+    {"id": "43", "output": "out/hotfix.pdf", "tickets": [{"key": "PD-1",
+     "summary": "Fix login", "status": "In progress", "issue_type": "Bug"}]}
+
+A job may also carry a report spec, see `report_plan`, drawn instead of the
+worker's render function. Specs are compiled once per worker:
+
+    {"id": "44", "output": "out/overview.pdf", "export": "exports/q3.csv",
+     "spec": {"title": "Q3", "sections": [{"blocks": [{"type": "pie",
+     "data": "count_by_status"}]}]}}
+
+Every job is answered with one JSON line, in order. {"command": "metrics"}
+returns the throughput and latency statistics, {"command": "shutdown"}
+stops the worker.
+"""
+
+import argparse
+import json
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Optional, Union
+
+from fpdf_reporting.model.loader import (
+    DATE_FIELDS,
+    load_export,
+    parse_category,
+    parse_status,
+)
+from fpdf_reporting.model.style import NotionStyle, Style
+from fpdf_reporting.model.ticket import Ticket
+from fpdf_reporting.model.ticket_table import TicketTable
+from fpdf_reporting.rendering.batch import (
+    JobResult,
+    RenderFunction,
+    ReportJob,
+    init_worker,
+    render_ticket_report,
+    run_job,
+)
+from fpdf_reporting.rendering.graphs import ChartBackend
+from fpdf_reporting.rendering.report_plan import compile_spec
+from fpdf_reporting.rendering.streaming import DEFAULT_COMPRESSION_LEVEL
+
+STYLES: dict[str, type[Style]] = {"notion": NotionStyle}
+
+# Latencies kept for the percentiles of a long-running worker
+LATENCY_WINDOW: int = 10_000
+
+
+class WorkerMetrics:
+    """Throughput since start and latency percentiles of the recent jobs."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.jobs = 0
+        self.failures = 0
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, result: JobResult) -> None:
+        self.jobs += 1
+        if not result.ok:
+            self.failures += 1
+        self.latencies.append(result.duration)
+
+    def snapshot(self) -> dict[str, float]:
+        uptime = time.perf_counter() - self.started
+        latencies = sorted(self.latencies)
+        snapshot = {
+            "jobs": self.jobs,
+            "failures": self.failures,
+            "uptime": uptime,
+            "throughput": self.jobs / uptime if uptime else 0,
+        }
+        if latencies:
+            snapshot.update(
+                latency_mean=sum(latencies) / len(latencies),
+                latency_p50=_percentile(latencies, 0.50),
+                latency_p95=_percentile(latencies, 0.95),
+                latency_max=latencies[-1],
+            )
+        return snapshot
+
+
+class ReportWorker:
+    def __init__(
+        self,
+        chart_backend: ChartBackend = ChartBackend.VECTOR,
+        render: RenderFunction = render_ticket_report,
+    ) -> None:
+        """
+        :param chart_backend: The chart backend of jobs that do not name one
+        :param render: A function drawing a job into a PDF
+        """
+        self.chart_backend = chart_backend
+        self.render = render
+        self.metrics = WorkerMetrics()
+        self.running = True
+        self._styles: dict[str, Style] = {}
+        init_worker(chart_backend)
+
+    def handle(self, line: str) -> Optional[dict[str, Any]]:
+        """Run one request and return its response, or None for a blank line."""
+        if not line.strip():
+            return None
+        request: Any = {}
+        try:
+            request = json.loads(line)
+            command = request.get("command", "render")
+            if command == "metrics":
+                return {"metrics": self.metrics.snapshot()}
+            if command == "shutdown":
+                self.running = False
+                return {"metrics": self.metrics.snapshot()}
+            if command != "render":
+                raise ValueError(f"Unknown command: {command}")
+            job, chart_backend = self._job(request)
+            render = compile_spec(request["spec"]) if "spec" in request else self.render
+        except Exception as e:
+            request_id = request.get("id") if isinstance(request, dict) else None
+            return {"id": request_id, "ok": False, "error": repr(e)}
+
+        result = run_job(job, render, chart_backend)
+        self.metrics.record(result)
+        response: dict[str, Any] = {
+            "id": request.get("id"),
+            "ok": result.ok,
+            "output": str(result.output_path),
+            "pages": result.pages,
+            "seconds": result.duration,
+        }
+        if not result.ok:
+            response["error"] = result.error
+        return response
+
+    def serve(self, requests: IO[str], responses: IO[str]) -> None:
+        """Answer JSON lines requests until the input ends or a shutdown."""
+        for line in requests:
+            response = self.handle(line)
+            if response is not None:
+                responses.write(json.dumps(response) + "\n")
+                responses.flush()
+            if not self.running:
+                break
+
+    def serve_socket(self, server: socketserver.BaseServer) -> None:
+        """Answer the connections of a server made by `unix_server` or `tcp_server`."""
+        with server:
+            server.serve_forever()
+
+    def _job(self, request: dict[str, Any]) -> tuple[ReportJob, ChartBackend]:
+        style_name = request.get("style", "notion")
+        style = self._styles.get(style_name)
+        if style is None:
+            if style_name not in STYLES:
+                raise ValueError(f"Unknown style: {style_name}")
+            style = self._styles[style_name] = STYLES[style_name]()
+
+        tickets: Union[list[Ticket], TicketTable]
+        if "export" in request:
+            # Exports may hold millions of tickets, which take far less memory
+            # in columns
+            tickets = TicketTable(load_export(request["export"]))
+        else:
+            tickets = [_ticket(values) for values in request.get("tickets", [])]
+
+        job = ReportJob(
+            style,
+            tickets,
+            Path(request["output"]),
+            title=request.get("title", "JIRA Report"),
+            compression_level=request.get(
+                "compression_level", DEFAULT_COMPRESSION_LEVEL
+            ),
+            spill_pages=request.get("spill_pages", False),
+        )
+        return job, ChartBackend(request.get("chart_backend", self.chart_backend))
+
+
+def unix_server(worker: ReportWorker, path: str) -> socketserver.BaseServer:
+    return socketserver.UnixStreamServer(path, _handler(worker))
+
+
+def tcp_server(worker: ReportWorker, port: int) -> socketserver.BaseServer:
+    """Listen on localhost only."""
+    return socketserver.TCPServer(("127.0.0.1", port), _handler(worker))
+
+
+def _handler(worker: ReportWorker) -> type[socketserver.BaseRequestHandler]:
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self) -> None:
+            connection: socket.socket = self.request
+            with (
+                connection.makefile("r", encoding="utf-8") as requests,
+                connection.makefile("w", encoding="utf-8") as responses,
+            ):
+                worker.serve(requests, responses)
+            if not worker.running:
+                # shutdown() waits for serve_forever, which runs this handler
+                threading.Thread(target=self.server.shutdown).start()
+
+    return Handler
+
+
+def _ticket(values: dict[str, Any]) -> Ticket:
+    values = dict(values)
+    values["status"] = parse_status(values.get("status"))
+    values["category"] = parse_category(values.get("category"))
+    for field in DATE_FIELDS:
+        if values.get(field):
+            values[field] = datetime.fromisoformat(values[field])
+    return Ticket(**values)
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Render report jobs from JSON lines.")
+    parser.add_argument("--socket", help="listen on this Unix socket path")
+    parser.add_argument("--port", type=int, help="listen on this localhost TCP port")
+    parser.add_argument(
+        "--chart-backend",
+        choices=[backend.value for backend in ChartBackend],
+        default=ChartBackend.VECTOR.value,
+    )
+    args = parser.parse_args(argv)
+
+    worker = ReportWorker(ChartBackend(args.chart_backend))
+    try:
+        if args.socket:
+            worker.serve_socket(unix_server(worker, args.socket))
+        elif args.port:
+            worker.serve_socket(tcp_server(worker, args.port))
+        else:
+            worker.serve(sys.stdin, sys.stdout)
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps({"metrics": worker.metrics.snapshot()}), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
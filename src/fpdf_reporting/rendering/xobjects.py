@@ -0,0 +1,59 @@
+"""
+Form XObjects for `PDF.stamp`. fpdf2 has no public API to define a Form
+XObject from drawing commands, so this module is the only one reading or
+writing fpdf2's resource catalog and page buffers for them; fpdf2 is pinned
+below 2.9 accordingly.
+
+Images and Form XObjects share the `/I<n>` resource names of a document:
+fpdf2 numbers a new image by counting images, not from its XObject counter,
+so `claim_image_index` moves a new image past the templates.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, cast
+
+from fpdf import FPDF
+from fpdf.enums import PDFResourceType
+from fpdf.image_datastructures import RasterImageInfo
+from fpdf.syntax import Name, PDFArray, PDFContentStream
+
+
+@contextmanager
+def captured_contents(pdf: FPDF) -> Iterator[bytearray]:
+    """Collect what is drawn meanwhile into a new buffer instead of the page."""
+    page = pdf.pages[pdf.page]
+    contents, page.contents = page.contents, bytearray()
+    try:
+        yield page.contents
+    finally:
+        page.contents = contents
+
+
+def add_form_xobject(
+    pdf: FPDF, stream: PDFContentStream, b_box: tuple[float, float, float, float]
+) -> int:
+    """
+    Make a content stream a Form XObject of the document.
+    :param b_box: The bounding box of the stream, in points
+    :return: the index n of its "/I<n>" name
+    """
+    stream.type = Name("XObject")  # type: ignore[attr-defined]
+    stream.subtype = Name("Form")  # type: ignore[attr-defined]
+    stream.b_box = PDFArray(b_box)  # type: ignore[attr-defined]
+    catalog = pdf._resource_catalog
+    index = catalog.next_xobject_index
+    catalog.next_xobject_index += 1
+    catalog.form_xobjects.append((index, stream))
+    return index
+
+
+def use_xobject(pdf: FPDF, index: int) -> None:
+    """List the XObject "/I<index>" in the resources of the current page."""
+    pdf._resource_catalog.add(PDFResourceType.X_OBJECT, index, pdf.page)
+
+
+def claim_image_index(pdf: FPDF, info: RasterImageInfo) -> None:
+    """Number an image drawn for the first time from the XObject counter."""
+    next_index = pdf._resource_catalog.next_xobject_index
+    if info["usages"] == 1 and cast(int, info["i"]) < next_index:
+        info["i"] = next_index
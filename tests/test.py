@@ -2,6 +2,7 @@ import pytest
 
 from fpdf_reporting.model.style import NotionStyle
 from fpdf_reporting.model.ticket import Category, Status, Ticket
+from fpdf_reporting.rendering.layout import BarChart, PieChart, SummaryCard
 from fpdf_reporting.rendering.pdf_generator import PDF
 
 DARK_BACKGROUND = (38, 33, 43)
@@ -19,22 +20,8 @@ def test():
     pdf.document_header("Other header", centered=True)
 
     pdf.section_title("Overview")
-    pdf.summary_card(
-        ["Total Tickets: 58", "Completed: 42", "In Progress: 10", "Blocked: 6"],
-        width=50,
-    )
-
-    pdf.summary_card(
-        ["Total Tickets: 58", "Completed: 42", "In Progress: 10", "Blocked: 6"],
-        width=50,
-    )
-
-    (_, y) = pdf.summary_card(
-        ["Total Tickets: 58", "Completed: 42", "In Progress: 10", "Blocked: 6"],
-        width=50,
-    )
-
-    pdf.set_y(y + 10)
+    items = ["Total Tickets: 58", "Completed: 42", "In Progress: 10", "Blocked: 6"]
+    pdf.place([SummaryCard(items, width=50)] * 3)
 
     pdf.styled_table(
         headers=["Key", "Summary", "Status", "Assignee"],
@@ -86,12 +73,10 @@ def test():
         "cat4": 3,
     }
 
-    (x, y) = pdf.bar_chart(data, caption="Categories")
-
-    pdf.set_x(x + 10)
-    pdf.pie_chart(
-        data,
-        width=30,
-        caption="Categories",
+    pdf.place(
+        [
+            BarChart(data, caption="Categories"),
+            PieChart(data, width=30, caption="Categories"),
+        ]
     )
     pdf.output("./output/test.pdf")
@@ -0,0 +1,182 @@
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from fpdf_reporting.model.style import NotionStyle
+from fpdf_reporting.model.ticket import Status, Ticket
+from fpdf_reporting.rendering.async_rendering import AsyncRenderer
+from fpdf_reporting.rendering.batch import (
+    ReportJob,
+    render_bytes,
+    render_ticket_report,
+)
+from fpdf_reporting.rendering.graphs import ChartBackend, _render_pie_chart
+from fpdf_reporting.rendering.pdf_generator import PDF
+
+TICKETS = [
+    Ticket(key=f"PD-{i}", summary="Async", status=Status.OTHER, issue_type="Bug")
+    for i in range(3)
+]
+
+
+def job(tmp_path: Path, title: str = "Async report") -> ReportJob:
+    return ReportJob(NotionStyle(), TICKETS, tmp_path / f"{title}.pdf", title=title)
+
+
+class SlowReports:
+    """Render functions that block on an event and count concurrent renders."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.started: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, pdf: PDF, job: ReportJob) -> None:
+        with self._lock:
+            self.started.append(job.title)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        self.release.wait(timeout=10)
+        with self._lock:
+            self.active -= 1
+        render_ticket_report(pdf, job)
+
+
+def dated_report(pdf: PDF, job: ReportJob) -> None:
+    pdf.set_creation_date(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    render_ticket_report(pdf, job)
+
+
+def failing_report(pdf: PDF, job: ReportJob) -> None:
+    raise RuntimeError("cannot render")
+
+
+def test_render_returns_pdf_bytes(tmp_path: Path):
+    async def main() -> bytes:
+        async with AsyncRenderer() as renderer:
+            return await renderer.render(job(tmp_path))
+
+    assert asyncio.run(main()).startswith(b"%PDF")
+
+
+def test_write_reports_errors_in_the_result(tmp_path: Path):
+    async def main() -> None:
+        async with AsyncRenderer() as renderer:
+            result = await renderer.write(job(tmp_path))
+            assert result.ok and result.output_path.exists()
+        async with AsyncRenderer(render=failing_report) as renderer:
+            result = await renderer.write(job(tmp_path, "broken"))
+            assert "cannot render" in str(result.error)
+            with pytest.raises(RuntimeError):
+                await renderer.render(job(tmp_path))
+
+    asyncio.run(main())
+
+
+def test_concurrency_is_bounded_and_the_loop_keeps_running(tmp_path: Path):
+    reports = SlowReports()
+
+    async def main() -> int:
+        ticks = 0
+
+        async def heartbeat() -> None:
+            nonlocal ticks
+            while not reports.release.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        async def release_later() -> None:
+            await asyncio.sleep(0.2)
+            reports.release.set()
+
+        executor = ThreadPoolExecutor(max_workers=8)
+        renderer = AsyncRenderer(max_concurrency=2, executor=executor, render=reports)
+        results = await asyncio.gather(
+            *(renderer.render(job(tmp_path, str(i))) for i in range(6)),
+            heartbeat(),
+            release_later(),
+        )
+        executor.shutdown()
+        assert all(pdf.startswith(b"%PDF") for pdf in results[:6])
+        return ticks
+
+    assert asyncio.run(main()) > 5
+    assert reports.max_active == 2
+    assert len(reports.started) == 6
+
+
+def test_cancellation(tmp_path: Path):
+    reports = SlowReports()
+
+    async def main() -> None:
+        async with AsyncRenderer(max_concurrency=1, render=reports) as renderer:
+            running = asyncio.create_task(renderer.render(job(tmp_path, "running")))
+            queued = asyncio.create_task(renderer.render(job(tmp_path, "queued")))
+            await asyncio.sleep(0.05)
+            running.cancel()
+            queued.cancel()
+            await asyncio.gather(running, queued, return_exceptions=True)
+            assert running.cancelled() and queued.cancelled()
+
+            # The running render keeps its slot until it ends
+            following = asyncio.create_task(renderer.render(job(tmp_path, "next")))
+            await asyncio.sleep(0.05)
+            assert reports.started == ["running"]
+            reports.release.set()
+            assert (await following).startswith(b"%PDF")
+
+    asyncio.run(main())
+    assert reports.started == ["running", "next"]
+
+
+def test_render_in_processes(tmp_path: Path):
+    async def main() -> list[bytes]:
+        async with AsyncRenderer(
+            max_concurrency=2, processes=True, chart_backend=ChartBackend.PNG
+        ) as renderer:
+            return await asyncio.gather(
+                *(renderer.render(job(tmp_path, str(i))) for i in range(3))
+            )
+
+    assert all(pdf.startswith(b"%PDF") for pdf in asyncio.run(main()))
+
+
+def test_concurrent_output_in_threads(tmp_path: Path):
+    jobs = [job(tmp_path, str(i)) for i in range(16)]
+
+    async def main() -> list[bytes]:
+        async with AsyncRenderer(max_concurrency=8, render=dated_report) as renderer:
+            return await asyncio.gather(*(renderer.render(job) for job in jobs))
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        outputs = asyncio.run(main())
+    finally:
+        sys.setswitchinterval(interval)
+    # the documents share their fonts, but not the objects written on output
+    serial = [render_bytes(job, dated_report, ChartBackend.VECTOR) for job in jobs]
+    assert outputs == serial
+
+
+def test_chart_images_render_safely_in_threads():
+    colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+    charts = [[1, 2, i] for i in range(1, 9)]
+    expected = [_render_pie_chart(values, 35, colors, 72) for values in charts]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        images = list(
+            executor.map(lambda v: _render_pie_chart(v, 35, colors, 72), charts)
+        )
+    assert images == expected
+
+
+def test_invalid_concurrency():
+    with pytest.raises(ValueError):
+        AsyncRenderer(max_concurrency=0)
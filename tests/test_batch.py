@@ -0,0 +1,92 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from fpdf_reporting.model.style import NotionStyle
+from fpdf_reporting.model.ticket import Category, Status, Ticket
+from fpdf_reporting.rendering.batch import (
+    JOBS_PER_WORKER,
+    ReportJob,
+    generate_reports,
+    render_ticket_report,
+)
+from fpdf_reporting.rendering.pdf_generator import PDF
+
+
+def failing_report(pdf: PDF, job: ReportJob) -> None:
+    if job.title == "broken":
+        raise RuntimeError("cannot render")
+    render_ticket_report(pdf, job)
+
+
+@pytest.fixture
+def tickets() -> list[Ticket]:
+    return [
+        Ticket(
+            key=f"PD-{i}",
+            summary="Batch ticket",
+            status=Status.IN_PROGRESS,
+            issue_type="Bug",
+            category=Category.COMMITTED,
+        )
+        for i in range(3)
+    ]
+
+
+def test_generate_reports(tmp_path: Path, tickets: list[Ticket]):
+    jobs = [
+        ReportJob(NotionStyle(), tickets, tmp_path / f"report-{i}.pdf")
+        for i in range(4)
+    ]
+    results = list(generate_reports(jobs, max_workers=2))
+
+    assert len(results) == 4
+    assert all(result.ok for result in results)
+    assert all(result.duration > 0 for result in results)
+    assert all(result.pages == 1 for result in results)
+    for job in jobs:
+        assert job.output_path.read_bytes().startswith(b"%PDF")
+
+
+def test_failing_job_does_not_stop_the_batch(tmp_path: Path, tickets: list[Ticket]):
+    jobs = [
+        ReportJob(NotionStyle(), tickets, tmp_path / "ok.pdf"),
+        ReportJob(NotionStyle(), tickets, tmp_path / "broken.pdf", title="broken"),
+    ]
+    results = {
+        result.output_path.name: result
+        for result in generate_reports(jobs, render=failing_report, max_workers=2)
+    }
+
+    assert results["ok.pdf"].ok
+    assert not results["broken.pdf"].ok
+    assert "cannot render" in str(results["broken.pdf"].error)
+    assert (tmp_path / "ok.pdf").exists()
+    assert not (tmp_path / "broken.pdf").exists()
+
+
+def test_spill_pages(tmp_path: Path, tickets: list[Ticket]):
+    jobs = [
+        ReportJob(
+            NotionStyle(), tickets * 10, tmp_path / "spilled.pdf", spill_pages=True
+        )
+    ]
+    [result] = generate_reports(jobs, max_workers=1)
+    assert result.ok
+    assert result.pages == 4
+    assert jobs[0].output_path.read_bytes().rstrip().endswith(b"%%EOF")
+
+
+def test_jobs_are_read_as_workers_need_them(tmp_path: Path, tickets: list[Ticket]):
+    read = []
+
+    def jobs() -> Iterator[ReportJob]:
+        for i in range(5):
+            read.append(i)
+            yield ReportJob(NotionStyle(), tickets, tmp_path / f"report-{i}.pdf")
+
+    results = generate_reports(jobs(), max_workers=1)
+    assert next(results).ok
+    assert len(read) == JOBS_PER_WORKER
+    assert len(list(results)) == 4 and len(read) == 5
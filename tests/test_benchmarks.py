@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from fpdf_reporting.model.loader import load_export
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+import suite  # noqa: E402
+import workloads  # noqa: E402
+from workloads import WORKLOADS, csv_export, export_report  # noqa: E402
+
+
+@pytest.mark.parametrize("name", ["cards-100", "sprint-report"])
+def test_measure_workload(name: str, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(suite, "MIN_TIMED_SECONDS", 0.5)
+    metrics = suite.measure(name, trace=False)
+    assert metrics["seconds"] > 0
+    # sub-second workloads are repeated, the fastest run is kept
+    assert metrics["runs"] > 1
+    assert metrics["peak_rss"] > 0
+    assert metrics["output_bytes"] > 0
+
+
+def test_workload_output_is_reproducible():
+    workload = WORKLOADS["charts-400"]
+    data = workload.setup()[:10]
+    assert workload.render(data).output() == workload.render(data).output()
+
+
+def test_export_workload_loads_every_row():
+    path = csv_export(25_000)
+    tickets = list(load_export(path))
+    assert len(tickets) == 25_000 and tickets[-1].key == "PD-24999"
+    # the export round-trips the generated tickets
+    assert tickets[:100] == workloads.tickets(100)
+    assert export_report(path).output().startswith(b"%PDF")
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {"cards": {"seconds": 1.0, "output_bytes": 1000}}
+    assert (
+        suite.compare({"cards": {"seconds": 1.2, "output_bytes": 1000}}, baseline) == []
+    )
+    regressions = suite.compare(
+        {"cards": {"seconds": 2.0, "output_bytes": 1100}, "new": {"seconds": 5.0}},
+        baseline,
+    )
+    assert len(regressions) == 2
+    assert regressions[0].startswith("cards seconds")
+
+
+def test_short_workloads_have_a_wider_time_tolerance():
+    baseline = {"short": {"seconds": 0.1}, "long": {"seconds": 10.0}}
+    results = {"short": {"seconds": 0.15}, "long": {"seconds": 15.0}}
+    assert suite.compare(results, baseline) == [
+        "long seconds: 15.000 > 10.000 (+50%, tolerance 30%)"
+    ]
+    assert len(suite.compare({"short": {"seconds": 0.2}}, baseline)) == 1
+
+
+def test_baseline_round_trip(tmp_path: Path):
+    path = tmp_path / "baseline.json"
+    assert suite.load_baseline(path) == {}
+    suite.save_baseline({"a": {"seconds": 1.0}}, path)
+    suite.save_baseline({"b": {"seconds": 2.0}}, path)
+    assert suite.load_baseline(path) == {"a": {"seconds": 1.0}, "b": {"seconds": 2.0}}
@@ -0,0 +1,23 @@
+from fpdf_reporting.rendering.cache import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache: LRUCache[int, bytes] = LRUCache(max_size=2)
+    cache.put(0, b"0")
+    cache.put(1, b"1")
+    assert cache.get(0) == b"0"
+    cache.put(2, b"2")
+    assert len(cache) == 2
+    assert cache.get(1) is None
+    assert cache.get(0) == b"0"
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_clear_resets_the_counts():
+    cache: LRUCache[str, int] = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("b")
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
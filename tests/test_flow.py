@@ -0,0 +1,94 @@
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from fpdf_reporting.model.flow import burndown, cumulative_flow, cycle_times
+from fpdf_reporting.model.ticket import Status, Ticket
+from fpdf_reporting.model.ticket_table import TicketTable
+
+
+def ticket(
+    start: datetime | None, end: datetime | None = None, story_points: int = 1
+) -> Ticket:
+    return Ticket(
+        key="PD-1",
+        summary="Flow",
+        status=Status.OTHER,
+        issue_type="Bug",
+        start_date=start,
+        end_date=end,
+        story_points=story_points,
+    )
+
+
+MONDAY = datetime(2024, 5, 6, 9)
+TICKETS = [
+    ticket(MONDAY, MONDAY + timedelta(days=1, hours=5), 3),
+    ticket(MONDAY + timedelta(days=1), MONDAY + timedelta(days=3), 5),
+    ticket(MONDAY + timedelta(days=2)),
+    ticket(None, MONDAY + timedelta(days=2), 2),
+    ticket(None),
+]
+
+
+@pytest.mark.parametrize("table", [False, True])
+def test_burndown(table: bool):
+    tickets = TicketTable(TICKETS) if table else TICKETS
+    daily = burndown(tickets)
+    assert daily.start == date(2024, 5, 6) and daily.end == date(2024, 5, 9)
+    assert daily.series["Remaining"] == [5, 4, 3, 2]
+    assert daily.series["Ideal"] == pytest.approx([5, 10 / 3, 5 / 3, 0])
+
+    points = burndown(tickets, story_points=True).series["Remaining"]
+    assert points == [12, 9, 7, 2]
+
+
+def test_burndown_over_a_given_range():
+    daily = burndown(TICKETS, start=date(2024, 5, 7), end=date(2024, 5, 12))
+    assert daily.days == 6
+    # Tickets done before the first day are done from the start
+    assert daily.series["Remaining"] == [4, 3, 2, 2, 2, 2]
+
+
+@pytest.mark.parametrize("table", [False, True])
+def test_cumulative_flow(table: bool):
+    tickets = TicketTable(TICKETS) if table else TICKETS
+    series = cumulative_flow(tickets).series
+    assert series["Done"] == [0, 1, 2, 3]
+    assert series["In progress"] == [1, 1, 2, 1]
+    assert series["To do"] == [4, 3, 1, 1]
+
+
+def test_cycle_times():
+    assert cycle_times(TICKETS) == pytest.approx([29 / 24, 2])
+    assert cycle_times([ticket(MONDAY, MONDAY - timedelta(days=1))]) == []
+
+
+def test_timezone_aware_dates():
+    start = datetime(2024, 5, 6, 23, tzinfo=timezone(timedelta(hours=-2)))
+    daily = burndown([ticket(start, start + timedelta(hours=1))])
+    assert daily.start == date(2024, 5, 7)
+    assert daily.series["Remaining"] == [0]
+
+
+def test_no_dates():
+    daily = cumulative_flow([ticket(None)])
+    assert daily.days == 0
+    assert burndown([]).series == {"Remaining": [], "Ideal": []}
+
+
+def test_a_year_of_100k_tickets_is_fast():
+    tickets = TicketTable(
+        ticket(
+            MONDAY + timedelta(hours=i * 37 % (365 * 24)),
+            MONDAY + timedelta(hours=i * 37 % (365 * 24) + i % 500) if i % 4 else None,
+        )
+        for i in range(100_000)
+    )
+    start = time.perf_counter()
+    daily = cumulative_flow(tickets)
+    burndown(tickets, story_points=True)
+    cycle_times(tickets)
+    assert time.perf_counter() - start < 0.5
+    assert daily.series["Done"][-1] == 75_000
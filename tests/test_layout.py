@@ -0,0 +1,58 @@
+import pytest
+
+from fpdf_reporting.rendering.layout import (
+    Box,
+    Frame,
+    Placement,
+    pack,
+)
+
+FRAME = Frame(left=10, top=10, width=100, bottom=200, y=50)
+
+
+def test_pack_rows():
+    layout = pack([Box(40, 20), Box(40, 30), Box(40, 10)], FRAME, gap=5)
+    assert layout.placements == (
+        Placement(0, 10, 50),
+        Placement(0, 55, 50),
+        Placement(0, 10, 85),
+    )
+    assert layout.end_y == 95
+    assert layout.pages == 1
+
+
+def test_pack_boxes_filling_a_row_exactly():
+    layout = pack([Box(100 / 3, 10)] * 3, FRAME, gap=0)
+    assert [p.y for p in layout.placements] == [50, 50, 50]
+
+
+def test_pack_breaks_pages():
+    layout = pack([Box(100, 100), Box(100, 100), Box(50, 150)], FRAME, gap=5)
+    assert layout.placements == (
+        Placement(0, 10, 50),
+        Placement(1, 10, 10),
+        Placement(2, 10, 10),
+    )
+    assert layout.pages == 3
+    assert layout.end_y == 160
+
+
+def test_pack_oversized_boxes():
+    layout = pack([Box(200, 300), Box(10, 10)], FRAME, gap=5)
+    # a box too large for any page is not pushed to the next one forever
+    assert layout.placements[0] == Placement(1, 10, 10)
+    assert layout.placements[1] == Placement(2, 10, 10)
+
+
+def test_pack_columns():
+    layout = pack([Box(20, 10), Box(40, 10), Box(20, 10)], FRAME, gap=5, columns=4)
+    pitch = 105 / 4
+    assert [p.x for p in layout.placements] == pytest.approx(
+        [10, 10 + pitch, 10 + 3 * pitch]
+    )
+
+
+def test_pack_nothing():
+    layout = pack([], FRAME, gap=5)
+    assert layout.pages == 1
+    assert layout.end_y == FRAME.y
@@ -0,0 +1,203 @@
+import io
+import json
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from fpdf_reporting.model.loader import (
+    DateParser,
+    load_csv,
+    load_export,
+    load_json,
+)
+from fpdf_reporting.model.ticket import Category, Status
+from fpdf_reporting.model.ticket_table import TicketTable
+
+CSV_EXPORT = """\
+Summary,Issue key,Issue Type,Status,Priority,Assignee,Created,Resolved,Due date,Component/s,Component/s,Custom field (Story Points),Custom field (Flagged),Custom field (Category)
+Fix login,PD-1,Bug,In Progress,High,Alice,01/Mar/24 9:30 AM,,08/Mar/24 5:00 PM,,API,5.0,Impediment,Committed
+Add metrics,PD-2,Story,Done,Low,,02/Mar/24 10:00 AM,04/Mar/24 11:15 AM,,UI,,,,nice to have
+"""
+
+ISSUE = {
+    "key": "PD-1",
+    "fields": {
+        "summary": "Fix login",
+        "status": {"name": "Ready for QA"},
+        "issuetype": {"name": "Bug"},
+        "priority": {"name": "High"},
+        "created": "2024-03-01T09:30:00.000+0000",
+        "resolutiondate": None,
+        "duedate": "2024-03-08",
+        "components": [{"name": "API"}, {"name": "UI"}],
+        "assignee": {"displayName": "Alice"},
+        "customfield_10016": 8.0,
+    },
+}
+
+
+def test_load_csv():
+    tickets = list(load_csv(io.StringIO(CSV_EXPORT)))
+
+    assert len(tickets) == 2
+    first, second = tickets
+    assert first.key == "PD-1"
+    assert first.summary == "Fix login"
+    assert first.status == Status.IN_PROGRESS
+    assert first.issue_type == "Bug"
+    assert first.priority == "High"
+    assert first.assignee == "Alice"
+    assert first.start_date == datetime(2024, 3, 1, 9, 30)
+    assert first.end_date is None
+    assert first.due_date == datetime(2024, 3, 8, 17, 0)
+    assert first.component is None
+    assert first.story_points == 5
+    assert first.flagged
+    assert first.category == Category.COMMITTED
+
+    assert second.status == Status.OTHER
+    assert second.end_date == datetime(2024, 3, 4, 11, 15)
+    assert second.component == "UI"
+    assert second.story_points is None
+    assert not second.flagged
+    assert second.category == Category.NICE_TO_HAVE
+
+
+def test_load_csv_with_custom_columns():
+    export = "Key,Title,State,Type,Points\nPD-1,Fix login,On hold,Bug,3\n"
+    columns = {
+        "summary": ("Title",),
+        "status": ("State",),
+        "issue_type": ("Type",),
+        "story_points": ("Points",),
+    }
+    (ticket,) = load_csv(io.StringIO(export), columns=columns)
+    assert ticket.summary == "Fix login"
+    assert ticket.status == Status.ON_HOLD
+    assert ticket.story_points == 3
+
+
+def test_load_csv_without_required_columns():
+    with pytest.raises(ValueError):
+        list(load_csv(io.StringIO("Issue key,Summary\nPD-1,Fix login\n")))
+
+
+def test_load_csv_interns_repeated_strings():
+    export = CSV_EXPORT + CSV_EXPORT.split("\n", 1)[1] * 10
+    tickets = list(load_csv(io.StringIO(export)))
+    assert all(t.issue_type is tickets[0].issue_type for t in tickets[::2])
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        json.dumps({"startAt": 0, "total": 2, "issues": [ISSUE, ISSUE]}, indent=2),
+        json.dumps([ISSUE, ISSUE]),
+        json.dumps(ISSUE) + "\n" + json.dumps(ISSUE) + "\n",
+    ],
+    ids=["search-response", "list", "json-lines"],
+)
+def test_load_json(document: str):
+    tickets = list(
+        load_json(io.StringIO(document), fields={"story_points": "customfield_10016"})
+    )
+
+    assert len(tickets) == 2
+    ticket = tickets[0]
+    assert ticket.key == "PD-1"
+    assert ticket.status == Status.READY_FOR_QA
+    assert ticket.issue_type == "Bug"
+    # naive, like the dates of a CSV export
+    assert ticket.start_date == datetime(2024, 3, 1, 9, 30)
+    assert ticket.due_date == datetime(2024, 3, 8)
+    assert ticket.end_date is None
+    assert ticket.component == "API"
+    assert ticket.assignee == "Alice"
+    assert ticket.story_points == 8
+
+
+def test_load_json_across_read_chunks():
+    issues = [{**ISSUE, "key": f"PD-{i}"} for i in range(2000)]
+    document = json.dumps({"issues": issues})
+    assert len(document) > 1 << 18
+    keys = [t.key for t in load_json(io.StringIO(document))]
+    assert keys == [f"PD-{i}" for i in range(2000)]
+
+
+def test_load_export_by_extension(tmp_path: Path):
+    (tmp_path / "export.csv").write_text(CSV_EXPORT, encoding="utf-8")
+    (tmp_path / "export.json").write_text(json.dumps([ISSUE]), encoding="utf-8")
+    assert len(list(load_export(tmp_path / "export.csv"))) == 2
+    assert len(list(load_export(tmp_path / "export.json"))) == 1
+    with pytest.raises(ValueError):
+        load_export(tmp_path / "export.xml")
+
+
+def test_load_into_ticket_table():
+    table = TicketTable(load_csv(io.StringIO(CSV_EXPORT)))
+    assert len(table) == 2
+    assert table[0].due_date == datetime(2024, 3, 8, 17, 0)
+
+
+def test_date_parser_keeps_the_format_of_the_column():
+    parser = DateParser()
+    assert parser("01/Mar/24 9:30 AM") == datetime(2024, 3, 1, 9, 30)
+    assert parser._format == "%d/%b/%y %I:%M %p"
+    assert parser("") is None
+    with pytest.raises(ValueError, match="previous dates"):
+        parser("2024-03-01")
+    with pytest.raises(ValueError, match="Unrecognized"):
+        DateParser()("yesterday")
+
+
+def test_ambiguous_dates_are_read_in_one_format():
+    parser = DateParser(("%d/%m/%Y %H:%M", "%m/%d/%Y %H:%M"))
+    assert parser("03/04/2024 10:00") == datetime(2024, 4, 3, 10, 0)
+    with pytest.raises(ValueError, match="does not match"):
+        parser("03/13/2024 10:00")
+    assert parser("03/04/2024 10:00") == datetime(2024, 4, 3, 10, 0)
+
+
+def test_dates_with_an_offset_are_naive():
+    parser = DateParser()
+    assert parser("2024-03-01T09:30:00.000+0100") == datetime(2024, 3, 1, 9, 30)
+    assert parser("2024-03-01T09:30:00Z").tzinfo is None
+
+
+def test_fractional_story_points_are_rounded():
+    export = "Key,Summary,Status,Issue Type,Story Points,Tester Story Points\n"
+    (ticket,) = load_csv(io.StringIO(export + "PD-1,Login,Done,Bug,3.0,0.5\n"))
+    assert (ticket.story_points, ticket.tester_story_points) == (3, 0.5)
+    rows = "PD-2,Login,Done,Bug,0.5,\nPD-3,Logout,Done,Bug,2,\n"
+    with pytest.warns(UserWarning, match="PD-2 rounded from 0.5 to 1"):
+        tickets = list(load_csv(io.StringIO(export + rows)))
+    assert [t.story_points for t in tickets] == [1, 2]
+
+
+def test_load_csv_memory_does_not_grow_with_rows():
+    def peak_memory(rows: int) -> int:
+        export = io.StringIO(CSV_EXPORT + CSV_EXPORT.split("\n", 1)[1] * (rows // 2))
+        tracemalloc.start()
+        for _ in load_csv(export):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+    assert peak_memory(20_000) < 2 * peak_memory(2_000)
+
+
+@pytest.mark.parametrize(
+    "value, date_format",
+    [
+        ("01/Mar/24 9:30 AM", "%d/%b/%y %I:%M %p"),
+        ("12/mar/24 12:05 AM", "%d/%b/%y %I:%M %p"),
+        ("12/Dec/99 12:05 PM", "%d/%b/%y %I:%M %p"),
+        ("31/12/2024 23:59", "%d/%m/%Y %H:%M"),
+        ("12/31/2024 23:59", "%m/%d/%Y %H:%M"),
+    ],
+)
+def test_date_parser_matches_strptime(value: str, date_format: str):
+    assert DateParser((date_format,))(value) == datetime.strptime(value, date_format)
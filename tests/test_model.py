@@ -1,7 +1,15 @@
+from datetime import datetime, timedelta, timezone
+
 import pytest
 
 from fpdf_reporting.model.report_data import ReportData
-from fpdf_reporting.model.ticket import Status, Ticket
+from fpdf_reporting.model.ticket import Category, Status, Ticket
+from fpdf_reporting.model.ticket_table import (
+    MISSING,
+    TicketTable,
+    decode_date,
+    encode_date,
+)
 
 
 @pytest.fixture
@@ -32,3 +40,131 @@ def test_report_data_creation(report_data: ReportData):
     assert report_data.story_points_by_component == {}
     assert report_data.story_points_by_priority == {}
     assert report_data.story_points_by_issue_type == {}
+
+
+@pytest.fixture
+def tickets() -> list[Ticket]:
+    return [
+        Ticket(
+            key="PD-1",
+            summary="First",
+            status=Status.IN_PROGRESS,
+            issue_type="Bug",
+            story_points=3,
+            tester_story_points=1.5,
+            component="API",
+            priority="High",
+            category=Category.COMMITTED,
+            flagged=True,
+        ),
+        Ticket(
+            key="PD-2",
+            summary="Second",
+            status=Status.IN_PROGRESS,
+            issue_type="Story",
+            story_points=5,
+            component="API",
+            category=Category.MAYBE,
+        ),
+        Ticket(
+            key="PD-3",
+            summary="Third",
+            status=Status.ON_HOLD,
+            issue_type="Bug",
+            tester_story_points=2,
+            priority="Low",
+        ),
+    ]
+
+
+def test_report_data_aggregations(tickets: list[Ticket]):
+    report_data = ReportData([], tickets)
+    assert report_data.story_points_by_status == {
+        Status.IN_PROGRESS: 8,
+        Status.ON_HOLD: 0,
+    }
+    assert report_data.story_points_by_category == {
+        Category.COMMITTED: 3,
+        Category.MAYBE: 5,
+        None: 0,
+    }
+    assert report_data.story_points_by_component == {"API": 8, None: 0}
+    assert report_data.story_points_by_priority == {"High": 3, None: 5, "Low": 0}
+    assert report_data.story_points_by_issue_type == {"Bug": 3, "Story": 5}
+    assert report_data.by_issue_type["Bug"].count == 2
+    assert report_data.by_issue_type["Bug"].tester_story_points == 3.5
+    assert report_data.by_issue_type["Bug"].flagged == 1
+    assert report_data.totals.count == 3
+    assert report_data.totals.story_points == 8
+    assert report_data.totals.flagged == 1
+
+
+def test_report_data_add_tickets_accumulates(tickets: list[Ticket]):
+    report_data = ReportData([], tickets[:1])
+    report_data.add_tickets(tickets[1:])
+    assert report_data.totals == ReportData([], tickets).totals
+    assert report_data.by_status == ReportData([], tickets).by_status
+
+
+def test_report_data_instances_do_not_share_aggregations(tickets: list[Ticket]):
+    ReportData([], tickets)
+    assert ReportData([]).story_points_by_status == {}
+
+
+def test_ticket_table_round_trip(tickets: list[Ticket]):
+    tickets[0].start_date = datetime(2024, 3, 1, 9, 30)
+    tickets[0].due_date = datetime(2024, 3, 8, 17, 0, 0, 250)
+    tickets[1].developer = "Alice"
+    table = TicketTable(tickets)
+    assert len(table) == 3
+    assert list(table) == tickets
+    assert table[1] == tickets[1]
+
+
+def test_ticket_table_encodes_repeated_strings(tickets: list[Ticket]):
+    table = TicketTable(tickets * 100)
+    assert len(table) == 300
+    assert table.dictionaries["issue_type"].values == ["Bug", "Story"]
+    assert table.dictionaries["component"].values == ["API", None]
+    assert list(table.codes["issue_type"][:3]) == [0, 1, 0]
+
+
+def test_ticket_table_stores_aware_dates_as_utc():
+    ticket = Ticket(
+        key="PD-1",
+        summary="Aware",
+        status=Status.OTHER,
+        issue_type="Bug",
+        end_date=datetime(2024, 1, 1, 12, tzinfo=timezone(timedelta(hours=2))),
+    )
+    assert TicketTable([ticket])[0].end_date == datetime(2024, 1, 1, 10)
+
+
+def test_date_encoding_round_trips():
+    date = datetime(2024, 2, 29, 13, 45, 30)
+    assert decode_date(encode_date(date)) == date
+    assert encode_date(None) == MISSING
+    assert decode_date(MISSING) is None
+
+
+def test_ticket_table_filter(tickets: list[Ticket]):
+    table = TicketTable(tickets)
+    assert [t.key for t in table.filter(status=Status.IN_PROGRESS)] == ["PD-1", "PD-2"]
+    assert [t.key for t in table.filter(issue_type="Bug", component=None)] == ["PD-3"]
+    assert [t.key for t in table.filter(category=None)] == ["PD-3"]
+    assert [t.key for t in table.filter(flagged=True)] == ["PD-1"]
+    assert len(table.filter(component="Unknown")) == 0
+    assert len(table.filter()) == 3
+    with pytest.raises(ValueError):
+        table.filter(summary="First")
+
+
+def test_report_data_from_ticket_table(tickets: list[Ticket]):
+    from_table = ReportData([], TicketTable(tickets))
+    from_tickets = ReportData([], tickets)
+    assert from_table.totals == from_tickets.totals
+    assert from_table.by_category == from_tickets.by_category
+    assert from_table.by_status == from_tickets.by_status
+    assert from_table.by_component == from_tickets.by_component
+    assert from_table.by_priority == from_tickets.by_priority
+    assert from_table.by_issue_type == from_tickets.by_issue_type
@@ -0,0 +1,89 @@
+import io
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from fpdf_reporting.model.style import NotionStyle
+from fpdf_reporting.model.ticket import Status, Ticket
+from fpdf_reporting.rendering.page_store import PageStore, SpilledContents
+from fpdf_reporting.rendering.pdf_generator import PDF
+
+TICKETS = [
+    Ticket(key=f"PD-{i}", summary="Spill", status=Status.IN_PROGRESS, issue_type="Bug")
+    for i in range(40)
+]
+
+
+def document(store: Optional[PageStore], **kwargs: int) -> PDF:
+    pdf = PDF(NotionStyle(), page_store=store, **kwargs)
+    pdf.set_creation_date(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    pdf.add_page()
+    pdf.document_header("Spilled report")
+    pdf.detailed_tickets_table(TICKETS)
+    return pdf
+
+
+@pytest.mark.parametrize("level", [-1, 0, 9])
+def test_spilled_document_matches_the_document_in_memory(level: int):
+    with PageStore() as store:
+        pdf = document(store, compression_level=level)
+        assert store.pages == pdf.pages_count - 1
+        spilled = bytes(pdf.output())
+    assert spilled == bytes(document(None, compression_level=level).output())
+
+
+def test_only_the_current_page_is_in_memory():
+    with PageStore() as store:
+        pdf = document(store)
+        pages = list(pdf.pages.values())
+        assert all(isinstance(page.contents, SpilledContents) for page in pages[:-1])
+        assert isinstance(pages[-1].contents, bytearray)
+        assert store.size > 0
+
+
+def test_stream_a_spilled_document(tmp_path: Path):
+    with PageStore(tmp_path) as store:
+        sink = io.BytesIO()
+        document(store).output_stream(sink)
+    assert sink.getvalue() == bytes(document(None).output())
+
+
+def test_uncompressed_spilled_document():
+    def output(store: Optional[PageStore]) -> bytes:
+        pdf = document(store)
+        pdf.set_compression(False)
+        return bytes(pdf.output())
+
+    with PageStore() as store:
+        assert output(store) == output(None)
+
+
+def test_finished_pages_are_still_edited():
+    def output(store: Optional[PageStore]) -> bytes:
+        pdf = PDF(NotionStyle(), page_store=store)
+        pdf.set_creation_date(datetime(2024, 1, 1, tzinfo=timezone.utc))
+        pdf.set_font("Helvetica")
+        for _ in range(3):
+            pdf.add_page()
+            pdf.cell(text="Page {nb}")
+        # Back to a finished page
+        pdf.page = 1
+        pdf.cell(text="Added later")
+        pdf.page = 3
+        return bytes(pdf.output())
+
+    with PageStore() as store:
+        assert output(store) == output(None)
+
+
+def test_spilled_contents():
+    with PageStore() as store:
+        first = store.put(b"0 0 m 1 1 l S")
+        second = store.put(bytearray(b"q Q"))
+        first += b" {nb}"
+        first.replace(b"{nb}", b"2")
+        assert first.read() == b"0 0 m 1 1 l S 2"
+        assert second.read() == b"q Q"
+        assert (store.size, store.pages) == (16, 2)
@@ -0,0 +1,64 @@
+import io
+import json
+import logging
+
+import pytest
+
+from fpdf_reporting.model.style import NotionStyle
+from fpdf_reporting.model.ticket import Status, Ticket
+from fpdf_reporting.rendering.graphs import ChartBackend
+from fpdf_reporting.rendering.pdf_generator import PDF
+from fpdf_reporting.rendering.profiling import JsonSink, LoggingSink, Profiler
+
+
+def render(pdf: PDF) -> None:
+    pdf.add_page()
+    pdf.document_header("Profiled report")
+    ticket = Ticket(key="PD-1", summary="Card", status=Status.OTHER, issue_type="Bug")
+    pdf.detailed_tickets_table([ticket] * 3)
+    pdf.pie_chart({"a": 1, "b": 2}, backend=ChartBackend.PNG)
+    pdf.output()
+
+
+def test_profiler_records_drawing_methods_and_output():
+    reports = []
+    profiler = Profiler(lambda p: reports.append(p.report()))
+    render(PDF(NotionStyle(), profiler=profiler))
+
+    assert profiler.stats["ticket_card_long"].calls == 3
+    assert profiler.stats["tag"].calls == 6
+    assert profiler.stats["document_header"].calls == 1
+    assert profiler.stats["legend"].calls == 1
+    assert profiler.stats["chart_image"].calls == 1
+    assert profiler.stats["output"].seconds >= profiler.stats["output.fonts"].seconds
+    assert all(stats.seconds > 0 for stats in profiler.stats.values())
+    assert len(reports) == 1
+
+
+def test_json_and_logging_sinks(caplog: pytest.LogCaptureFixture):
+    buffer = io.StringIO()
+    with caplog.at_level(logging.INFO, logger="fpdf_reporting.profiling"):
+        render(PDF(NotionStyle(), profiler=Profiler(JsonSink(buffer), LoggingSink())))
+
+    report = json.loads(buffer.getvalue())
+    assert report["ticket_card_long"]["calls"] == 3
+    assert "ticket_card_long" in caplog.text
+
+
+def test_no_profiler_by_default():
+    pdf = PDF(NotionStyle())
+    render(pdf)
+    assert pdf.profiler is None
+
+
+def test_profiler_section_and_reset():
+    profiler = Profiler()
+    with profiler.section("step"):
+        pass
+    with pytest.raises(RuntimeError):
+        with profiler.section("step"):
+            raise RuntimeError
+    assert profiler.stats["step"].calls == 2
+    assert "step" in profiler.summary()
+    profiler.reset()
+    assert profiler.report() == {}
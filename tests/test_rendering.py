@@ -1,9 +1,42 @@
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Iterator
+
 import pytest
 
 from fpdf_reporting.model.style import NotionStyle
 from fpdf_reporting.model.ticket import Status, Ticket
-from fpdf_reporting.rendering.graphs import build_pie_chart_bytes
-from fpdf_reporting.rendering.pdf_generator import PDF
+from fpdf_reporting.model.ticket_table import TicketTable
+from fpdf_reporting.rendering import fonts
+from fpdf_reporting.rendering.fonts import FONT_REGISTRY
+from fpdf_reporting.rendering.graphs import (
+    PIE_CHART_CACHE,
+    ChartBackend,
+    ChartPool,
+    ImageFormat,
+    build_pie_chart_bytes,
+    chart_dpi,
+    histogram_bins,
+    top_categories,
+)
+from fpdf_reporting.rendering.layout import (
+    LAYOUT_CACHE,
+    BarChart,
+    Block,
+    Box,
+    Legend,
+    PieChart,
+    Placement,
+    SummaryCard,
+)
+from fpdf_reporting.rendering.pdf_generator import (
+    FONT_FILES,
+    PDF,
+    TEXT_SIZE,
+)
+from fpdf_reporting.rendering.text import ELLIPSIS, TextOverflow
 
 
 @pytest.fixture
@@ -38,6 +71,52 @@ def test_graph_with_negative_values():
         build_pie_chart_bytes([-1, -2, -3])
 
 
+def test_graph_is_cached():
+    PIE_CHART_CACHE.clear()
+    first = build_pie_chart_bytes([1, 2, 3])
+    second = build_pie_chart_bytes([1, 2, 3])
+    assert first is not None and second is not None
+    assert first is not second
+    assert first.read() == second.read()
+    assert PIE_CHART_CACHE.misses == 1
+    assert PIE_CHART_CACHE.hits == 1
+
+
+def test_graph_cache_key_includes_size_colors_and_dpi():
+    PIE_CHART_CACHE.clear()
+    build_pie_chart_bytes([1, 2, 3])
+    build_pie_chart_bytes([1, 2, 3], size=20)
+    build_pie_chart_bytes([1, 2, 3], colors=[(0, 0, 0), (1, 1, 1), (2, 2, 2)])
+    build_pie_chart_bytes([1, 2, 3], dpi=72)
+    build_pie_chart_bytes([1, 2, 3], image_format=ImageFormat.INDEXED)
+    build_pie_chart_bytes([1, 2, 3], hole=0.5)
+    assert PIE_CHART_CACHE.misses == 6
+    assert PIE_CHART_CACHE.hits == 0
+
+
+def test_donut_chart_image_has_a_hole():
+    from PIL import Image
+
+    def alpha_near_the_center(hole: float) -> int:
+        buffer = build_pie_chart_bytes([1, 2, 3], hole=hole, dpi=72)
+        assert buffer is not None
+        with Image.open(buffer) as image:
+            # within the left half slice, a quarter of the radius from the center
+            point = (image.width * 3 // 8, image.height // 2 - 2)
+            return image.convert("RGBA").getpixel(point)[3]
+
+    assert alpha_near_the_center(0) == 255
+    assert alpha_near_the_center(0.5) == 0
+
+
+@pytest.mark.parametrize("hole", [-0.1, 1, 1.5])
+def test_invalid_donut_hole(pdf: PDF, hole: float):
+    with pytest.raises(ValueError, match="hole"):
+        build_pie_chart_bytes([1, 2, 3], hole=hole)
+    with pytest.raises(ValueError, match="hole"):
+        pdf.pie_chart({"a": 1}, hole=hole)
+
+
 def test_header(pdf: PDF):
     pdf.document_header("TEST - Header")
     assert pdf.font_family == "inter"
@@ -77,6 +156,247 @@ def test_styled_table(pdf: PDF):
     assert pdf.get_y() == 66
 
 
+def test_styled_table_sizes_columns_from_content(pdf: PDF):
+    rows = [("PD-1", "A rather long ticket summary", "Done", "Alice")]
+    widths = pdf.table_column_widths(["Key", "Summary", "Status", "Assignee"], rows)
+    assert widths[1] > widths[0]
+    assert sum(widths) <= pdf.epw
+    pdf.styled_table(["Key", "Summary", "Status", "Assignee"], rows)
+    assert pdf.get_y() == 25 + 10 + 7 + 10
+
+
+def test_table_column_widths_fit_the_page(pdf: PDF):
+    widths = pdf.table_column_widths(["a", "b"], [("x" * 200, "y" * 100)])
+    assert sum(widths) == pytest.approx(pdf.epw)
+    assert widths[0] == pytest.approx(2 * widths[1], rel=0.05)
+
+
+def test_styled_table_repeats_the_header_on_every_page(pdf: PDF):
+    headers: list[tuple[int, float]] = []
+    draw_header = pdf._table_header
+
+    def recording_header(*args: Any) -> None:
+        headers.append((pdf.page, pdf.get_y()))
+        draw_header(*args)
+
+    pdf._table_header = recording_header  # type: ignore[method-assign]
+    consumed = []
+
+    def rows() -> Iterator[tuple[str, int]]:
+        for i in range(200):
+            consumed.append(i)
+            yield f"PD-{i}", i
+
+    pdf.styled_table(["Key", "Points"], rows(), sample_size=10)
+    assert len(consumed) == 200
+    assert pdf.pages_count == len(headers) > 1
+    assert headers[1:] == [(page, pdf.t_margin) for page in range(2, pdf.page + 1)]
+
+
+def printed_texts(pdf: PDF) -> list[str]:
+    """Record the text of the cells printed from now on"""
+    texts: list[str] = []
+    cell = pdf.cell
+
+    def recording_cell(w: float, h: float, text: str, **kwargs: Any) -> bool:
+        texts.append(text)
+        return cell(w, h, text, **kwargs)
+
+    pdf.cell = recording_cell  # type: ignore[method-assign,assignment]
+    return texts
+
+
+def test_styled_table_rows_of_any_width(pdf: PDF):
+    pdf.set_compression(False)
+    texts = printed_texts(pdf)
+    pdf.styled_table(
+        ["Key", "Summary", "Points"],
+        [("PD-1",), ("PD-2", "Summary", 3, "extra"), ("PD-3", None, 2.5)],
+    )
+    assert pdf.pages[1].contents.decode().count(" re f") == 4
+    assert texts[3:] == ["PD-1", "", "", "PD-2", "Summary", "3", "PD-3", "", "2.5"]
+    assert pdf.get_y() == 25 + 10 + 3 * 7 + 10
+
+
+def test_styled_table_truncates_cells(pdf: PDF):
+    texts = printed_texts(pdf)
+    summary = "A rather long ticket summary " * 5
+    pdf.styled_table(["Key", "Summary"], [("PD-1", summary)], [20, 30])
+    assert pdf.get_y() == 25 + 10 + 7 + 10
+    assert texts[3].endswith(ELLIPSIS) and summary.startswith(texts[3][:-1])
+    assert pdf.measure_text(texts[3]) <= 30 - 2 * pdf.c_margin
+
+
+def test_truncated_cells_only_memoize_whole_cells(pdf: PDF):
+    rows = [(f"PD-{i}", f"Ticket {i}: a rather long summary " * 3) for i in range(50)]
+    for overflow in TextOverflow:
+        pdf._text_widths.clear()
+        pdf.styled_table(["Key", "Summary"], rows, [20, 30], overflow=overflow)
+        cells = {text for row in rows for text in row} | {"Key", "Summary"}
+        memoized = {key[-1] for key in pdf._text_widths}
+        words = {word for _, summary in rows for word in summary.split()}
+        # no start of a cell cut to fit its column
+        assert memoized <= cells | words | {" ", ELLIPSIS}
+
+
+def test_styled_table_wraps_cells(pdf: PDF):
+    texts = printed_texts(pdf)
+    summary = "A rather long ticket summary " * 5
+    pdf.styled_table(
+        ["Key", "Summary"],
+        [("PD-1", summary), ("PD-2", "Short")],
+        [20, 30],
+        overflow=TextOverflow.WRAP,
+        max_lines=3,
+    )
+    # a row of three lines, then a row of one line
+    assert pdf.get_y() == pytest.approx(25 + 10 + (7 + 2 * 3.5) + 7 + 10)
+    lines = texts[3:6]
+    assert summary.startswith(" ".join(lines[:2]))
+    assert lines[2].endswith(ELLIPSIS)
+    assert all(pdf.measure_text(line) <= 30 - 2 * pdf.c_margin for line in lines)
+    assert texts[6:] == ["PD-2", "Short"]
+
+
+def test_text_widths_are_memoized(pdf: PDF, monkeypatch: pytest.MonkeyPatch):
+    calls = []
+    text_width = pdf._text_width
+
+    def counting_text_width(text: str) -> float:
+        calls.append(text)
+        return text_width(text)
+
+    monkeypatch.setattr(pdf, "_text_width", counting_text_width)
+    ticket = Ticket(key="PD-1", summary="Card", status=Status.OTHER, issue_type="Bug")
+    pdf.detailed_tickets_table([ticket] * 20)
+    assert sorted(calls) == ["Bug", "Other"]
+
+    pdf.set_font("Inter", "B", 12)
+    assert pdf.measure_texts(["Bug", "Bug"]) == [text_width("Bug")] * 2
+    assert calls.count("Bug") == 2
+
+
+@pytest.mark.parametrize(
+    "font", [("Inter", "", 7), ("Inter", "B", 12), ("Times", "I", 9)]
+)
+def test_text_widths_match_fpdf(pdf: PDF, font: tuple[str, str, int]):
+    pdf.set_font(*font)
+    texts = ["PD-1234", "A rather long ticket summary", ""]
+    assert pdf.measure_texts(texts) == pytest.approx(
+        [pdf.get_string_width(text) for text in texts]
+    )
+    pdf.set_char_spacing(1)
+    pdf.set_stretching(80)
+    assert pdf._text_width(texts[1]) == pytest.approx(pdf.get_string_width(texts[1]))
+
+
+def test_redundant_state_changes_are_dropped(pdf: PDF):
+    pdf.set_compression(False)
+    pdf.set_fill_color(10, 20, 30)
+    pdf.set_fill_color((10, 20, 30))
+    pdf.set_draw_color(10)
+    pdf.set_draw_color(10)
+    pdf.set_font("Inter", "B", 12)
+    pdf.set_font("Inter", "B", 12)
+    assert pdf.graphics_stats.redundant_calls == 3
+    content = pdf.pages[1].contents.decode()
+    assert content.count(" rg") == 1
+    assert content.count(" G") == 1
+
+
+def test_table_rows_have_one_background(pdf: PDF):
+    pdf.set_compression(False)
+    pdf.styled_table(["Key", "Summary"], [("PD-1", "Card")] * 3)
+    content = pdf.pages[1].contents.decode()
+    # one background per row, header included, instead of one per cell
+    assert content.count(" re f") == 4
+
+
+def test_text_does_not_change_the_fill_color(pdf: PDF):
+    pdf.set_compression(False)
+    pdf.set_fill_color(255, 0, 0)
+    pdf.section_title("Title")
+    with pdf.new_path() as path:
+        path.move_to(10, 10)
+        path.line_to(20, 10)
+        path.line_to(15, 20)
+        path.close()
+    lines = pdf.pages[1].contents.decode("latin-1").splitlines()
+    # the text color is only set within the "q ... Q" of the text
+    colors = [line for line in lines if " rg" in line and not line.startswith("q BT")]
+    assert colors == ["1 0 0 rg"]
+    assert lines[-1].endswith(" h B Q Q")
+
+
+def test_ticket_cards_reuse_templates():
+    tickets = [
+        Ticket(
+            key=f"PD-{i}",
+            summary="Card",
+            status=Status.OTHER,
+            issue_type="Bug",
+            priority="High",
+        )
+        for i in range(10)
+    ]
+    sizes = {}
+    for templates in (False, True):
+        pdf = PDF(NotionStyle(), templates=templates)
+        pdf.add_page()
+        pdf.detailed_tickets_table(tickets)
+        placed = sum(page.contents.count(b" Do Q") for page in pdf.pages.values())
+        sizes[templates] = len(pdf.output())
+
+    # card frame, status tag, issue type tag and priority dot
+    assert len(pdf._templates) == 4
+    assert placed == 4 * 10
+    assert sizes[True] < sizes[False]
+
+
+def test_templates_and_images_share_the_xobject_counter(data: dict[str, float]):
+    pdf = PDF(NotionStyle(), chart_backend=ChartBackend.PNG)
+    pdf.add_page()
+    pdf.detailed_tickets_table(
+        [Ticket(key="PD-1", summary="Card", status=Status.OTHER, issue_type="Bug")]
+    )
+    templates = set(pdf._templates.values())
+    pdf.pie_chart(data, width=40)
+    pdf.pie_chart(data, width=40)
+    [image] = pdf.image_cache.images.values()
+    # the image is numbered after the templates, not as the first image
+    assert image["i"] == max(templates) + 1
+    pdf.tag("Other", Status.IN_PROGRESS)
+    assert set(pdf._templates.values()) - templates == {image["i"] + 1}
+    catalog = pdf._resource_catalog
+    assert catalog.next_xobject_index == image["i"] + 2
+    assert b"/I1 " in pdf.output()
+
+
+def test_templates_and_images_interleaved_across_pages():
+    pdf = PDF(NotionStyle(), chart_backend=ChartBackend.PNG)
+    pdf.set_compression(False)
+    pdf.add_page()
+    pdf.pie_chart({"a": 1, "b": 2}, width=40)
+    pdf.tag("Other", Status.IN_PROGRESS)
+    pdf.add_page()
+    pdf.tag("Other", Status.IN_PROGRESS)
+    pdf.pie_chart({"a": 1, "b": 3}, width=40)
+    pdf.tag("Done", Status.OTHER)
+    pdf.add_page()
+    pdf.pie_chart({"a": 1, "b": 2}, width=40)
+    pdf.pie_chart({"a": 2, "b": 1}, width=40)
+    pdf.tag("Done", Status.OTHER)
+    output = bytes(pdf.output())
+
+    names: dict[bytes, bytes] = {}
+    for resources in re.findall(rb"/XObject <<([^>]*)>>", output):
+        for name, reference in re.findall(rb"/(I\d+) (\d+ 0 R)", resources):
+            assert names.setdefault(name, reference) == reference
+    # 3 images and 2 templates, each with its own name and object
+    assert len(names) == len(set(names.values())) == 5
+    assert set(re.findall(rb"/(I\d+) Do", output)) == set(names)
+
+
 def test_tag(pdf: PDF):
     width, height = pdf.tag("Test tag", Status.IN_PROGRESS)
     assert pdf.font_family == "inter"
@@ -99,9 +419,430 @@ def test_ticket_card_long(pdf: PDF):
     assert pdf.get_y() == 25 + 22 + 5
 
 
+def test_detailed_tickets_table_breaks_pages(pdf: PDF):
+    card_positions: list[tuple[int, float]] = []
+    draw_card = pdf.ticket_card_long
+
+    def recording_card(ticket: Ticket) -> None:
+        draw_card(ticket)
+        card_positions.append((pdf.page, pdf.get_y()))
+
+    pdf.ticket_card_long = recording_card  # type: ignore[method-assign]
+    tickets = (
+        Ticket(
+            key=f"PD-{i}",
+            summary="Generated ticket",
+            status=Status.IN_PROGRESS,
+            issue_type="Bug",
+        )
+        for i in range(20)
+    )
+    pdf.detailed_tickets_table(tickets)
+
+    assert pdf.pages_count == 3
+    assert len(card_positions) == 20
+    # each card ends above the page break trigger, followed by the card spacing
+    assert all(y - 5 <= pdf.page_break_trigger for _, y in card_positions)
+    assert card_positions[9] == (2, 25 + 22 + 5)
+
+
+def test_detailed_tickets_table_from_ticket_table(pdf: PDF):
+    table = TicketTable(
+        Ticket(key=f"PD-{i}", summary="Row", status=Status.OTHER, issue_type="Bug")
+        for i in range(12)
+    )
+    pdf.detailed_tickets_table(table)
+    assert pdf.pages_count == 2
+
+
 def test_pie_chart(pdf: PDF, data: dict[str, float]):
     pdf.pie_chart(data)
     assert pdf.font_family == "inter"
     assert pdf.font_size_pt == 10
     assert pdf.get_x() == 117
     assert pdf.get_y() == 47
+
+
+def test_pie_chart_is_drawn_as_vector_paths(pdf: PDF, data: dict[str, float]):
+    pdf.pie_chart(data)
+    assert pdf.image_cache.images == {}
+
+
+def test_pie_chart_png_backend(data: dict[str, float]):
+    pdf = PDF(NotionStyle(), chart_backend=ChartBackend.PNG)
+    pdf.add_page()
+    pdf.pie_chart(data)
+    assert len(pdf.image_cache.images) == 1
+    assert pdf.get_x() == 117
+
+
+def test_repeated_chart_images_are_embedded_once(data: dict[str, float]):
+    PIE_CHART_CACHE.clear()
+    pdf = PDF(NotionStyle(), chart_backend=ChartBackend.PNG)
+    for _ in range(3):
+        pdf.add_page()
+        pdf.pie_chart(data)
+    pdf.pie_chart(data, width=30)
+    assert len(pdf.image_cache.images) == 2
+    assert PIE_CHART_CACHE.misses == 2 and PIE_CHART_CACHE.hits == 0
+
+
+def test_indexed_chart_images(data: dict[str, float]):
+    def image_bytes(image_format: ImageFormat) -> int:
+        pdf = PDF(NotionStyle(), ChartBackend.PNG, chart_image_format=image_format)
+        pdf.add_page()
+        pdf.pie_chart(data)
+        pdf.output()
+        return sum(len(info["data"]) for info in pdf.image_cache.images.values())
+
+    assert image_bytes(ImageFormat.INDEXED) < image_bytes(ImageFormat.PNG)
+
+
+@pytest.fixture(scope="module")
+def chart_pool() -> Iterator[ChartPool]:
+    with ChartPool(max_workers=2) as pool:
+        yield pool
+
+
+def test_prefetched_charts_are_rendered_in_the_pool(
+    chart_pool: ChartPool, data: dict[str, float]
+):
+    PIE_CHART_CACHE.clear()
+    pdf = PDF(NotionStyle(), chart_backend=ChartBackend.PNG, chart_pool=chart_pool)
+    pdf.add_page()
+    other = {label: value * 2 + 1 for label, value in data.items()}
+    for chart in (data, other, data):
+        pdf.prefetch_pie_chart(chart, width=40)
+    assert len(pdf._chart_futures) == 2
+
+    pdf.pie_chart(data, width=40)
+    pdf.pie_chart(other, width=40)
+    assert pdf._chart_futures == {}
+    assert len(pdf.image_cache.images) == 2
+    # rendered in the workers, then shared with this process's cache
+    assert PIE_CHART_CACHE.misses == 2 and len(PIE_CHART_CACHE) == 2
+
+    serial = PDF(NotionStyle(), chart_backend=ChartBackend.PNG)
+    assert serial._pie_chart_image(list(other.values()), 40) in set(
+        pdf._chart_images.values()
+    )
+
+
+def test_cached_charts_are_not_rendered_again(
+    chart_pool: ChartPool, data: dict[str, float]
+):
+    PIE_CHART_CACHE.clear()
+    PDF(NotionStyle(), chart_backend=ChartBackend.PNG)._pie_chart_image(
+        list(data.values()), 40
+    )
+    future = chart_pool.submit_pie_chart(
+        list(data.values()), 40, NotionStyle().chart_colors, chart_dpi(40)
+    )
+    assert future.done() and PIE_CHART_CACHE.hits == 1
+
+
+def test_place_prefetches_pie_charts(chart_pool: ChartPool, data: dict[str, float]):
+    pdf = PDF(NotionStyle(), chart_backend=ChartBackend.PNG, chart_pool=chart_pool)
+    pdf.add_page()
+    charts = [
+        PieChart({label: value + i for label, value in data.items()}, width=60)
+        for i in range(6)
+    ]
+    pending = []
+    draw_block = pdf.draw_block
+
+    def recording_draw_block(block: Block, x: float, y: float) -> None:
+        pending.append(len(pdf._chart_futures))
+        draw_block(block, x, y)
+
+    pdf.draw_block = recording_draw_block  # type: ignore[method-assign]
+    pdf.place(charts, columns=2)
+    # every chart was submitted before the first one was drawn
+    assert pending == [6, 5, 4, 3, 2, 1]
+    assert pdf._chart_futures == {} and len(pdf.image_cache.images) == 6
+
+
+def test_nothing_to_prefetch(chart_pool: ChartPool, data: dict[str, float]):
+    pdf = PDF(NotionStyle(), chart_pool=chart_pool)
+    pdf.prefetch_pie_chart(data)
+    pdf.prefetch_pie_chart({"a": 0}, backend=ChartBackend.PNG)
+    pdf.prefetch_pie_chart({"a": -1}, backend=ChartBackend.PNG)
+    assert pdf._chart_futures == {} and pdf._chart_images == {}
+
+
+def test_chart_dpi_follows_the_width():
+    assert chart_dpi(70) == chart_dpi(30) == 120
+    assert chart_dpi(70, print_dpi=300) == 300
+    # Tiny and huge charts are kept within a useful number of pixels
+    assert chart_dpi(10) * 10 / 25.4 == pytest.approx(96, abs=1)
+    assert chart_dpi(400) * 400 / 25.4 == pytest.approx(1200, abs=5)
+
+
+def bars(pdf: PDF) -> list[tuple[float, ...]]:
+    """Record the bars drawn, as (x, y, width, height)."""
+    drawn: list[tuple[float, ...]] = []
+    rect = pdf.rect
+
+    def record(x: float, y: float, w: float, h: float, **kwargs: object) -> None:
+        drawn.append((x, y, w, h))
+        rect(x, y, w, h, **kwargs)  # type: ignore[arg-type]
+
+    pdf.rect = record  # type: ignore[method-assign]
+    return drawn
+
+
+def test_bar_chart(pdf: PDF, data: dict[str, float]):
+    drawn = bars(pdf)
+    assert pdf.bar_chart(data) == (94, 55)
+    # One 3 mm bar per non-zero value, every 5 mm, the highest 30 mm high
+    assert len(drawn) == 5
+    assert [x for x, *_ in drawn] == [27, 32, 42, 47, 52]
+    assert {w for _, _, w, _ in drawn} == {3}
+    assert drawn[-1][1:] == (25, 3, 30)
+
+
+def test_bar_chart_with_zero_values(pdf: PDF):
+    drawn = bars(pdf)
+    pdf.bar_chart({"one": 0, "two": 0})
+    assert drawn == []
+
+
+def test_bar_chart_sums_the_smallest_categories(pdf: PDF):
+    labels: list[str] = []
+    pdf.legend = lambda names, *args, **kwargs: labels.extend(names)  # type: ignore
+    pdf.bar_chart({f"c{i}": i for i in range(1000)}, max_bars=5)
+    assert labels == ["c996", "c997", "c998", "c999", "Other"]
+
+
+def test_bar_chart_fits_its_width(pdf: PDF):
+    drawn = bars(pdf)
+    pdf.bar_chart({f"c{i}": i + 1 for i in range(1000)}, width=20, max_bars=1000)
+    assert len(drawn) == 19
+    assert drawn[-1][0] + drawn[-1][2] <= 25 + 20
+
+
+def test_charts_need_room_on_the_line(pdf: PDF):
+    data = {"a": 1, "b": 2, "c": 3}
+    pdf.set_x(pdf.w - pdf.r_margin - 10)
+    with pytest.raises(ValueError, match="start a new line"):
+        pdf.bar_chart(data)
+    with pytest.raises(ValueError, match="start a new line"):
+        pdf.histogram([1, 2, 3])
+    with pytest.raises(ValueError, match="start a new line"):
+        pdf.burndown_chart([])
+    with pytest.raises(ValueError, match="positive"):
+        pdf.bar_chart(data, width=-12)
+    drawn = bars(pdf)
+    pdf.set_x(pdf.l_margin)
+    pdf.bar_chart(data)
+    assert all(width > 0 for _, _, width, _ in drawn)
+
+
+def test_top_categories():
+    data = {"a": 5, "b": 1, "c": 5, "d": 2, "e": 0}
+    assert top_categories(data, 3) == {"a": 5, "c": 5, "Other": 3}
+    assert top_categories(data, 5) == data
+    with pytest.raises(ValueError):
+        top_categories(data, 1)
+
+
+def test_histogram(pdf: PDF):
+    values = [i % 97 for i in range(100_000)]
+    counts, edges = histogram_bins(values, 10)
+    assert sum(counts) == len(values) and edges[0] == 0 and edges[-1] == 96
+    drawn = bars(pdf)
+    pdf.histogram(values, caption="Cycle time", bins=10)
+    assert len(drawn) == 10
+    pdf.histogram([])
+
+
+def test_flow_charts(pdf: PDF):
+    start = datetime(2024, 5, 6)
+    tickets = [
+        Ticket(
+            key=f"PD-{i}",
+            summary="Flow",
+            status=Status.OTHER,
+            issue_type="Bug",
+            story_points=i,
+            start_date=start + timedelta(days=i),
+            end_date=start + timedelta(days=2 * i) if i % 2 else None,
+        )
+        for i in range(20)
+    ]
+    assert pdf.burndown_chart(tickets, story_points=True)[1] == 59
+    pdf.set_xy(25, 100)
+    pdf.cumulative_flow_chart(TicketTable(tickets), caption="Flow", width=80)
+    pdf.set_xy(25, 150)
+    pdf.cycle_time_chart(tickets, bins=5)
+    pdf.burndown_chart([])
+    text = pdf.pages[1].contents
+    assert text.count(b"[2.835 2.835] 0.000 d") == 1  # the dashed ideal line
+    assert text.count(b" h\n f") == 3  # the stacked areas
+
+
+def test_donut_chart(pdf: PDF):
+    pdf.pie_chart({"all": 1}, width=30, hole=0.5)
+    assert pdf.image_cache.images == {}
+    assert pdf.get_x() == 77
+
+
+def test_pie_chart_without_data(pdf: PDF):
+    pdf.pie_chart({"one": 0, "two": 0})
+    assert pdf.get_x() == 25
+    assert pdf.get_y() == 25
+
+
+def test_pie_chart_with_negative_values(pdf: PDF):
+    with pytest.raises(ValueError):
+        pdf.pie_chart({"one": -1, "two": 2})
+
+
+def test_place_blocks(pdf: PDF, data: dict[str, float]):
+    LAYOUT_CACHE.clear()
+    blocks: list[Block] = [
+        SummaryCard(["Total: 58", "Done: 42"], width=50),
+        SummaryCard(["Blocked: 6"], width=50),
+        BarChart(data, caption="Categories", width=60),
+        PieChart(data, width=30, caption="Categories"),
+        Legend(["Done", "To do"]),
+    ]
+    layout = pdf.place(blocks)
+    assert [p.page for p in layout.placements] == [0] * 5
+    # two cards on the first row, the charts do not fit next to them
+    assert layout.placements[1].x == 25 + 50 + 5
+    assert layout.placements[2] == Placement(0, 25, 25 + 22 + 5)
+    assert layout.placements[3].y == layout.placements[2].y
+    assert layout.placements[4].y > layout.placements[3].y
+    assert pdf.get_y() == layout.end_y + 5
+
+    # no block is drawn across the page break trigger
+    boxes = zip(layout.boxes, layout.placements, strict=True)
+    assert all(p.y + box.height <= pdf.page_break_trigger for box, p in boxes)
+
+
+def test_place_breaks_pages_before_drawing(pdf: PDF):
+    cards = [SummaryCard([f"Item {i}" for i in range(5)], width=70)] * 24
+    layout = pdf.place(cards, columns=2)
+    assert layout.pages == 3
+    assert pdf.page == 3
+    assert {p.x for p in layout.placements} == {25, 25 + (pdf.epw + 5) / 2}
+    assert layout.placements[20] == Placement(2, 25, pdf.t_margin)
+
+
+def test_layouts_are_cached_by_structure(
+    pdf: PDF, data: dict[str, float], monkeypatch: pytest.MonkeyPatch
+):
+    LAYOUT_CACHE.clear()
+    blocks = [SummaryCard(["a", "b"]), PieChart(data, caption="Pie")]
+    first = pdf.layout(blocks)
+
+    def fail(block: Block) -> None:
+        raise AssertionError("measured again")
+
+    monkeypatch.setattr(pdf, "measure_block", fail)
+    other_values = {label: value + 1 for label, value in data.items()}
+    second = pdf.layout(
+        [SummaryCard(["c", "d"]), PieChart(other_values, caption="Other")]
+    )
+    assert second is first
+    assert (LAYOUT_CACHE.hits, LAYOUT_CACHE.misses) == (1, 1)
+    with pytest.raises(AssertionError):
+        pdf.layout([SummaryCard(["a", "b", "c"])])
+
+
+def test_measured_blocks_match_the_drawing(pdf: PDF, data: dict[str, float]):
+    box = pdf.measure_block(SummaryCard(["a", "b"], width=40))
+    assert box == Box(40, 2 * 6 + 10)
+    end_x, end_y = pdf.summary_card(["a", "b"], width=40, x=25, y=25)
+    assert (end_x, end_y) == (25 + box.width, 25 + box.height)
+
+    box = pdf.measure_block(BarChart(data, width=60))
+    assert box.height == 30
+    pdf.set_xy(25, 60)
+    pdf.bar_chart(data, width=60)
+    # the legend labels end within the box
+    assert pdf.get_x() - 15 <= 25 + box.width
+
+    assert pdf.measure_block(PieChart(data, width=30)).height == 30
+    assert pdf.measure_block(Legend(["a"] * 10, caption="Ten")).height == 47
+    with pytest.raises(TypeError):
+        pdf.measure_block("block")  # type: ignore[arg-type]
+
+
+def test_fonts_are_parsed_once_per_process():
+    first = PDF(NotionStyle())
+    second = PDF(NotionStyle())
+    assert first.fonts["inter"] is not second.fonts["inter"]
+    assert first.fonts["inter"].cmap is second.fonts["inter"].cmap
+    assert first.fonts["inter"].cw is not second.fonts["inter"].cw
+    assert first.fonts["inter"].subset is not second.fonts["inter"].subset
+    assert first.fonts["inter"].ttfont is not second.fonts["inter"].ttfont
+
+
+def test_font_subsets_are_per_document():
+    first = PDF(NotionStyle())
+    first.add_page()
+    first.section_title("Only in the first document: xyz")
+    second = PDF(NotionStyle())
+    second.add_page()
+    second.section_title("Q")
+    assert len(first.fonts["interB"].subset) > len(second.fonts["interB"].subset)
+    assert first.output().startswith(b"%PDF")
+    assert second.output().startswith(b"%PDF")
+
+
+def test_font_descriptors_are_per_document():
+    first = PDF(NotionStyle())
+    second = PDF(NotionStyle())
+    assert first.fonts["inter"].desc is not second.fonts["inter"].desc
+    for pdf in (first, second):
+        pdf.add_page()
+        pdf.section_title("Descriptor")
+    first.output()
+    # output numbers the descriptor as an object of the first document only
+    assert second.fonts["interB"].desc._id is None
+    assert second.output().startswith(b"%PDF")
+
+
+def test_font_widths_are_per_document():
+    first = PDF(NotionStyle())
+    second = PDF(NotionStyle())
+    missing = "\U0010fffd"  # not in the font
+    first.set_font("Inter", "", TEXT_SIZE)
+    first.measure_text(missing)
+    assert ord(missing) in first.fonts["inter"].cw
+    assert ord(missing) not in second.fonts["inter"].cw
+    prototypes = [parsed.prototype for parsed in FONT_REGISTRY._fonts.values()]
+    assert not any(ord(missing) in prototype.cw for prototype in prototypes)
+
+
+def test_new_font_attributes_are_rejected(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(fonts, "_SHARED_ATTRIBUTES", fonts._SHARED_ATTRIBUTES[1:])
+    monkeypatch.setattr(FONT_REGISTRY, "_fonts", {})
+    with pytest.raises(RuntimeError, match="'type'"):
+        PDF(NotionStyle())
+
+
+def test_concurrent_output_with_shared_fonts():
+    def build(index: int) -> bytes:
+        pdf = PDF(NotionStyle())
+        pdf.set_creation_date(datetime(2024, 1, 1))
+        pdf.add_page()
+        pdf.section_title(f"Concurrent {index}")
+        pdf.set_font("Inter", "I", TEXT_SIZE)
+        pdf.cell(0, 10, "x" * index)
+        return bytes(pdf.output())
+
+    FONT_REGISTRY.clear()
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            outputs = list(executor.map(build, range(32)))
+    finally:
+        sys.setswitchinterval(interval)
+
+    # every font file was parsed once, by one of the threads
+    assert len(FONT_REGISTRY) == len(FONT_FILES)
+    assert outputs == [build(index) for index in range(32)]
@@ -0,0 +1,209 @@
+import json
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from fpdf_reporting.model.report_data import ReportData
+from fpdf_reporting.model.style import NotionStyle
+from fpdf_reporting.model.ticket import Category, Status, Ticket
+from fpdf_reporting.rendering.batch import ReportJob, generate_reports
+from fpdf_reporting.rendering.graphs import PIE_CHART_CACHE, ChartBackend
+from fpdf_reporting.rendering.layout import LAYOUT_CACHE
+from fpdf_reporting.rendering.pdf_generator import PDF
+from fpdf_reporting.rendering.report_plan import (
+    Aggregation,
+    BlockType,
+    compile_spec,
+)
+
+SPEC = {
+    "title": "Sprint report",
+    "sections": [
+        {
+            "title": "Overview",
+            "blocks": [
+                {"type": "summary", "items": ["count", "story_points"]},
+                {"type": "pie", "data": "story_points_by_status", "caption": "Status"},
+                {"type": "donut", "data": "count_by_category", "width": 30},
+                {"type": "bar", "data": "story_points_by_status"},
+            ],
+        },
+        {"title": "Not delivered", "blocks": [{"type": "tickets"}]},
+    ],
+}
+
+
+def tickets(count: int) -> list[Ticket]:
+    return [
+        Ticket(
+            key=f"PD-{i}",
+            summary="Planned ticket",
+            status=list(Status)[i % len(Status)],
+            issue_type="Bug",
+            story_points=i % 5 + 1,
+            category=Category.COMMITTED if i % 2 else None,
+        )
+        for i in range(count)
+    ]
+
+
+def test_compile_spec():
+    plan = compile_spec(SPEC)
+    assert plan.title == "Sprint report"
+    assert [len(section.blocks) for section in plan.sections] == [4, 1]
+    assert plan.sections[0].blocks[3].type is BlockType.BAR
+    # the status aggregation is computed once for the pie and the bar charts
+    assert plan.aggregations == (
+        Aggregation("story_points", "status"),
+        Aggregation("count", "category"),
+    )
+
+
+def test_plans_are_cached_on_the_spec_hash():
+    plan = compile_spec(SPEC)
+    reordered = json.dumps(dict(reversed(list(SPEC.items()))))
+    assert compile_spec(reordered) is plan
+    assert len(plan.digest) == 64
+    assert compile_spec({**SPEC, "title": "Other"}).digest != plan.digest
+
+
+@pytest.mark.parametrize(
+    ("block", "message"),
+    [
+        ({"type": "gauge"}, "blocks\\[0\\]"),
+        ({"type": "pie"}, "Unknown aggregation"),
+        ({"type": "bar", "data": "count_by_sprint"}, "Unknown aggregation"),
+        ({"type": "summary", "items": ["velocity"]}, "velocity"),
+        ({"type": "pie", "data": "count_by_status", "width": "wide"}, "wide"),
+        ({"type": "pie", "data": "count_by_status", "width": "30"}, "'30'"),
+        ({"type": "bar", "data": "count_by_status", "width": -10}, "-10"),
+        ({"type": "bar", "data": "count_by_status", "width": float("nan")}, "nan"),
+        ({"type": "bar", "data": "count_by_status", "captoin": "x"}, "captoin"),
+        ({"type": "summary", "items": "count"}, "must be a list"),
+        ({"type": "summary", "data": "count_by_status"}, "Unknown keys \\['data'\\]"),
+        ({"type": "tickets", "width": 30}, "Unknown keys"),
+        ({"type": "pie", "data": "count_by_status", "caption": 3}, "caption"),
+        ({"type": "summary", "items": [["count"]]}, "\\[\\['count'\\]\\]"),
+        ("pie", "must be an object"),
+    ],
+)
+def test_invalid_specs(block: object, message: str):
+    with pytest.raises(ValueError, match=message):
+        compile_spec({"sections": [{"blocks": [block]}]})
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {"title": "Report", "section": []},
+        {"sections": [{"title": "Overview", "block": []}]},
+    ],
+)
+def test_unknown_keys(spec: dict[str, object]):
+    with pytest.raises(ValueError, match="Unknown keys"):
+        compile_spec(spec)
+
+
+@pytest.mark.parametrize(
+    ("spec", "message"),
+    [
+        ({"sections": 3}, "The sections must be a list, not 3"),
+        ({"title": 5}, "The title must be a string, not 5"),
+        ({"sections": [{"title": ["Overview"]}]}, "sections\\[0\\]: The title"),
+        ({"sections": [{"blocks": {}}]}, "sections\\[0\\]: The blocks must be a list"),
+    ],
+)
+def test_invalid_spec_structure(spec: dict[str, object], message: str):
+    with pytest.raises(ValueError, match=message):
+        compile_spec(spec)
+
+
+def test_items_are_only_read_on_summary_blocks():
+    plan = compile_spec(
+        {"sections": [{"blocks": [{"type": "pie", "data": "count_by_status"}]}]}
+    )
+    assert plan.sections[0].blocks[0].items == ()
+
+
+def test_summary_totals():
+    step = compile_spec(SPEC).sections[0].blocks[0]
+    data = ReportData([], [])
+    data.totals.count = 1_234_567
+    data.totals.story_points = 2_000_000
+    data.totals.tester_story_points = 1_234_567.5
+    summary = step.block(data, {})
+    assert summary.items == ["Tickets: 1,234,567", "Story points: 2,000,000"]
+    step = (
+        compile_spec(
+            {
+                "sections": [
+                    {"blocks": [{"type": "summary", "items": ["tester_story_points"]}]}
+                ]
+            }
+        )
+        .sections[0]
+        .blocks[0]
+    )
+    assert step.block(data, {}).items == ["Tester story points: 1,234,567.5"]
+
+
+def test_aggregate():
+    data = ReportData([], tickets(10))
+    series = compile_spec(SPEC).aggregate(data)
+    assert series[Aggregation("count", "category")] == {"Unset": 5, "Committed": 5}
+    by_status = series[Aggregation("story_points", "status")]
+    assert sum(by_status.values()) == data.totals.story_points
+
+
+def test_render():
+    LAYOUT_CACHE.clear()
+    plan = compile_spec(SPEC)
+    for count in (10, 30):
+        pdf = PDF(NotionStyle())
+        plan.render(pdf, ReportData(tickets(3), tickets(count)))
+        assert pdf.pages_count == 1
+    # the second report has the same structure, its layout is not measured again
+    assert LAYOUT_CACHE.hits == 1
+
+
+def test_prerender_chart_images():
+    PIE_CHART_CACHE.clear()
+    pdf = PDF(NotionStyle(), chart_backend=ChartBackend.PNG)
+    plan = compile_spec(SPEC)
+    plan.prerender(pdf, plan.aggregate(ReportData([], tickets(10))))
+    assert len(pdf._chart_images) == 2
+
+    images = len(PIE_CHART_CACHE)
+    plan.render(pdf, ReportData([], tickets(10)))
+    assert len(PIE_CHART_CACHE) == images
+    assert len(pdf._chart_images) == 2
+
+
+def test_donut_images_have_their_hole():
+    pdf = PDF(NotionStyle(), chart_backend=ChartBackend.PNG)
+    plan = compile_spec(SPEC)
+    plan.prerender(pdf, plan.aggregate(ReportData([], tickets(10))))
+    assert sorted(key[-1] for key in pdf._chart_images) == [0, 0.5]
+
+
+def test_plan_as_batch_render_function(tmp_path: Path):
+    plan = compile_spec(SPEC)
+    jobs = [ReportJob(NotionStyle(), tickets(12), tmp_path / "planned.pdf")]
+    [result] = generate_reports(jobs, render=plan, max_workers=1)
+    assert result.ok, result.error
+    assert result.pages == 2
+
+
+def test_batch_reports_list_tickets_not_delivered(tmp_path: Path):
+    done = datetime(2024, 3, 8)
+    job_tickets = [
+        replace(ticket, end_date=done if i % 3 else None)
+        for i, ticket in enumerate(tickets(12))
+    ]
+    drawn: list[Ticket] = []
+    pdf = PDF(NotionStyle())
+    pdf.detailed_tickets_table = drawn.extend  # type: ignore[method-assign,assignment]
+    compile_spec(SPEC)(pdf, ReportJob(NotionStyle(), job_tickets, tmp_path / "x.pdf"))
+    assert [ticket.key for ticket in drawn] == ["PD-0", "PD-3", "PD-6", "PD-9"]
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time budget in microseconds. Measured at about 0.35s,
+# the rest is fpdf2 itself; the margin absorbs slow CI machines.
+IMPORT_BUDGET_US = 1_500_000
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Return the cumulative import time of every module loaded by `module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.fixture(scope="module")
+def pdf_generator_import_times() -> dict[str, int]:
+    return import_times("fpdf_reporting.rendering.pdf_generator")
+
+
+def test_matplotlib_is_not_imported_on_startup(pdf_generator_import_times):
+    assert not any(
+        name.split(".")[0] == "matplotlib" for name in pdf_generator_import_times
+    )
+
+
+def test_import_time_budget(pdf_generator_import_times):
+    cumulative = pdf_generator_import_times["fpdf_reporting.rendering.pdf_generator"]
+    assert cumulative < IMPORT_BUDGET_US
@@ -0,0 +1,121 @@
+import io
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from fpdf import FPDF, XPos, YPos
+from fpdf.outline import OutlineSection
+from fpdf.output import OutputProducer
+
+from fpdf_reporting.model.style import NotionStyle
+from fpdf_reporting.model.ticket import Status, Ticket
+from fpdf_reporting.rendering.graphs import ChartBackend
+from fpdf_reporting.rendering.page_store import PageStore
+from fpdf_reporting.rendering.pdf_generator import PDF
+from fpdf_reporting.rendering.streaming import content_stream
+
+TICKETS = [
+    Ticket(key=f"PD-{i}", summary="Stream", status=Status.IN_PROGRESS, issue_type="Bug")
+    for i in range(40)
+]
+
+
+def document(**kwargs: int) -> PDF:
+    pdf = PDF(NotionStyle(), **kwargs)
+    pdf.set_creation_date(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    pdf.add_page()
+    pdf.document_header("Streamed report")
+    pdf.detailed_tickets_table(TICKETS)
+    pdf.pie_chart({"a": 1, "b": 2}, backend=ChartBackend.PNG)
+    return pdf
+
+
+def test_streamed_output_matches_the_buffered_output():
+    sink = io.BytesIO()
+    size = document().output_stream(sink)
+    assert sink.getvalue() == bytes(document().output())
+    assert size == len(sink.getvalue())
+
+
+def outline_document(page_store: Optional[PageStore] = None) -> PDF:
+    """Links, a table of contents, page labels and pages of several sizes"""
+
+    def table_of_contents(pdf: FPDF, outline: list[OutlineSection]) -> None:
+        pdf.set_font("Inter", "", 10)
+        for section in outline:
+            link = pdf.add_link(page=section.page_number)
+            pdf.cell(0, 5, section.name, new_x=XPos.LMARGIN, new_y=YPos.NEXT, link=link)
+
+    pdf = PDF(NotionStyle(), page_store=page_store)
+    pdf.set_creation_date(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    pdf.add_page()
+    pdf.insert_toc_placeholder(table_of_contents)
+    for index, size in enumerate([(210, 297), (148, 210), (100, 150)]):
+        pdf.add_page(format=size, orientation="L" if index == 1 else "P")
+        pdf.set_page_label(label_style="D", label_prefix="S-")
+        pdf.start_section(f"Section {index}")
+        pdf.section_title(f"Section {index}")
+        pdf.cell(0, 5, "External", link="https://example.com")
+        pdf.cell(0, 5, "Back", link=pdf.add_link(page=1))
+    return pdf
+
+
+def test_streamed_and_spilled_outputs_match_fpdf():
+    # ReportOutputProducer replaces how FPDF adds the pages, so both are
+    # compared with the output of FPDF's own producer
+    expected = bytes(outline_document().output(output_producer_class=OutputProducer))
+    assert expected.count(b"/Subtype /Link") == 9
+    assert b"/MediaBox" in expected and b"/PageLabels" in expected
+    assert bytes(outline_document().output()) == expected
+    sink = io.BytesIO()
+    outline_document().output_stream(sink)
+    assert sink.getvalue() == expected
+    with PageStore() as store:
+        assert bytes(outline_document(store).output()) == expected
+
+
+def test_stream_to_a_path(tmp_path: Path):
+    path = tmp_path / "report.pdf"
+    size = document().output_stream(path)
+    assert path.stat().st_size == size
+    assert path.read_bytes().startswith(b"%PDF")
+    assert path.read_bytes().rstrip().endswith(b"%%EOF")
+
+
+def test_compression_level():
+    fastest = bytes(document(compression_level=0).output())
+    default = bytes(document().output())
+    smallest = bytes(document(compression_level=9).output())
+    assert len(fastest) > len(default) >= len(smallest)
+
+    pdf = document()
+    pdf.set_compression_level(1)
+    assert len(bytes(pdf.output())) > len(smallest)
+
+
+def test_uncompressed_documents_ignore_the_level():
+    def flate_streams(level: int) -> int:
+        pdf = PDF(NotionStyle(), compression_level=level)
+        pdf.set_compression(False)
+        pdf.add_page()
+        pdf.detailed_tickets_table(TICKETS)
+        return bytes(pdf.output()).count(b"FlateDecode")
+
+    # Only the font streams, which FPDF always compresses
+    assert flate_streams(9) == flate_streams(-1) < 10
+
+
+def test_invalid_compression_level():
+    with pytest.raises(ValueError):
+        PDF(NotionStyle(), compression_level=10)
+    with pytest.raises(ValueError):
+        PDF(NotionStyle()).set_compression_level(-2)
+
+
+def test_content_stream():
+    stream = content_stream(b"0 0 m 1 1 l S", compress=True, level=9)
+    assert zlib.decompress(stream._contents) == b"0 0 m 1 1 l S"
+    assert stream.length == len(stream._contents)
+    assert content_stream(b"q Q", compress=False).filter is None
@@ -0,0 +1,83 @@
+from typing import Callable
+
+from fpdf_reporting.rendering.text import ELLIPSIS, truncate, wrap
+
+
+def measure(text: str) -> float:
+    """One unit per character"""
+    return float(len(text))
+
+
+def test_truncate():
+    assert truncate("short", 10, measure) == "short"
+    assert truncate("exactly 10", 10, measure) == "exactly 10"
+    assert truncate("a longer summary", 10, measure) == "a longer" + ELLIPSIS
+    assert truncate("abcdefghijkl", 5, measure) == "abcd" + ELLIPSIS
+    assert truncate("abc", 1, measure) == ""
+    assert truncate("", 0, measure) == ""
+
+
+def test_truncate_adjusts_the_estimated_cut():
+    def wide_start(text: str) -> float:
+        """The first characters are 10 units wide"""
+        return sum(10.0 if i < 3 else 1.0 for i in range(len(text)))
+
+    text = "WWW" + "i" * 30
+    cut = truncate(text, 20, wide_start)
+    assert cut == "W" + ELLIPSIS
+    assert wide_start(cut) <= 20
+
+
+def test_truncate_measures_few_prefixes():
+    measured: list[str] = []
+
+    def counting(text: str) -> float:
+        measured.append(text)
+        return measure(text)
+
+    truncate("word " * 10_000, 50, counting)
+    assert len(measured) < 10
+
+
+def test_prefixes_are_measured_separately():
+    whole: list[str] = []
+    prefixes: list[str] = []
+
+    def recording(texts: list[str]) -> Callable[[str], float]:
+        def measure_into(text: str) -> float:
+            texts.append(text)
+            return measure(text)
+
+        return measure_into
+
+    text = "a longer summary"
+    cut = truncate(text, 10, recording(whole), recording(prefixes))
+    assert cut == "a longer" + ELLIPSIS
+    assert whole == [text, ELLIPSIS]
+    assert prefixes and all(text.startswith(prefix) for prefix in prefixes)
+
+    whole.clear()
+    wrap("a supercalifragilistic word", 8, recording(whole), 3, recording(prefixes))
+    # whole words only, the starts of the long word are measured as prefixes
+    assert set(whole) == {" ", "a", "supercalifragilistic", ELLIPSIS, "word"}
+
+
+def test_wrap():
+    assert wrap("", 10, measure, 3) == [""]
+    assert wrap("one two three four", 10, measure, 3) == ["one two", "three four"]
+    assert wrap("one two three four", 9, measure, 2) == [
+        "one two",
+        "three" + " fo" + ELLIPSIS,
+    ]
+
+
+def test_wrap_truncates_long_words():
+    assert wrap("a supercalifragilistic word", 8, measure, 3) == [
+        "a",
+        "superca" + ELLIPSIS,
+        "word",
+    ]
+
+
+def test_wrap_single_line():
+    assert wrap("one two three", 7, measure, 1) == ["one tw" + ELLIPSIS]
@@ -0,0 +1,136 @@
+import io
+import json
+import socket
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from fpdf_reporting.model.ticket_table import TicketTable
+from fpdf_reporting.rendering.graphs import ChartBackend
+from fpdf_reporting.rendering.worker import ReportWorker, unix_server
+
+TICKETS = [
+    {
+        "key": "PD-1",
+        "summary": "Fix login",
+        "status": "In progress",
+        "issue_type": "Bug",
+        "start_date": "2024-05-01T00:00:00",
+        "category": "Committed",
+    },
+    {
+        "key": "PD-2",
+        "summary": "Add export",
+        "status": "ready for qa",
+        "issue_type": "Story",
+    },
+]
+
+
+def request(tmp_path: Path, id: str, **fields: object) -> str:
+    job = {"id": id, "output": str(tmp_path / f"{id}.pdf"), "tickets": TICKETS}
+    return json.dumps(job | fields) + "\n"
+
+
+def test_serve_answers_every_line(tmp_path: Path):
+    requests = io.StringIO(
+        request(tmp_path, "a", title="Sprint 1")
+        + "\n"
+        + "not json\n"
+        + request(tmp_path, "b", style="unknown")
+        + request(tmp_path, "c", chart_backend="png")
+        + json.dumps({"command": "metrics"})
+        + "\n"
+    )
+    responses = io.StringIO()
+    ReportWorker().serve(requests, responses)
+
+    a, invalid, b, c, metrics = map(json.loads, responses.getvalue().splitlines())
+    assert a["ok"] and a["id"] == "a" and a["pages"] == 1
+    assert (tmp_path / "a.pdf").read_bytes().startswith(b"%PDF")
+    assert not invalid["ok"] and "JSONDecodeError" in invalid["error"]
+    assert not b["ok"] and "Unknown style" in b["error"]
+    assert invalid["id"] is None and b["id"] == "b"
+    assert c["ok"] and (tmp_path / "c.pdf").exists()
+    assert metrics["metrics"]["jobs"] == 2
+    assert metrics["metrics"]["latency_p95"] >= metrics["metrics"]["latency_p50"] > 0
+
+
+def test_render_a_spec(tmp_path: Path):
+    worker = ReportWorker()
+    spec = {"sections": [{"blocks": [{"type": "pie", "data": "count_by_status"}]}]}
+    response = worker.handle(request(tmp_path, "spec", spec=spec))
+    assert response is not None and response["ok"] and response["pages"] == 1
+
+    invalid = {"sections": [{"blocks": [{"type": "gauge"}]}]}
+    response = worker.handle(request(tmp_path, "invalid", spec=invalid))
+    assert response is not None and not response["ok"]
+    assert "gauge" in response["error"]
+
+
+def test_render_errors_are_reported_and_counted(tmp_path: Path):
+    worker = ReportWorker(ChartBackend.PNG)
+    response = worker.handle(request(tmp_path, "x", output=str(tmp_path)))
+    assert response is not None and not response["ok"]
+    assert worker.metrics.snapshot()["failures"] == 1
+
+
+def test_export_jobs(tmp_path: Path):
+    export = tmp_path / "export.json"
+    issues = [{"key": f"PD-{i}", "fields": {"summary": "Card"}} for i in range(3)]
+    export.write_text(json.dumps({"issues": issues}))
+    worker = ReportWorker()
+    request = {"id": "e", "output": str(tmp_path / "e.pdf"), "export": str(export)}
+    job, _ = worker._job(request)
+    assert isinstance(job.tickets, TicketTable) and len(job.tickets) == 3
+    response = worker.handle(json.dumps(request))
+    assert response is not None and response["ok"] and response["id"] == "e"
+
+
+def test_shutdown_stops_serving(tmp_path: Path):
+    requests = io.StringIO(
+        json.dumps({"command": "shutdown"}) + "\n" + request(tmp_path, "late")
+    )
+    responses = io.StringIO()
+    worker = ReportWorker()
+    worker.serve(requests, responses)
+    assert not worker.running
+    assert len(responses.getvalue().splitlines()) == 1
+    assert not (tmp_path / "late.pdf").exists()
+
+
+def test_unix_socket(tmp_path: Path):
+    path = str(tmp_path / "worker.sock")
+    worker = ReportWorker()
+    server = unix_server(worker, path)
+    thread = threading.Thread(target=worker.serve_socket, args=(server,))
+    thread.start()
+
+    for id in ("first", "second"):
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(path)
+            client.sendall(request(tmp_path, id).encode())
+            client.shutdown(socket.SHUT_WR)
+            assert json.loads(client.makefile().readline())["ok"]
+
+    with socket.socket(socket.AF_UNIX) as client:
+        client.connect(path)
+        client.sendall(b'{"command": "shutdown"}\n')
+        metrics = json.loads(client.makefile().readline())["metrics"]
+
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert metrics["jobs"] == 2
+
+
+def test_command_line(tmp_path: Path):
+    process = subprocess.run(
+        [sys.executable, "-m", "fpdf_reporting.rendering.worker"],
+        input=request(tmp_path, "cli"),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert json.loads(process.stdout)["ok"]
+    assert json.loads(process.stderr)["metrics"]["jobs"] == 1